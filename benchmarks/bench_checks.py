@@ -0,0 +1,60 @@
+"""
+Benchmark the per-check overhead of the check functions with only the reporting hub and csv
+writer subscribed, as in a ``--non-interactive`` run.
+
+The csv writer thread is not started, so only the cost on the test thread is measured. Queued
+events are discarded between batches. The fastest batch is reported to reduce noise from other
+processes.
+
+Usage: python benchmarks/bench_checks.py [number of checks]
+"""
+
+import sys
+import time
+
+from pubsub import pub
+
+import fixate.config
+from fixate.core.checks import chk_in_range, chk_log_value, chk_all_in_range
+from fixate.reporting import CSVWriter, ReportingHub
+from fixate.sequencer import Sequencer
+
+BATCH = 1000
+
+
+def bench(name, func, n, writer):
+    best = float("inf")
+    for _ in range(max(n // BATCH, 1)):
+        start = time.perf_counter()
+        for i in range(BATCH):
+            func(i)
+        best = min(best, time.perf_counter() - start)
+        writer.queue.queue.clear()
+    print(f"{name:<24} {best / BATCH * 1e6:8.2f} us/check")
+
+
+def main(n=100_000):
+    pub.unsubAll()
+    fixate.config.RESOURCES["SEQUENCER"] = Sequencer()
+    writer = CSVWriter()
+    writer.start_time = time.perf_counter()
+    hub = ReportingHub([writer])
+    hub._active = [writer]
+    for callback, topic in hub._topics:
+        pub.subscribe(callback, topic)
+    try:
+        bench("chk_in_range", lambda i: chk_in_range(i, -1, n), n, writer)
+        bench("chk_log_value", lambda i: chk_log_value(i, fmt=".2f"), n, writer)
+        vals = list(range(1000))
+        bench(
+            "chk_all_in_range (1000)",
+            lambda i: chk_all_in_range(vals, -1, n),
+            n,
+            writer,
+        )
+    finally:
+        hub.uninstall()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,95 @@
+"""
+Benchmark the overhead of the API based drivers: construction, which binds every entry of the
+driver's api table, and each call through a bound API method.
+
+The drivers talk to an instrument stub that answers every query immediately, and waits such as
+the settling time in ``reset()`` are skipped, so the times are the driver's own overhead
+without any I/O, waits or write pacing. The fastest batch is reported to
+reduce noise from other processes.
+
+Usage: python benchmarks/bench_driver_api.py [number of calls]
+"""
+
+import sys
+import time
+
+import fixate.config
+from fixate.core import timing
+from fixate.drivers.dso.agilent_mso_x import MSO_X_3000
+from fixate.drivers.funcgen.keysight_33500b import Keysight33500B
+from fixate.drivers.funcgen.rigol_dg1022 import RigolDG1022
+from fixate.drivers.pacing import FixedDelay
+from fixate.drivers.pps.siglent_spd_3303X import SPD3303X
+
+BATCH = 1000
+
+
+class StubInstrument:
+    timeout = 2000
+    query_delay = 0.0
+    read_termination = "\n"
+    write_termination = "\n"
+
+    def write(self, command):
+        pass
+
+    def query(self, command):
+        if "ERR" in command.upper():
+            return '+0,"No error"'
+        return "1"
+
+    def read_stb(self):
+        return 0
+
+    def clear(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def bench(name, func, n, batch=BATCH):
+    best = float("inf")
+    for _ in range(max(n // batch, 1)):
+        start = time.perf_counter()
+        for _ in range(batch):
+            func()
+        best = min(best, time.perf_counter() - start)
+    print(f"{name:<36} {best / batch * 1e6:10.2f} us")
+
+
+def open_driver(driver_class):
+    driver = driver_class(StubInstrument())
+    # No write delays, only the driver's own overhead is of interest
+    driver.pacer.baseline = driver.pacer.strategy = FixedDelay(0)
+    return driver
+
+
+def main(n=20_000):
+    fixate.config.visa_pacing = {}
+    timing.wait = lambda seconds: None
+    for driver_class in (MSO_X_3000, Keysight33500B, RigolDG1022, SPD3303X):
+        bench(
+            f"construct {driver_class.__name__}",
+            lambda: driver_class(StubInstrument()),
+            max(n // 100, 10),
+            batch=10,
+        )
+
+    dso = open_driver(MSO_X_3000)
+    funcgen = open_driver(Keysight33500B)
+    rigol = open_driver(RigolDG1022)
+    pps = open_driver(SPD3303X)
+    bench("dso.ch1.scale(0.5)", lambda: dso.ch1.scale(0.5), n)
+    bench(
+        "dso.trigger.mode.edge.level(1.5)", lambda: dso.trigger.mode.edge.level(1.5), n
+    )
+    bench(
+        "33500B channel1.frequency(1000)", lambda: funcgen.channel1.frequency(1000), n
+    )
+    bench("DG1022 output_ch1 = True", lambda: setattr(rigol, "output_ch1", True), n)
+    bench("pps.channel1.voltage(5)", lambda: pps.channel1.voltage(5), n)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
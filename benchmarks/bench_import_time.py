@@ -0,0 +1,40 @@
+"""
+Benchmark the startup cost of fixate: the cumulative import time of ``fixate``, ``fixate.main``
+and a driver package, from ``-X importtime`` in a new interpreter each run. Each module is
+imported once first, so the times don't include writing bytecode caches, and the fastest run
+is reported to reduce noise from other processes.
+
+Usage: python benchmarks/bench_import_time.py [number of runs]
+"""
+
+import subprocess
+import sys
+
+MODULES = ("fixate", "fixate.main", "fixate.drivers.dmm")
+
+
+def import_time_ms(module: str) -> float:
+    """Cumulative import time of module in a new interpreter, from -X importtime"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1]) / 1000
+    raise RuntimeError(f"No import time for {module}:\n{result.stderr}")
+
+
+def main(runs=5):
+    for module in MODULES:
+        import_time_ms(module)
+        best = min(import_time_ms(module) for _ in range(runs))
+        print(f"import {module:<24} {best:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
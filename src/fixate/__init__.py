@@ -7,48 +7,97 @@
 # to move the API intended for use in test scripts into the
 # top level package namespace and try to be clearer about what
 # is public vs private.
-from fixate._switching import (
-    # Type Alias
-    Signal as Signal,
-    Pin as Pin,
-    PinList as PinList,
-    PinSet as PinSet,
-    SignalMap as SignalMap,
-    TreeDef as TreeDef,
-    PinUpdateCallback as PinUpdateCallback,
-    # Runtime API
-    PinSetState as PinSetState,
-    PinUpdate as PinUpdate,
-    VirtualMux as VirtualMux,
-    VirtualSwitch as VirtualSwitch,
-    RelayMatrixMux as RelayMatrixMux,
-    AddressHandler as AddressHandler,
-    PinValueAddressHandler as PinValueAddressHandler,
-    MuxGroup as MuxGroup,
-    JigDriver as JigDriver,
-    generate_pin_group as generate_pin_group,
-    generate_relay_matrix_pin_list as generate_relay_matrix_pin_list,
-)
+#
+# The names are imported on first use, so `import fixate` doesn't load the
+# sequencer, reporting or the UI until a script needs them.
+from typing import TYPE_CHECKING
 
-from fixate._ui import (
-    Validator as Validator,
-    UiColour as UiColour,
-    user_input as user_input,
-    user_input_float as user_input_float,
-    user_serial as user_serial,
-    user_yes_no as user_yes_no,
-    user_info as user_info,
-    user_info_important as user_info_important,
-    user_ok as user_ok,
-    user_action as user_action,
-    user_image as user_image,
-    user_image_clear as user_image_clear,
-    user_gif as user_gif,
-    user_post_sequence_info_pass as user_post_sequence_info_pass,
-    user_post_sequence_info_fail as user_post_sequence_info_fail,
-    user_post_sequence_info as user_post_sequence_info,
-)
+from fixate import _lazy
+
+if TYPE_CHECKING:
+    from fixate._switching import (
+        # Type Alias
+        Signal as Signal,
+        Pin as Pin,
+        PinList as PinList,
+        PinSet as PinSet,
+        SignalMap as SignalMap,
+        TreeDef as TreeDef,
+        PinUpdateCallback as PinUpdateCallback,
+        # Runtime API
+        PinSetState as PinSetState,
+        PinUpdate as PinUpdate,
+        VirtualMux as VirtualMux,
+        VirtualSwitch as VirtualSwitch,
+        RelayMatrixMux as RelayMatrixMux,
+        AddressHandler as AddressHandler,
+        PinValueAddressHandler as PinValueAddressHandler,
+        MuxGroup as MuxGroup,
+        JigDriver as JigDriver,
+        generate_pin_group as generate_pin_group,
+        generate_relay_matrix_pin_list as generate_relay_matrix_pin_list,
+    )
 
-from fixate.main import run_main_program as run
+    from fixate._ui import (
+        Validator as Validator,
+        UiColour as UiColour,
+        user_input as user_input,
+        user_input_float as user_input_float,
+        user_serial as user_serial,
+        user_yes_no as user_yes_no,
+        user_info as user_info,
+        user_info_important as user_info_important,
+        user_ok as user_ok,
+        user_action as user_action,
+        user_image as user_image,
+        user_image_clear as user_image_clear,
+        user_gif as user_gif,
+        user_post_sequence_info_pass as user_post_sequence_info_pass,
+        user_post_sequence_info_fail as user_post_sequence_info_fail,
+        user_post_sequence_info as user_post_sequence_info,
+    )
+
+    from fixate.main import run_main_program as run
+
+__getattr__, __dir__ = _lazy.attach(
+    __name__,
+    {
+        "Signal": "fixate._switching",
+        "Pin": "fixate._switching",
+        "PinList": "fixate._switching",
+        "PinSet": "fixate._switching",
+        "SignalMap": "fixate._switching",
+        "TreeDef": "fixate._switching",
+        "PinUpdateCallback": "fixate._switching",
+        "PinSetState": "fixate._switching",
+        "PinUpdate": "fixate._switching",
+        "VirtualMux": "fixate._switching",
+        "VirtualSwitch": "fixate._switching",
+        "RelayMatrixMux": "fixate._switching",
+        "AddressHandler": "fixate._switching",
+        "PinValueAddressHandler": "fixate._switching",
+        "MuxGroup": "fixate._switching",
+        "JigDriver": "fixate._switching",
+        "generate_pin_group": "fixate._switching",
+        "generate_relay_matrix_pin_list": "fixate._switching",
+        "Validator": "fixate._ui",
+        "UiColour": "fixate._ui",
+        "user_input": "fixate._ui",
+        "user_input_float": "fixate._ui",
+        "user_serial": "fixate._ui",
+        "user_yes_no": "fixate._ui",
+        "user_info": "fixate._ui",
+        "user_info_important": "fixate._ui",
+        "user_ok": "fixate._ui",
+        "user_action": "fixate._ui",
+        "user_image": "fixate._ui",
+        "user_image_clear": "fixate._ui",
+        "user_gif": "fixate._ui",
+        "user_post_sequence_info_pass": "fixate._ui",
+        "user_post_sequence_info_fail": "fixate._ui",
+        "user_post_sequence_info": "fixate._ui",
+        "run": "fixate.main:run_main_program",
+    },
+)
 
 __version__ = "0.6.5"
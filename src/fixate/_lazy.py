@@ -0,0 +1,47 @@
+"""
+Lazy package attributes
+
+Packages name the attributes they export and the module each comes from, and the module is
+imported on first access through a module ``__getattr__`` (PEP 562). ``import fixate`` or
+``from fixate.drivers import dmm`` then doesn't pay for the sequencer, pyvisa or the drivers
+until they are used.
+
+::
+
+    __getattr__, __dir__ = _lazy.attach(__name__, {"Fluke8846A": ".fluke_8846a"})
+
+Packages should also import the names under ``typing.TYPE_CHECKING``, so type checkers and
+IDEs still see them.
+"""
+
+import importlib
+import sys
+from typing import Callable, Dict, List, Tuple
+
+
+def attach(
+    package: str, exports: Dict[str, str]
+) -> Tuple[Callable[[str], object], Callable[[], List[str]]]:
+    """
+    (__getattr__, __dir__) for package, which import exports[name] on first access of name.
+    Modules starting with "." are relative to package. The name can be followed by ":attr"
+    where the attribute of the module has a different name, e.g. "fixate.main:run_main_program"
+    """
+
+    def __getattr__(name: str):
+        try:
+            target = exports[name]
+        except KeyError:
+            raise AttributeError(
+                f"module {package!r} has no attribute {name!r}"
+            ) from None
+        module_name, _, attr = target.partition(":")
+        value = getattr(importlib.import_module(module_name, package), attr or name)
+        # Later lookups find the attribute without calling __getattr__
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__
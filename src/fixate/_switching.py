@@ -47,6 +47,7 @@ from typing import (
 from dataclasses import dataclass
 from functools import reduce
 from operator import or_
+from fixate.core import timing
 
 Signal = str
 Pin = str
@@ -179,7 +180,7 @@ class VirtualMux:
         now = time.monotonic()
         wait_until = self._last_update_time + duration
         if wait_until > now:
-            time.sleep(wait_until - now)
+            timing.wait(wait_until - now)
 
     def pins(self) -> frozenset[Pin]:
         """
@@ -616,7 +617,7 @@ class VirtualAddressMap:
             raise ValueError(f"The following pins need to be on and off {in_both}")
 
         self._dispatch_pin_state(collated.setup)
-        time.sleep(collated.minimum_change_time)
+        timing.wait(collated.minimum_change_time)
         self._dispatch_pin_state(collated.final)
 
     def _dispatch_pin_state(self, new_state: PinSetState, force: bool = False) -> None:
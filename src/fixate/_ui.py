@@ -13,6 +13,7 @@ from pubsub import pub
 # going to honour the post sequence info display from `ui.py`
 from fixate.config import RESOURCES
 from fixate.core.exceptions import UserInputError
+from fixate.core import timing
 from collections import OrderedDict
 
 
@@ -60,7 +61,7 @@ def _user_request_input(msg: str) -> str:
     q: Queue[str] = Queue()
     pub.sendMessage("UI_block_start")
     pub.sendMessage("UI_req_input", msg=msg, q=q)
-    resp = q.get()
+    resp = timing.queue_get(q)
     pub.sendMessage("UI_block_end")
     return resp
 
@@ -144,7 +145,7 @@ def _user_req_choices(msg: str, choices: tuple[str, ...]) -> str:
     q: Queue[str] = Queue()
     pub.sendMessage("UI_block_start")
     pub.sendMessage("UI_req_choices", msg=msg, q=q, choices=choices)
-    resp = q.get()
+    resp = timing.queue_get(q)
     pub.sendMessage("UI_block_end")
     return resp
 
@@ -265,6 +266,7 @@ def user_action(msg: str, action_monitor: Callable[[], bool]) -> bool:
 
             # Yield control for other threads but don't slow down target
             time.sleep(0)
+            timing.check()
     finally:
         # No matter what, if we exit, we want to reset the UI
         callback_obj.target_finished_callback()
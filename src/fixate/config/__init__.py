@@ -57,8 +57,43 @@ plg_csv = {
         "index_string={index}",
         "computername={COMPUTERNAME}",
     ],
+    # When the csv file is flushed: "line", "test" or "interval" (every flush_interval seconds)
+    "flush_policy": "line",
+    "flush_interval": 1.0,
+    # os.fsync on every flush
+    "fsync": False,
+    # Maximum events waiting to be written (0 for no limit) and what to do when the queue is
+    # full: "block" the test thread or "spill" events to a temporary file
+    "queue_size": 10000,
+    "backpressure": "spill",
+    # Seconds reporting can fall behind before a warning is shown
+    "lag_warning": 5.0,
 }
 
+# Further reporting plugins are created from plg_ entries with an import_name and class_name.
+# e.g. plg_sqlite to also write results to a SQLite database, see fixate.reporting.sqlite
+# or plg_stream to serve live results as JSON lines over a socket, see fixate.reporting.stream
+
+# Write pacing for VISA drivers by driver class name, e.g. {"Fluke8846A": "learned"}
+# One of "fixed" (the driver's tuned delay), "opc", "status" or "learned", see fixate.drivers.pacing
+visa_pacing = {}
+# When VISA drivers check the instrument for errors, by driver class name, e.g. {"SPD3303X": "deferred"}
+# One of "immediate" (after every operation), "deferred" (before the next query) or "sync" (only when
+# the driver's sync() is called)
+visa_error_check = {}
+# Skip configuration writes that wouldn't change the instrument's settings, by driver class name. The
+# value is the seconds after which the cached settings are written again, or None to never, e.g.
+# {"Fluke8846A": 300}. See fixate.drivers.pacing
+visa_state_cache = {}
+# Reuse the open session when a VISA instrument is opened again, if it still answers *IDN?. The
+# instrument then keeps its settings from the previous unit, see fixate.drivers.pool
+visa_session_pool = False
+# Trace the I/O of every instrument, see fixate.drivers.trace. True to log the latency of each command
+# at the end of each sequence, or a file path to also append every read, write and query to it
+instrument_trace = False
+# Number of the most recent reads, writes and queries kept by the trace
+instrument_trace_buffer = 10000
+
 
 index = None
 
@@ -1,4 +1,3 @@
-import ruamel.yaml
 import pathlib
 import fixate.config
 import os
@@ -42,6 +41,8 @@ def load_yaml_config(yaml_in: str) -> None:
     """
     if not os.path.exists(yaml_in):
         raise FileNotFoundError("Config file {} not found".format(yaml_in))
+    import ruamel.yaml
+
     yaml = ruamel.yaml.YAML(typ="safe", pure=True)
     yaml.default_flow_style = False
     yaml_path = pathlib.Path(yaml_in)
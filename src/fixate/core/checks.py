@@ -1,21 +1,33 @@
 """
 This module is used to allow for tests to test values against criteria.
 It should implement necessary logging functions and report success or failure.
+
+Every check accepts an ``attachment``, an array such as the raw waveform or sweep behind the
+result. It is copied when the check is made and written by the reporting thread to a sidecar
+file next to the csv report (see `fixate.reporting.attachments`).
 """
 
 from dataclasses import dataclass, field
-from typing import Any, Callable, Iterable, Optional
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional
+import functools
 import logging
 
 import fixate.config
 
+if TYPE_CHECKING:
+    # numpy is only imported by checks on arrays, so it doesn't slow down startup
+    import numpy as np
+
 _logger = logging.getLogger(__name__)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True, init=False)
 class CheckResult:
     """Check Class Results to publish to subscribers
     Is a subset of CheckClass attrs
+
+    The check string for UI display is only formatted the first time it is accessed,
+    so subscribers that don't display it (e.g. the csv writer) don't pay for formatting.
     """
 
     result: bool  # Result of check
@@ -23,11 +35,68 @@ class CheckResult:
     description: str  # Description of check
     test_val: Any = None
     target_name: str = None  # Name of check type
-    check_string: str = None  # formatted string for UI display
     check_params: Iterable = None  # Store for csv logging
+    stats: "ArrayCheckStats" = None  # Summary for checks over an array of values
+    attachment: "np.ndarray" = field(
+        default=None, compare=False
+    )  # Raw data for the check
+    # formatted string for UI display, or a callable that returns it
+    _check_string: str | Callable[[], str] = field(
+        default=None, repr=False, compare=False
+    )
+
+    # Written out, rather than generated, so check_string stays an argument while the
+    # attribute is the property below
+    def __init__(
+        self,
+        result: bool,
+        status: str,
+        description: str,
+        test_val: Any = None,
+        target_name: str = None,
+        check_string: str | Callable[[], str] = None,
+        check_params: Iterable = None,
+        stats: "ArrayCheckStats" = None,
+        attachment: "np.ndarray" = None,
+    ):
+        set_field = object.__setattr__
+        set_field(self, "result", result)
+        set_field(self, "status", status)
+        set_field(self, "description", description)
+        set_field(self, "test_val", test_val)
+        set_field(self, "target_name", target_name)
+        set_field(self, "check_params", check_params)
+        set_field(self, "stats", stats)
+        set_field(self, "attachment", attachment)
+        set_field(self, "_check_string", check_string)
+
+    @property
+    def check_string(self) -> str:
+        if callable(self._check_string):
+            object.__setattr__(self, "_check_string", self._check_string())
+        return self._check_string
 
 
-@dataclass
+@dataclass(frozen=True)
+class ArrayCheckStats:
+    """Summary of a check evaluated over an array of values
+
+    Indices refer to the flattened array. Margin is the distance to the nearest limit,
+    positive when inside the limits and negative when outside.
+    """
+
+    count: int
+    fail_count: int
+    fail_indices: tuple
+    worst_index: int
+    worst_value: float
+    worst_min: float  # Lower limit at the worst index
+    worst_max: float  # Upper limit at the worst index
+    min_margin: float
+    mean_margin: float
+
+
+@dataclass(slots=True)
 class _CheckClass:
     """Loads check parameters and evaluates check"""
 
@@ -43,9 +112,9 @@ class _CheckClass:
     fmt: Optional[str] = field(default=None)
     formatter: Optional[Callable] = field(default=None)
     status: str = field(default=None)
+    attachment: Optional[Any] = field(default=None)
 
     def _generate_check_string(self) -> str:
-        self.target_name = self.target.__name__[1:].replace("_", " ")
         if self.formatter is None:
             self.formatter = _format_novalue
         try:
@@ -65,11 +134,11 @@ class _CheckClass:
         """
         result = self.target(self)
         self.status = "PASS" if result else "FAIL"
-        check_string = self._generate_check_string()
+        self.target_name = _target_name(self.target)
         # NOTE: stash used params for csv reporting (probably a better way)
         check_params = [
             x
-            for x in [self.nominal, self._min, self._max, self.tol, self.deviation]
+            for x in (self.nominal, self._min, self._max, self.tol, self.deviation)
             if x is not None
         ]
         return CheckResult(
@@ -78,9 +147,30 @@ class _CheckClass:
             self.description,
             self.test_val,
             self.target_name,
-            check_string,
+            self._generate_check_string,
             check_params,
+            attachment=_attachment_array(self.attachment),
+        )
+
+
+def _attachment_array(attachment) -> Optional["np.ndarray"]:
+    """Copy of the attachment, so the test can reuse its buffer while it is being written"""
+    if attachment is None:
+        return None
+    import numpy as np
+
+    array = np.array(attachment)
+    if array.dtype.hasobject:
+        raise ValueError(
+            f"Check attachments must be numeric arrays, got dtype {array.dtype}"
         )
+    return array
+
+
+@functools.cache
+def _target_name(target: Callable) -> str:
+    """Name of the check type for display and logging, e.g. _in_range -> in range"""
+    return target.__name__[1:].replace("_", " ")
 
 
 def _message_parse(target: Callable[[_CheckClass], bool], **kwargs) -> bool:
@@ -134,9 +224,11 @@ def _passes(chk: _CheckClass) -> bool:
     return True
 
 
-def chk_passes(description="") -> bool:
+def chk_passes(description="", attachment=None) -> bool:
     """Pass Test"""
-    return _message_parse(target=_passes, description=description)
+    return _message_parse(
+        target=_passes, description=description, attachment=attachment
+    )
     # _format_novalue
 
 
@@ -144,9 +236,9 @@ def _fails(chk: _CheckClass) -> bool:
     return False
 
 
-def chk_fails(description="") -> bool:
+def chk_fails(description="", attachment=None) -> bool:
     """Fail Test"""
-    return _message_parse(target=_fails, description=description)
+    return _message_parse(target=_fails, description=description, attachment=attachment)
     # _format_novalue
 
 
@@ -154,12 +246,13 @@ def _log_value(chk: _CheckClass) -> bool:
     return True
 
 
-def chk_log_value(test_val, description="", fmt=None) -> bool:
+def chk_log_value(test_val, description="", fmt=None, attachment=None) -> bool:
     """Log test_val"""
     return _message_parse(
         test_val=test_val,
         target=_log_value,
         description=description,
+        attachment=attachment,
         formatter=_format_testvalue,
         fmt=fmt,
     )
@@ -169,7 +262,9 @@ def _in_range(chk: _CheckClass) -> bool:
     return chk._min < chk.test_val < chk._max
 
 
-def chk_in_range(test_val, _min, _max, description="", fmt=None) -> bool:
+def chk_in_range(
+    test_val, _min, _max, description="", fmt=None, attachment=None
+) -> bool:
     """Check: _min < test_val < _max"""
     return _message_parse(
         test_val=test_val,
@@ -177,6 +272,7 @@ def chk_in_range(test_val, _min, _max, description="", fmt=None) -> bool:
         _min=_min,
         _max=_max,
         description=description,
+        attachment=attachment,
         formatter=_format_range,
         fmt=fmt,
     )
@@ -197,7 +293,9 @@ def _in_tolerance(chk: _CheckClass) -> bool:
         )
 
 
-def chk_in_tolerance(test_val, nominal, tol, description="", fmt=None) -> bool:
+def chk_in_tolerance(
+    test_val, nominal, tol, description="", fmt=None, attachment=None
+) -> bool:
     """Check: nominal - tol% < test_val < nominal + tol%"""
     return _message_parse(
         test_val=test_val,
@@ -205,6 +303,7 @@ def chk_in_tolerance(test_val, nominal, tol, description="", fmt=None) -> bool:
         nominal=nominal,
         tol=tol,
         description=description,
+        attachment=attachment,
         formatter=_format_tolerance,
         fmt=fmt,
     )
@@ -214,7 +313,9 @@ def _in_range_equal(chk: _CheckClass) -> bool:
     return chk._min <= chk.test_val <= chk._max
 
 
-def chk_in_range_equal(test_val, _min, _max, description="", fmt=None) -> bool:
+def chk_in_range_equal(
+    test_val, _min, _max, description="", fmt=None, attachment=None
+) -> bool:
     """Check: _min <= test_val <= _max"""
     return _message_parse(
         test_val=test_val,
@@ -222,6 +323,7 @@ def chk_in_range_equal(test_val, _min, _max, description="", fmt=None) -> bool:
         _min=_min,
         _max=_max,
         description=description,
+        attachment=attachment,
         formatter=_format_range,
         fmt=fmt,
     )
@@ -231,7 +333,9 @@ def _in_range_equal_min(chk: _CheckClass) -> bool:
     return chk._min <= chk.test_val < chk._max
 
 
-def chk_in_range_equal_min(test_val, _min, _max, description="", fmt=None) -> bool:
+def chk_in_range_equal_min(
+    test_val, _min, _max, description="", fmt=None, attachment=None
+) -> bool:
     """Check: _min <= test_val < _max"""
     return _message_parse(
         test_val=test_val,
@@ -239,6 +343,7 @@ def chk_in_range_equal_min(test_val, _min, _max, description="", fmt=None) -> bo
         _min=_min,
         _max=_max,
         description=description,
+        attachment=attachment,
         formatter=_format_range,
         fmt=fmt,
     )
@@ -248,7 +353,9 @@ def _in_range_equal_max(chk: _CheckClass) -> bool:
     return chk._min < chk.test_val <= chk._max
 
 
-def chk_in_range_equal_max(test_val, _min, _max, description="", fmt=None) -> bool:
+def chk_in_range_equal_max(
+    test_val, _min, _max, description="", fmt=None, attachment=None
+) -> bool:
     """Check: _min < test_val <= _max"""
     return _message_parse(
         test_val=test_val,
@@ -256,6 +363,7 @@ def chk_in_range_equal_max(test_val, _min, _max, description="", fmt=None) -> bo
         _min=_min,
         _max=_max,
         description=description,
+        attachment=attachment,
         formatter=_format_range,
         fmt=fmt,
     )
@@ -265,7 +373,9 @@ def _outside_range(chk: _CheckClass) -> bool:
     return chk.test_val < chk._min or chk.test_val > chk._max
 
 
-def chk_outside_range(test_val, _min, _max, description="", fmt=None) -> bool:
+def chk_outside_range(
+    test_val, _min, _max, description="", fmt=None, attachment=None
+) -> bool:
     """Check: test_val > _max or < _min"""
     return _message_parse(
         test_val=test_val,
@@ -273,6 +383,7 @@ def chk_outside_range(test_val, _min, _max, description="", fmt=None) -> bool:
         _min=_min,
         _max=_max,
         description=description,
+        attachment=attachment,
         formatter=_format_range,
         fmt=fmt,
     )
@@ -282,7 +393,9 @@ def _outside_range_equal(chk: _CheckClass) -> bool:
     return chk.test_val <= chk._min or chk.test_val >= chk._max
 
 
-def chk_outside_range_equal(test_val, _min, _max, description="", fmt=None) -> bool:
+def chk_outside_range_equal(
+    test_val, _min, _max, description="", fmt=None, attachment=None
+) -> bool:
     """Check: test_val >= _max or <= _min"""
     return _message_parse(
         test_val=test_val,
@@ -290,6 +403,7 @@ def chk_outside_range_equal(test_val, _min, _max, description="", fmt=None) -> b
         _min=_min,
         _max=_max,
         description=description,
+        attachment=attachment,
         formatter=_format_range,
         fmt=fmt,
     )
@@ -299,7 +413,9 @@ def _outside_range_equal_min(chk: _CheckClass) -> bool:
     return chk.test_val <= chk._min or chk.test_val > chk._max
 
 
-def chk_outside_range_equal_min(test_val, _min, _max, description="", fmt=None) -> bool:
+def chk_outside_range_equal_min(
+    test_val, _min, _max, description="", fmt=None, attachment=None
+) -> bool:
     """Check: test_val > _max or <= _min"""
     return _message_parse(
         test_val=test_val,
@@ -307,6 +423,7 @@ def chk_outside_range_equal_min(test_val, _min, _max, description="", fmt=None)
         _min=_min,
         _max=_max,
         description=description,
+        attachment=attachment,
         formatter=_format_range,
         fmt=fmt,
     )
@@ -316,7 +433,9 @@ def _outside_range_equal_max(chk: _CheckClass) -> bool:
     return chk.test_val < chk._min or chk.test_val >= chk._max
 
 
-def chk_outside_range_equal_max(test_val, _min, _max, description="", fmt=None) -> bool:
+def chk_outside_range_equal_max(
+    test_val, _min, _max, description="", fmt=None, attachment=None
+) -> bool:
     """Check: test_val >= _max or < _min"""
     return _message_parse(
         test_val=test_val,
@@ -324,6 +443,7 @@ def chk_outside_range_equal_max(test_val, _min, _max, description="", fmt=None)
         _min=_min,
         _max=_max,
         description=description,
+        attachment=attachment,
         formatter=_format_range,
         fmt=fmt,
     )
@@ -333,13 +453,16 @@ def _smaller_or_equal(chk: _CheckClass) -> bool:
     return chk.test_val <= chk.nominal
 
 
-def chk_smaller_or_equal(test_val, nominal, description="", fmt=None) -> bool:
+def chk_smaller_or_equal(
+    test_val, nominal, description="", fmt=None, attachment=None
+) -> bool:
     """Check: test_val <= nominal"""
     return _message_parse(
         test_val=test_val,
         target=_smaller_or_equal,
         nominal=nominal,
         description=description,
+        attachment=attachment,
         formatter=_format_onesided,
         fmt=fmt,
     )
@@ -349,13 +472,16 @@ def _greater_or_equal(chk: _CheckClass) -> bool:
     return chk.test_val >= chk.nominal
 
 
-def chk_greater_or_equal(test_val, nominal, description="", fmt=None) -> bool:
+def chk_greater_or_equal(
+    test_val, nominal, description="", fmt=None, attachment=None
+) -> bool:
     """Check: test_val >= nominal"""
     return _message_parse(
         test_val=test_val,
         target=_greater_or_equal,
         nominal=nominal,
         description=description,
+        attachment=attachment,
         formatter=_format_onesided,
         fmt=fmt,
     )
@@ -365,13 +491,14 @@ def _smaller(chk: _CheckClass) -> bool:
     return chk.test_val < chk.nominal
 
 
-def chk_smaller(test_val, nominal, description="", fmt=None) -> bool:
+def chk_smaller(test_val, nominal, description="", fmt=None, attachment=None) -> bool:
     """Check: test_val < nominal"""
     return _message_parse(
         test_val=test_val,
         target=_smaller,
         nominal=nominal,
         description=description,
+        attachment=attachment,
         formatter=_format_onesided,
         fmt=fmt,
     )
@@ -381,13 +508,14 @@ def _greater(chk: _CheckClass) -> bool:
     return chk.test_val > chk.nominal
 
 
-def chk_greater(test_val, nominal, description="", fmt=None) -> bool:
+def chk_greater(test_val, nominal, description="", fmt=None, attachment=None) -> bool:
     """Check: test_val > nominal"""
     return _message_parse(
         test_val=test_val,
         target=_greater,
         nominal=nominal,
         description=description,
+        attachment=attachment,
         formatter=_format_onesided,
         fmt=fmt,
     )
@@ -397,13 +525,14 @@ def _equal(chk: _CheckClass) -> bool:
     return chk.test_val == chk.nominal
 
 
-def chk_equal(test_val, nominal, description="", fmt=None) -> bool:
+def chk_equal(test_val, nominal, description="", fmt=None, attachment=None) -> bool:
     """Check: test_val == nominal"""
     return _message_parse(
         test_val=test_val,
         target=_equal,
         nominal=nominal,
         description=description,
+        attachment=attachment,
         formatter=_format_onesided,
         fmt=fmt,
     )
@@ -413,12 +542,13 @@ def _true(chk: _CheckClass) -> bool:
     return chk.test_val is True
 
 
-def chk_true(test_val, description="", fmt="") -> bool:
+def chk_true(test_val, description="", fmt="", attachment=None) -> bool:
     """Check: test_val is True"""
     return _message_parse(
         test_val=test_val,
         target=_true,
         description=description,
+        attachment=attachment,
         formatter=_format_testvalue,
         fmt=fmt,
     )
@@ -428,12 +558,13 @@ def _false(chk: _CheckClass) -> bool:
     return chk.test_val is False
 
 
-def chk_false(test_val, description="", fmt="") -> bool:
+def chk_false(test_val, description="", fmt="", attachment=None) -> bool:
     """Check: test_val is False"""
     return _message_parse(
         test_val=test_val,
         target=_false,
         description=description,
+        attachment=attachment,
         formatter=_format_testvalue,
         fmt=fmt,
     )
@@ -447,7 +578,9 @@ def _in_tolerance_equal(chk: _CheckClass) -> bool:
     )
 
 
-def chk_in_tolerance_equal(test_val, nominal, tol, description="", fmt=None) -> bool:
+def chk_in_tolerance_equal(
+    test_val, nominal, tol, description="", fmt=None, attachment=None
+) -> bool:
     """Check: nominal - tol% <= test_val <= nominal + tol%"""
     return _message_parse(
         test_val=test_val,
@@ -455,6 +588,7 @@ def chk_in_tolerance_equal(test_val, nominal, tol, description="", fmt=None) ->
         nominal=nominal,
         tol=tol,
         description=description,
+        attachment=attachment,
         formatter=_format_tolerance,
         fmt=fmt,
     )
@@ -465,7 +599,7 @@ def _in_deviation_equal(chk: _CheckClass) -> bool:
 
 
 def chk_in_deviation_equal(
-    test_val, nominal, deviation, description="", fmt=None
+    test_val, nominal, deviation, description="", fmt=None, attachment=None
 ) -> bool:
     """Check: nominal - deviation <= test_val <= nominal + deviation"""
     return _message_parse(
@@ -474,6 +608,178 @@ def chk_in_deviation_equal(
         nominal=nominal,
         deviation=deviation,
         description=description,
+        attachment=attachment,
         formatter=_format_deviation,
         fmt=fmt,
     )
+
+
+@dataclass(slots=True)
+class _ArrayCheckClass(_CheckClass):
+    """Evaluates a check over an array of values, producing a single result"""
+
+    stats: Optional[ArrayCheckStats] = field(default=None)
+
+    def get_result(self) -> CheckResult:
+        result = self.target(self)
+        self.status = "PASS" if result else "FAIL"
+        self.target_name = _target_name(self.target)
+        stats = self.stats
+        check_params = [
+            stats.worst_min,
+            stats.worst_max,
+            f"count={stats.count}",
+            f"failed={stats.fail_count}",
+            f"worst-index={stats.worst_index}",
+            f"min-margin={stats.min_margin}",
+            f"mean-margin={stats.mean_margin}",
+        ]
+        return CheckResult(
+            result,
+            self.status,
+            self.description,
+            stats.worst_value,
+            self.target_name,
+            self._generate_check_string,
+            check_params,
+            stats,
+            _attachment_array(self.attachment),
+        )
+
+
+def _array_message_parse(target: Callable[[_ArrayCheckClass], bool], **kwargs) -> bool:
+    chk = _ArrayCheckClass(target=target, **kwargs)
+    chkresult = chk.get_result()
+    return fixate.config.RESOURCES["SEQUENCER"].check(chkresult)
+
+
+def _array_evaluate(
+    chk: _ArrayCheckClass,
+    vals: "np.ndarray",
+    lo: "np.ndarray",
+    hi: "np.ndarray",
+    passes,
+) -> bool:
+    """Store the summary of an array check on chk and return the overall result"""
+    import numpy as np
+
+    margin = np.minimum(vals - lo, hi - vals)
+    # NaN values can never pass, so treat them as the worst possible margin
+    margin = np.where(np.isnan(margin), -np.inf, margin)
+    worst = int(np.argmin(margin))
+    finite = margin[np.isfinite(margin)]
+    chk.stats = ArrayCheckStats(
+        count=vals.size,
+        fail_count=int(np.count_nonzero(~passes)),
+        fail_indices=tuple(np.flatnonzero(~passes).tolist()),
+        worst_index=worst,
+        worst_value=vals[worst].item(),
+        worst_min=lo[worst].item(),
+        worst_max=hi[worst].item(),
+        min_margin=margin[worst].item(),
+        mean_margin=finite.mean().item() if finite.size else float("nan"),
+    )
+    return bool(passes.all())
+
+
+def _array_limits(chk: _ArrayCheckClass):
+    """Broadcast test values and limits to flat float arrays of the same length"""
+    import numpy as np
+
+    vals, lo, hi = np.broadcast_arrays(
+        np.asarray(chk.test_val, dtype=float),
+        np.asarray(chk._min, dtype=float),
+        np.asarray(chk._max, dtype=float),
+    )
+    if vals.size == 0:
+        raise ValueError("No values to check")
+    return vals.ravel(), lo.ravel(), hi.ravel()
+
+
+def _format_array_range(chk: _ArrayCheckClass) -> str:
+    fmt = chk.fmt if chk.fmt is not None else ".3g"  # Default
+    stats = chk.stats
+    return (
+        f"{chk.status} when comparing {stats.count} values {chk.target_name} "
+        f"{stats.worst_min:{fmt}} - {stats.worst_max:{fmt}} : {stats.fail_count} failed, "
+        f"worst {stats.worst_value:{fmt}} at index {stats.worst_index} : {chk.description}"
+    )
+
+
+def _all_in_range(chk: _ArrayCheckClass) -> bool:
+    vals, lo, hi = _array_limits(chk)
+    return _array_evaluate(chk, vals, lo, hi, (lo < vals) & (vals < hi))
+
+
+def chk_all_in_range(
+    test_vals, _min, _max, description="", fmt=None, attachment=None
+) -> bool:
+    """Check: _min < test_val < _max for every value in test_vals
+
+    _min and _max may be scalars or arrays that broadcast against test_vals
+    """
+    return _array_message_parse(
+        test_val=test_vals,
+        target=_all_in_range,
+        _min=_min,
+        _max=_max,
+        description=description,
+        attachment=attachment,
+        formatter=_format_array_range,
+        fmt=fmt,
+    )
+
+
+def _all_in_range_equal(chk: _ArrayCheckClass) -> bool:
+    vals, lo, hi = _array_limits(chk)
+    return _array_evaluate(chk, vals, lo, hi, (lo <= vals) & (vals <= hi))
+
+
+def chk_all_in_range_equal(
+    test_vals, _min, _max, description="", fmt=None, attachment=None
+) -> bool:
+    """Check: _min <= test_val <= _max for every value in test_vals
+
+    _min and _max may be scalars or arrays that broadcast against test_vals
+    """
+    return _array_message_parse(
+        test_val=test_vals,
+        target=_all_in_range_equal,
+        _min=_min,
+        _max=_max,
+        description=description,
+        attachment=attachment,
+        formatter=_format_array_range,
+        fmt=fmt,
+    )
+
+
+def _all_in_mask(chk: _ArrayCheckClass) -> bool:
+    import numpy as np
+
+    shapes = {np.shape(chk.test_val), np.shape(chk._min), np.shape(chk._max)}
+    if len(shapes) != 1:
+        raise ValueError(
+            f"test_vals and mask limits must be the same shape, got {shapes}"
+        )
+    return _all_in_range_equal(chk)
+
+
+def chk_all_in_mask(
+    test_vals, mask_min, mask_max, description="", fmt=None, attachment=None
+) -> bool:
+    """Check: mask_min[i] <= test_vals[i] <= mask_max[i] for every point
+
+    For checking a waveform or sweep against a limit mask with a lower and upper
+    limit for each point
+    """
+    return _array_message_parse(
+        test_val=test_vals,
+        target=_all_in_mask,
+        _min=mask_min,
+        _max=mask_max,
+        description=description,
+        attachment=attachment,
+        formatter=_format_array_range,
+        fmt=fmt,
+    )
@@ -333,6 +333,9 @@ class TestList:
     They operate similar to a python list except that it has additional methods that can be overridden to provide additional functionality
     """
 
+    # Maximum time in seconds for all the tests in this list, or None for no limit
+    timeout = None
+
     def __init__(self, seq=None):
         self.tests = []
         if seq is None:
@@ -421,6 +424,11 @@ class TestClass:
     skip_exceptions = []
     abort_exceptions = [KeyboardInterrupt, AttributeError, NameError]
     skip_on_fail = False
+    # Maximum time in seconds for each attempt at the test, or None for no limit
+    timeout = None
+    # Set True if the test doesn't rely on state left by earlier tests. It may then be
+    # reordered when the sequencer is ordering tests from historical failure statistics
+    order_independent = False
 
     def __init__(self, skip=False):
         # Explicitly check if skip is True (and only true) to avoid the case where skip is set to a non-boolean value
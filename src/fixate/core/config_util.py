@@ -2,8 +2,12 @@ import cmd2
 import pyvisa
 import json
 import copy
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from shutil import copy2
 from pathlib import Path
+from fixate.drivers import pool
 from fixate.drivers.pps.bk_178x import BK178X
 from pyvisa.errors import VisaIOError
 import fixate.config
@@ -179,10 +183,12 @@ class FxConfigCmd(cmd2.Cmd):
             self._test_config_dict(self.updated_config_dict)
 
         elif args.type == "visa":
-            for visa_resource_name in pyvisa.ResourceManager().list_resources():
-                try:
-                    new_idn = visa_id_query(visa_resource_name)
-                except (VisaIOError, FxConfigError):
+            resource_names = pyvisa.ResourceManager().list_resources()
+            results = id_query_all(
+                [partial(visa_id_query, name) for name in resource_names]
+            )
+            for visa_resource_name, new_idn in zip(resource_names, results):
+                if isinstance(new_idn, Exception):
                     self._test_print_error(
                         visa_resource_name, "Error opening or responding to IDN"
                     )
@@ -315,15 +321,20 @@ class FxConfigCmd(cmd2.Cmd):
     def _test_config_dict(self, config_dict):
         visa_resources = config_dict["INSTRUMENTS"]["visa"]
         serial_resources = config_dict["INSTRUMENTS"]["serial"]
-        for idn, visa_resource_name in visa_resources:
-            try:
-                new_idn = visa_id_query(visa_resource_name)
-            except (VisaIOError, FxConfigError):
+        queries = [partial(visa_id_query, name) for _, name in visa_resources]
+        queries += [
+            partial(serial_id_query, port, baudrate)
+            for port, (_, baudrate) in serial_resources.items()
+        ]
+        results = id_query_all(queries)
+
+        for (idn, visa_resource_name), new_idn in zip(visa_resources, results):
+            if isinstance(new_idn, (VisaIOError, FxConfigError, TimeoutError)):
                 self._test_print_error(
                     visa_resource_name, "Error opening or responding to IDN"
                 )
-            except Exception as e:
-                self.perror(e)
+            elif isinstance(new_idn, Exception):
+                self.perror(new_idn)
             else:
                 if new_idn.strip() == idn.strip():
                     self._test_print_ok(visa_resource_name, idn.strip())
@@ -332,13 +343,12 @@ class FxConfigCmd(cmd2.Cmd):
                         visa_resource_name, "IDN Response does not match"
                     )
 
-        for port, params in serial_resources.items():
+        serial_results = results[len(visa_resources) :]
+        for (port, params), new_id in zip(serial_resources.items(), serial_results):
             idn, baudrate = params
-            try:
-                new_id = serial_id_query(port, baudrate)
-            except Exception as e:
+            if isinstance(new_id, Exception):
                 self._test_print_error(
-                    e, f"Error opening port '{port}' or responding to ID query"
+                    new_id, f"Error opening port '{port}' or responding to ID query"
                 )
             else:
                 if new_id.strip() == idn.strip():
@@ -348,6 +358,36 @@ class FxConfigCmd(cmd2.Cmd):
                     self._test_print_error(port, "ID query does not match")
 
 
+ID_QUERY_TIMEOUT = 10.0  # seconds for each instrument to open and answer
+
+
+def id_query_all(queries):
+    """
+    Run id queries concurrently, instead of waiting for each instrument in turn.
+
+    Args:
+        queries: functions that take no arguments and return an id
+
+    Returns:
+        list: the id from each query, or the exception it raised, in the same order. Queries
+        that take longer than ID_QUERY_TIMEOUT give a TimeoutError
+    """
+    # Not used as a context manager, that would wait for queries that have timed out
+    executor = ThreadPoolExecutor(max_workers=max(len(queries), 1))
+    try:
+        futures = [executor.submit(query) for query in queries]
+        deadline = time.monotonic() + ID_QUERY_TIMEOUT
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result(max(deadline - time.monotonic(), 0)))
+            except Exception as e:
+                results.append(e)
+        return results
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
 # Stolen from discover.py. This should probably get consolidated back there,
 # but I want to avoid messing with the internals for now.
 def visa_id_query(visa_resource_name):
@@ -360,7 +400,7 @@ def visa_id_query(visa_resource_name):
     Returns:
         str: result of the idn command
     """
-    instr = pyvisa.ResourceManager().open_resource(visa_resource_name, query_delay=0.1)
+    instr = pool.resource_manager().open_resource(visa_resource_name, query_delay=0.1)
     # 1 s timeout is overly conservative. But if we call clear() that can take a while for some instruments
     instr.timeout = 1000
     resp = instr.query("*IDN?")
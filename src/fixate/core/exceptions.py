@@ -18,6 +18,10 @@ class TestAbort(FixateError):
     pass
 
 
+class TestTimeout(FixateError):
+    pass
+
+
 class InstrumentError(FixateError):
     pass
 
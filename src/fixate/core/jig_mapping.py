@@ -3,6 +3,7 @@ import sys
 import warnings
 from math import ceil, log
 from fixate.core.common import bits, deprecated
+from fixate.core import timing
 
 
 class MuxWarning(Warning):
@@ -172,7 +173,7 @@ class VirtualAddressMap:
                 # Do clearing output before desired signals
                 self.update_clearing_output()
                 self._virtual_pin_values_active = self._virtual_pin_values_clear
-                time.sleep(self._clearing_time)
+                timing.wait(self._clearing_time)
                 self.update_output()
             # As a trigger has occurred reset our values to match the virtual values and clearing time back to 0
             self._clearing_time = 0
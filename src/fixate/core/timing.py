@@ -0,0 +1,183 @@
+"""
+Interruptible waits for the test thread.
+
+Drivers, switching and the UI should wait using this module instead of `time.sleep` or
+`Queue.get`. The sequencer marks the set_up and test of each test as interruptible with
+`watchdog()`. Within that region, a wait is cut short by raising:
+
+- `TestTimeout` if the test has a timeout and the watchdog expires
+- `SequenceAbort` as soon as the sequence is aborted, e.g. by closing the GUI
+
+Outside of the region, such as during tear_down, waits run to completion so that cleanup
+code is never interrupted part way through.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from queue import Queue, Empty
+from typing import Optional
+
+from fixate.core.exceptions import TestTimeout, SequenceAbort
+
+# Longest a blocking queue get goes without checking for an interrupt
+_POLL_INTERVAL = 0.05
+
+# Notified whenever a watchdog expires or the sequence is aborted, so waits wake up immediately
+_wake = threading.Condition()
+_abort = threading.Event()
+
+
+def _notify():
+    with _wake:
+        _wake.notify_all()
+
+
+class Watchdog:
+    """
+    Interrupt the thread that created it. Expiry only sets a flag, the exception is raised
+    by the test thread itself when it next calls `check()`, `wait()` or `queue_get()`.
+    """
+
+    def __init__(self, timeout: Optional[float] = None):
+        self.timeout = timeout
+        self.thread_id = threading.get_ident()
+        self.expired = threading.Event()
+        self.start_time = time.monotonic()
+        self._timer = None
+        if timeout is not None:
+            self._timer = threading.Timer(timeout, self._expire)
+            self._timer.daemon = True
+
+    def _expire(self):
+        self.expired.set()
+        _notify()
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.start_time
+
+    def start(self):
+        self.start_time = time.monotonic()
+        if self._timer is not None:
+            self._timer.start()
+
+    def cancel(self):
+        if self._timer is not None:
+            self._timer.cancel()
+
+
+_watchdog: Optional[Watchdog] = None
+
+
+@contextmanager
+def watchdog(timeout: Optional[float] = None):
+    """
+    Make waits in the calling thread interruptible for the duration of the with block.
+    If timeout is not None and the block completes after the timeout has expired,
+    `TestTimeout` is raised on exit.
+    """
+    global _watchdog
+    previous = _watchdog
+    dog = Watchdog(timeout)
+    _watchdog = dog
+    dog.start()
+    try:
+        yield dog
+        check()
+    finally:
+        dog.cancel()
+        _watchdog = previous
+
+
+def _active_watchdog() -> Optional[Watchdog]:
+    dog = _watchdog
+    if dog is not None and dog.thread_id == threading.get_ident():
+        return dog
+    return None
+
+
+def abort():
+    """
+    Interrupt any wait in an interruptible region. Called by the sequencer when the sequence
+    is aborted.
+    """
+    _abort.set()
+    _notify()
+
+
+def clear_abort():
+    _abort.clear()
+
+
+def check():
+    """
+    Raise `SequenceAbort` or `TestTimeout` if the calling thread should stop waiting
+    """
+    dog = _active_watchdog()
+    if dog is None:
+        return
+    if _abort.is_set():
+        raise SequenceAbort("Sequence Aborted")
+    if dog.expired.is_set():
+        raise TestTimeout(
+            f"Test timed out after {dog.elapsed():.2f} s (timeout={dog.timeout} s)"
+        )
+
+
+def wait(seconds: float):
+    """
+    Drop in replacement for `time.sleep` that can be interrupted by an abort or timeout
+    """
+    if _active_watchdog() is None:
+        time.sleep(seconds)
+        return
+    deadline = time.monotonic() + seconds
+    with _wake:
+        while True:
+            check()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            _wake.wait(remaining)
+
+
+def queue_get(q: Queue):
+    """
+    Blocking `q.get()` that can be interrupted by an abort or timeout
+    """
+    if _active_watchdog() is None:
+        return q.get()
+    while True:
+        check()
+        try:
+            return q.get(timeout=_POLL_INTERVAL)
+        except Empty:
+            pass
+
+
+def run(coroutine):
+    """
+    Run a coroutine to completion in the calling thread, e.g. the coroutine returned by an
+    ``async def test()``. Within an interruptible region it is cancelled on an abort or timeout,
+    and the exception raised as for any other wait
+    """
+    # Only async scripts need asyncio, which is slow to import
+    import asyncio
+
+    if _active_watchdog() is None:
+        return asyncio.run(coroutine)
+
+    async def supervise():
+        task = asyncio.ensure_future(coroutine)
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=_POLL_INTERVAL)
+            if done:
+                return task.result()
+            try:
+                check()
+            except BaseException:
+                task.cancel()
+                await asyncio.wait({task})
+                raise
+
+    return asyncio.run(supervise())
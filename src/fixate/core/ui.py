@@ -8,6 +8,7 @@ from collections import OrderedDict
 from pubsub import pub
 from fixate.config import RESOURCES
 from fixate.core.exceptions import UserInputError
+from fixate.core import timing
 
 USER_YES_NO = ("YES", "NO")
 USER_RETRY_ABORT_FAIL = ("RETRY", "ABORT", "FAIL")
@@ -179,6 +180,7 @@ def user_action(msg, target):
 
             # Yield control for other threads but don't slow down target
             time.sleep(0)
+            timing.check()
     finally:
         # No matter what, if we exit, we want to reset the UI
         callback_obj.target_finished_callback()
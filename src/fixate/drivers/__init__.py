@@ -1,7 +1,12 @@
-from typing import Protocol
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Protocol, Union
 
 import pubsub.pub
 
+logger = logging.getLogger(__name__)
+
 
 class InstrumentNotFoundError(Exception):
     pass
@@ -197,6 +202,83 @@ class DriverManager:
         return driver
 
 
+def _close_driver(driver) -> None:
+    """Close a driver that open_all isn't returning, with its context manager exit if it has one"""
+    try:
+        if hasattr(driver, "__exit__"):
+            driver.__exit__(None, None, None)
+        elif getattr(driver, "instrument", None) is not None:
+            driver.instrument.close()
+    except Exception:
+        logger.warning("Unable to close %s", type(driver).__name__, exc_info=True)
+
+
+def _close_when_opened(future: Future) -> None:
+    if not future.cancelled() and future.exception() is None:
+        _close_driver(future.result())
+
+
+def open_all(
+    openers: Dict[str, Callable[[], object]],
+    timeout: Union[float, Dict[str, float]] = 10.0,
+) -> DriverManager:
+    """
+    Open instruments concurrently and return them in a DriverManager.
+
+    Args:
+        openers: <id>=<function returning an open driver>, e.g. {"dmm": dmm.open}
+        timeout: seconds to wait for each instrument to open, or a dict of seconds by id.
+            Ids that aren't in the dict wait 10 s
+
+    Returns:
+        DriverManager: with a driver for every id
+
+    Raises:
+        InstrumentOpenError: if any instrument didn't open or timed out, after waiting for the rest.
+            The instruments that did open are closed. An opener that timed out can't be stopped,
+            so its instrument is closed when it finishes opening. With ``visa_session_pool`` the
+            closed session is left in the pool until the next open finds it closed and opens the
+            instrument again
+
+    Example:
+        >>> from fixate.drivers import dmm, funcgen, pps
+        >>> dm = open_all({"dmm": dmm.open, "funcgen": funcgen.open, "pps": pps.open})
+        >>> dm.dmm.measure("voltage_dc")
+    """
+    if not isinstance(timeout, dict):
+        timeout = dict.fromkeys(openers, timeout)
+    drivers = {}
+    failures = []
+    cause = None
+    start = time.monotonic()
+    # Not used as a context manager, that would wait for instruments that have timed out
+    executor = ThreadPoolExecutor(
+        max_workers=max(len(openers), 1), thread_name_prefix="open_all"
+    )
+    try:
+        futures = {name: executor.submit(opener) for name, opener in openers.items()}
+        for name, future in futures.items():
+            limit = timeout.get(name, 10.0)
+            remaining = max(start + limit - time.monotonic(), 0)
+            try:
+                drivers[name] = future.result(remaining)
+            except TimeoutError:
+                failures.append(f"{name}: timed out after {limit} s")
+                future.add_done_callback(_close_when_opened)
+            except Exception as e:
+                failures.append(f"{name}: {e!r}")
+                cause = cause or e
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    if failures:
+        for driver in drivers.values():
+            _close_driver(driver)
+        raise InstrumentOpenError(
+            "Unable to open instruments:\n" + "\n".join(failures)
+        ) from cause
+    return DriverManager(**drivers)
+
+
 if __name__ == "__main__":
 
     class MyDmm(Driver):
@@ -0,0 +1,123 @@
+"""
+asyncio driver API
+==================
+
+Open drivers with `open` to make their methods awaitable, so that operations on different
+instruments overlap instead of taking the sum of their latencies::
+
+    from fixate.drivers import aio, dmm, dso, pps
+
+    class Measure(TestClass):
+        async def test(self):
+            admm, adso, apps = await asyncio.gather(
+                aio.open(dmm.open), aio.open(dso.open), aio.open(pps.open)
+            )
+            await asyncio.gather(
+                admm.voltage_dc(_range=10), adso.single(), apps.channel1.voltage(5)
+            )
+            chk_in_range(await admm.measurement(), 4.9, 5.1)
+
+A driver that is already open can be wrapped with ``aio.AsyncDriver(driver)``.
+
+Each instrument has its own thread. Calls on one instrument run there one at a time, in the
+order they were made, so the instrument sees the same commands as with the blocking driver.
+Attributes are wrapped too, so nested APIs such as ``adso.ch1.scale(0.5)`` work as on the
+driver. Awaiting an attribute reads it on the instrument's thread, e.g.
+``await afuncgen.output_ch1``, and `assign` sets one, e.g.
+``await aio.assign(afuncgen, "output_ch1", True)``.
+
+The sequencer runs ``async def`` set_up, test and tear_down methods to completion, and cancels
+them on an abort or timeout. Cancelling drops the calls that haven't started yet, but a call that
+is already running on an instrument's thread can't be interrupted. The sequencer waits for it with
+`wait_idle` before it goes on to tear_down or the next test, so the blocking driver doesn't talk to
+an instrument while a cancelled call is still using it. A call that hangs for longer than
+``sequencer.INSTRUMENT_IDLE_TIMEOUT`` is logged and left running.
+"""
+
+import asyncio
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor, wait as _wait_futures
+from typing import Callable, Optional
+
+_lock = threading.Lock()
+_executors: weakref.WeakKeyDictionary[object, ThreadPoolExecutor] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _executor_for(driver) -> ThreadPoolExecutor:
+    # One thread per driver, so a driver only ever has one command in flight
+    with _lock:
+        executor = _executors.get(driver)
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix=f"aio-{type(driver).__name__}"
+            )
+            _executors[driver] = executor
+        return executor
+
+
+def wait_idle(timeout: Optional[float] = None) -> bool:
+    """
+    Wait for the calls already running or queued on every instrument's thread to finish.
+    Returns False if timeout expires first
+    """
+    with _lock:
+        executors = list(_executors.values())
+    # Each thread runs calls in order, so a no-op completes once the earlier calls have finished
+    done, pending = _wait_futures(
+        [executor.submit(lambda: None) for executor in executors], timeout
+    )
+    return not pending
+
+
+class AsyncDriver:
+    """
+    Awaitable view of a driver, or of an attribute of a driver. Calling it runs the call on the
+    instrument's thread and returns an awaitable for the result
+    """
+
+    def __init__(self, driver):
+        self._bind(_executor_for(driver), lambda: driver)
+
+    def _bind(self, executor: ThreadPoolExecutor, resolve: Callable):
+        object.__setattr__(self, "_executor", executor)
+        # Looks up the wrapped object, on the instrument's thread as properties may do I/O
+        object.__setattr__(self, "_resolve", resolve)
+
+    def _submit(self, func: Callable) -> asyncio.Future:
+        return asyncio.get_running_loop().run_in_executor(self._executor, func)
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        resolve = self._resolve
+        attribute = object.__new__(AsyncDriver)
+        attribute._bind(self._executor, lambda: getattr(resolve(), name))
+        return attribute
+
+    def __setattr__(self, name, value):
+        raise AttributeError(
+            f"Use 'await aio.assign(driver, {name!r}, value)' to set a driver attribute"
+        )
+
+    def __call__(self, *args, **kwargs) -> asyncio.Future:
+        resolve = self._resolve
+        return self._submit(lambda: resolve()(*args, **kwargs))
+
+    def __await__(self):
+        return self._submit(self._resolve).__await__()
+
+
+def assign(target: AsyncDriver, name: str, value) -> asyncio.Future:
+    """Set an attribute of the wrapped driver on the instrument's thread"""
+    resolve = target._resolve
+    return target._submit(lambda: setattr(resolve(), name, value))
+
+
+async def open(opener: Callable[[], object]) -> AsyncDriver:
+    """
+    Open a driver without blocking the event loop, e.g. ``admm = await aio.open(dmm.open)``
+    """
+    return AsyncDriver(await asyncio.to_thread(opener))
@@ -0,0 +1,116 @@
+"""
+api table binding
+
+The DSO, function generator and SPD3303X drivers declare their commands in an ``api`` table of
+(method path, handler, command template). `init_api` replaces each placeholder method with a
+function that calls the handler with the template and the call's arguments by name.
+
+The parameter names of each placeholder method are read once per method and shared by every
+instance of the driver, so calls don't inspect the method's signature.
+"""
+
+import functools
+import inspect
+from typing import Callable, Dict, Tuple
+
+# Parameters by function or class. Bound methods are keyed by their function, which is shared by every
+# instance of the driver
+_parameters: Dict[Callable, Tuple[Tuple[str, ...], Dict[str, bool]]] = {}
+
+
+def _signature_parameters(func: Callable) -> Tuple[Tuple[str, ...], Dict[str, bool]]:
+    parameters = inspect.signature(func).parameters
+    return tuple(parameters), {
+        name: parameter.annotation == bool for name, parameter in parameters.items()
+    }
+
+
+def parameters(func: Callable) -> Tuple[Tuple[str, ...], Dict[str, bool]]:
+    """
+    (parameter names, whether each parameter is annotated bool) of func, as by
+    inspect.signature
+    """
+    if inspect.ismethod(func):
+        key = func.__func__
+    elif inspect.isfunction(func):
+        key = func
+    elif inspect.isfunction(getattr(type(func), "__call__", None)) and not (
+        hasattr(func, "__wrapped__") or hasattr(func, "__signature__")
+    ):
+        # A callable object, such as DSO measurement sources, has its class's signature
+        key = type(func)
+    else:
+        return _signature_parameters(func)
+    result = _parameters.get(key)
+    if result is None:
+        result = _parameters[key] = _signature_parameters(func)
+    return result
+
+
+def api_method(
+    func: Callable, handler: Callable, base_str, bool_to_on_off: bool = False
+) -> Callable:
+    """
+    Function calling handler(base_str, **kwargs), with positional arguments named as func's
+    parameters. With bool_to_on_off, arguments for parameters annotated bool are passed as
+    "ON" or "OFF"
+    """
+    names, is_bool = parameters(func)
+
+    if bool_to_on_off:
+
+        def api_func(*nargs, **nkwargs):
+            for index, param in enumerate(nargs):
+                nkwargs[names[index]] = param
+            for k, v in nkwargs.items():
+                if is_bool[k]:
+                    nkwargs[k] = "ON" if v else "OFF"
+            return handler(base_str, **nkwargs)
+
+    else:
+
+        def api_func(*nargs, **nkwargs):
+            for index, param in enumerate(nargs):
+                nkwargs[names[index]] = param
+            return handler(base_str, **nkwargs)
+
+    if not inspect.ismethod(func):
+        return functools.update_wrapper(api_func, func)
+    # What functools.update_wrapper copies from a method, without its lookups of attributes
+    # that may be missing, which were most of the cost of binding a driver's api
+    function = func.__func__
+    api_func.__module__ = function.__module__
+    api_func.__name__ = function.__name__
+    api_func.__qualname__ = function.__qualname__
+    api_func.__doc__ = function.__doc__
+    api_func.__annotations__ = function.__annotations__
+    api_func.__type_params__ = function.__type_params__
+    api_func.__dict__.update(function.__dict__)
+    api_func.__wrapped__ = func  # type: ignore[attr-defined]
+    return api_func
+
+
+def init_api(driver, prepare_string: Callable):
+    """Replace each method named in driver.api with prepare_string(method, handler, base_str)"""
+    for func_str, handler, base_str in driver.api:
+        *parents, func = func_str.split(".")
+        parent_obj = driver
+        for parent in parents:
+            parent_obj = getattr(parent_obj, parent)
+        func_obc = getattr(parent_obj, func)
+        setattr(parent_obj, func, prepare_string(func_obc, handler, base_str))
+
+
+def format_command(base_str: str, kwargs: dict) -> str:
+    """
+    Format base_str with kwargs until it stops changing, as stored values can hold further
+    placeholders
+    """
+    prev_string = base_str
+    while "{" in prev_string or "}" in prev_string:
+        cur_string = prev_string.format(**kwargs)
+        if cur_string == prev_string:
+            break
+        prev_string = cur_string
+    # A string without braces formats to itself, so needs no further pass
+    return prev_string
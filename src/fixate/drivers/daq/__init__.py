@@ -1,5 +1,5 @@
-import fixate.drivers.daq.daqmx
-
-
 def open():
+    # PyDAQmx loads the NI-DAQmx library, so is only imported when used
+    import fixate.drivers.daq.daqmx
+
     return fixate.drivers.daq.daqmx.DaqMx()
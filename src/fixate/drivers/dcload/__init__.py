@@ -6,37 +6,41 @@ Use `DCLoad.open()` to connect to a DC electronic load.
 Functions are dictated by the abstract superclass ``DCLoad`` in helper.py
 """
 
-import pyvisa
+from typing import TYPE_CHECKING
 
-import fixate.drivers
+from fixate import _lazy
 from fixate.config import find_instrument_by_id
-from fixate.drivers import InstrumentNotFoundError, InstrumentOpenError
-from fixate.drivers.dcload.rigol_dl3021 import RigolDL3021
+from fixate.drivers import InstrumentNotFoundError
 from fixate.drivers.dcload.helper import DCLoad
 
+if TYPE_CHECKING:
+    from fixate.drivers.dcload.rigol_dl3021 import RigolDL3021
 
-def open() -> DCLoad:
+# The drivers import pyvisa, which is slow to import, so are only imported when used
+__getattr__, __dir__ = _lazy.attach(__name__, {"RigolDL3021": ".rigol_dl3021"})
+
+
+def open(lazy: bool = False) -> DCLoad:
     """
     Connect to a DC electronic load.
 
     Searches for a configured instrument and returns the first one found.
 
+    Args:
+        lazy: don't connect until the driver is first used
+
     Returns:
         DCLoad: open connection to the DCLoad
     """
+    from fixate.drivers import pool
+    from fixate.drivers.dcload.rigol_dl3021 import RigolDL3021
+
+    if lazy:
+        return pool.lazy_driver(open)
     for DCLoad in (RigolDL3021,):
         instrument = find_instrument_by_id(DCLoad.REGEX_ID)
         if instrument is not None:
-            # We've found a configured instrument so try to open it
-            rm = pyvisa.ResourceManager()
-            try:
-                resource = rm.open_resource(instrument.address)
-            except pyvisa.VisaIOError as e:
-                raise InstrumentOpenError(
-                    f"Unable to open DCLoad: {instrument.address}"
-                ) from e
-            # Instantiate driver with connected instrument
-            driver = DCLoad(resource)
-            fixate.drivers.log_instrument_open(driver)
-            return driver
+            # We've found a configured instrument so try to open it, or reuse the
+            # session from the last time it was opened
+            return pool.open_driver(DCLoad, instrument.address, "DCLoad")
     raise InstrumentNotFoundError
@@ -11,38 +11,45 @@ Functions are dictated by the abstract superclass ``DMM`` in helper.py
     dmm.reset()
 """
 
-import pyvisa
+from typing import TYPE_CHECKING
 
-import fixate.drivers
+from fixate import _lazy
 from fixate.config import find_instrument_by_id
-from fixate.drivers import InstrumentNotFoundError, InstrumentOpenError
-from fixate.drivers.dmm.fluke_8846a import Fluke8846A
-from fixate.drivers.dmm.keithley_6500 import Keithley6500
+from fixate.drivers import InstrumentNotFoundError
 from fixate.drivers.dmm.helper import DMM
 
+if TYPE_CHECKING:
+    from fixate.drivers.dmm.fluke_8846a import Fluke8846A
+    from fixate.drivers.dmm.keithley_6500 import Keithley6500
 
-def open() -> DMM:
+# The drivers import pyvisa, which is slow to import, so are only imported when used
+__getattr__, __dir__ = _lazy.attach(
+    __name__, {"Fluke8846A": ".fluke_8846a", "Keithley6500": ".keithley_6500"}
+)
+
+
+def open(lazy: bool = False) -> DMM:
     """
     Connect to a digital multimeter.
 
     Searches for a configured instrument and returns the first one found.
 
+    Args:
+        lazy: don't connect until the driver is first used
+
     Returns:
         DMM: open connection to the DMM
     """
+    from fixate.drivers import pool
+    from fixate.drivers.dmm.fluke_8846a import Fluke8846A
+    from fixate.drivers.dmm.keithley_6500 import Keithley6500
+
+    if lazy:
+        return pool.lazy_driver(open)
     for DMM in (Fluke8846A, Keithley6500):
         instrument = find_instrument_by_id(DMM.REGEX_ID)
         if instrument is not None:
-            # We've found a configured instrument so try to open it
-            rm = pyvisa.ResourceManager()
-            try:
-                resource = rm.open_resource(instrument.address)
-            except pyvisa.VisaIOError as e:
-                raise InstrumentOpenError(
-                    f"Unable to open DMM: {instrument.address}"
-                ) from e
-            # Instantiate driver with connected instrument
-            driver = DMM(resource)
-            fixate.drivers.log_instrument_open(driver)
-            return driver
+            # We've found a configured instrument so try to open it, or reuse the
+            # session from the last time it was opened
+            return pool.open_driver(DMM, instrument.address, "DMM")
     raise InstrumentNotFoundError
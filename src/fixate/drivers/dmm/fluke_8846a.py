@@ -1,7 +1,8 @@
 from threading import Lock
 from fixate.core.exceptions import InstrumentError, ParameterError
 from fixate.drivers.dmm.helper import DMM
-import time
+from fixate.core import timing
+from fixate.drivers.pacing import Pacer, FixedDelay
 
 
 class Fluke8846A(DMM):
@@ -12,6 +13,15 @@ class Fluke8846A(DMM):
         # Delay between call to self.measurement() and querying the DMM.
         self.measurement_delay = 0
         self.instrument = instrument
+        # Sleep to stop DMM crashes
+        self.pacer = Pacer(
+            instrument,
+            FixedDelay(0.05),
+            type(self).__name__,
+            check=self._is_error,
+            max_message=200,
+            resets=("CONF",),  # Configuring a measurement resets the NPLC and trigger
+        )
         instrument.rtscts = 1
         self.lock = Lock()
         self.display = "on"
@@ -61,7 +71,7 @@ class Fluke8846A(DMM):
     @samples.setter
     def samples(self, val):
         self._write(f"SAMP:COUN {val}")
-        self._is_error()
+        self.pacer.checkpoint()
         self._samples = val
 
     def local(self):
@@ -79,7 +89,7 @@ class Fluke8846A(DMM):
         # Set number of samples to maximum:
         self._write(f"TRIG:COUN {int(MAX_TRIGGER_COUNT/samples)}")
         self._write("INIT")  # Wait for trigger
-        self._is_error()  # Catch possible insufficient memory error (and others)
+        self.pacer.checkpoint()  # Catch possible insufficient memory error (and others)
 
     def trigger(self):
         """
@@ -88,7 +98,7 @@ class Fluke8846A(DMM):
         if self._manual_trigger == False:
             raise InstrumentError("Manual trigger mode not set.")
         self._write("*TRG")  # Send trigger to instrument
-        self._is_error()  # Catch errors. This might slow things down
+        self.pacer.checkpoint()  # Catch errors. This might slow things down
 
     def measurement(self, delay=None):
         """
@@ -101,7 +111,7 @@ class Fluke8846A(DMM):
             delay = self.measurement_delay
 
         if delay > 0:
-            time.sleep(delay)
+            timing.wait(delay)
         return self.measurements()[0]
 
     def measurements(self):
@@ -123,10 +133,10 @@ class Fluke8846A(DMM):
         self._write("CALC:FUNC AVER")
         self._write("CALC:STAT ON")
         self._write("INIT")
-        time.sleep(sample_time)
-        min_ = self.instrument.query_ascii_values("CALC:AVER:MIN?")[0]
-        avg_ = self.instrument.query_ascii_values("CALC:AVER:AVER?")[0]
-        max_ = self.instrument.query_ascii_values("CALC:AVER:MAX?")[0]
+        timing.wait(sample_time)
+        min_ = self.pacer.query_ascii_values("CALC:AVER:MIN?")[0]
+        avg_ = self.pacer.query_ascii_values("CALC:AVER:AVER?")[0]
+        max_ = self.pacer.query_ascii_values("CALC:AVER:MAX?")[0]
 
         values = DMM.MeasurementStats(min=min_, avg=avg_, max=max_)
 
@@ -141,9 +151,10 @@ class Fluke8846A(DMM):
         Checks for errors and then returns DMM to power up state
         """
         with self.lock:
-            self._is_error(silent=True)
+            with self.pacer.clearing_errors():
+                self._is_error(silent=True)
             self._write(["*rst", "SYST:REM", "*cls", f"disp {self.display}"])
-            self._is_error()
+            self.pacer.checkpoint()
 
     def __enter__(self):
         return self
@@ -152,19 +163,29 @@ class Fluke8846A(DMM):
         self.instrument.close()
         self.is_connected = False
 
-    def _write(self, data):
+    def batch(self):
+        """
+        Send the writes within the block as compound commands where the instrument allows,
+        and check for errors once at the end
+        """
+        return self.pacer.batch()
+
+    def sync(self):
+        """Check for errors now, for the deferred and sync error check policies"""
+        self.pacer.sync()
+
+    def _write(self, data, cache=False):
         """
         Writes data to the DMM
+        cache: True for settings that can be skipped if they are already set, see fixate.drivers.pacing
         raise: ParameterError if called with no data string
         """
         if data:
             if isinstance(data, str):
-                self.instrument.write(data)
-                time.sleep(0.05)  # Sleep to stop DMM crashes
+                self.pacer.write(data, cache=cache)
             elif isinstance(data, list) and all([isinstance(itm, str) for itm in data]):
                 for itm in data:
-                    self.instrument.write(itm)
-                    time.sleep(0.05)  # Sleep to stop DMM crashes
+                    self.pacer.write(itm, cache=cache)
             else:
                 raise ParameterError("Invalid data to send to instrument")
         else:
@@ -180,12 +201,12 @@ class Fluke8846A(DMM):
         return: values read from the DMM
         """
         if self._manual_trigger:
-            values = self.instrument.query_ascii_values("FETCH?")
+            values = self.pacer.query_ascii_values("FETCH?")
             # Reset for next set of measurements (clear buffer).
             # Fluke does not allow you to manually clear the buffer, so this roundabout way is used instead
             self.set_manual_trigger(samples=self.samples)
         else:
-            values = self.instrument.query_ascii_values("READ?")
+            values = self.pacer.query_ascii_values("READ?")
 
         if self.legacy_mode:
             self._is_error()
@@ -196,7 +217,7 @@ class Fluke8846A(DMM):
         Queries the DMM for errors and splits the resp string into the message and error code
         return: Error code and Error msg
         """
-        resp = self.instrument.query("SYST:ERR?")
+        resp = self.pacer.query("SYST:ERR?")
         try:
             code, msg = resp.strip("\n").split(",")
             code = int(code)
@@ -223,6 +244,7 @@ class Fluke8846A(DMM):
             if silent:
                 return errors
             else:
+                self.pacer.error()
                 raise InstrumentError(
                     "Error(s) Returned from DMM\n"
                     + "\n".join(
@@ -245,7 +267,7 @@ class Fluke8846A(DMM):
             mode_str += f" {_range}"
         if suffix is not None:
             mode_str += f" {suffix}"
-        self._write(mode_str)
+        self._write(mode_str, cache=True)
         self._write(
             [
                 "SYST:REM",
@@ -253,9 +275,10 @@ class Fluke8846A(DMM):
                 "TRIG:SOUR IMM",
                 "TRIG:COUN 1",
                 f"SAMP:COUN {self.samples}",
-            ]
+            ],
+            cache=True,
         )
-        self._is_error()
+        self.pacer.checkpoint()
 
     def voltage_ac(self, _range=None):
         self._set_measurement_mode("voltage_ac", _range)
@@ -342,7 +365,7 @@ class Fluke8846A(DMM):
         :return:
             (example: FLUKE, 45, 9080025, 2.0, D2.0)
         """
-        return self.instrument.query("*IDN?").strip()
+        return self.pacer.query("*IDN?").strip()
 
     def set_nplc(self, nplc=None, reset=False):
         if reset is True or nplc is None:
@@ -358,10 +381,10 @@ class Fluke8846A(DMM):
         # Remove the CONF: from the start of the string
         mode_str = mode_str.replace("CONF:", "")
 
-        self._write(f"{mode_str}:NPLC {nplc}")  # e.g. VOLT:DC:NPLC 10
+        self._write(f"{mode_str}:NPLC {nplc}", cache=True)  # e.g. VOLT:DC:NPLC 10
 
     def get_nplc(self):
         mode_str = f"{self._modes[self._mode]}"
         # Remove the CONF: from the start of the string
         mode_str = mode_str.replace("CONF:", "")
-        return float(self.instrument.query(f"{mode_str}:NPLC?"))
+        return float(self.pacer.query(f"{mode_str}:NPLC?"))
@@ -1,9 +1,11 @@
 from dataclasses import dataclass
+from typing import Any
 
 
 class DMM:
     REGEX_ID = "DMM"
     is_connected = False
+    instrument: Any  # The pyvisa resource, set by each driver
 
     def remote(self):
         """
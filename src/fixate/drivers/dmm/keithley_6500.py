@@ -1,7 +1,8 @@
 from threading import Lock
 from fixate.core.exceptions import InstrumentError, ParameterError
 from fixate.drivers.dmm.helper import DMM
-import time
+from fixate.core import timing
+from fixate.drivers.pacing import Pacer, FixedDelay
 
 
 class Keithley6500(DMM):
@@ -12,6 +13,15 @@ class Keithley6500(DMM):
         # Delay between call to self.measurement() and querying the DMM.
         self.measurement_delay = 0.2
         self.instrument = instrument
+        # Sleep to stop DMM crashes
+        self.pacer = Pacer(
+            instrument,
+            FixedDelay(0.05),
+            type(self).__name__,
+            check=self._is_error,
+            max_message=1024,
+            resets=("SENS:FUNC",),
+        )
         instrument.rtscts = 1
         self.lock = Lock()
         self.instrument.timeout = 10000
@@ -82,7 +92,7 @@ class Keithley6500(DMM):
             )
 
         self._write(f":COUN {val}")
-        self._is_error()
+        self.pacer.checkpoint()
         self._samples = val
 
     def local(self):
@@ -101,7 +111,7 @@ class Keithley6500(DMM):
     def remote(self):
         # Stop trigger loop and return to normal
         self._write("*TRG")
-        self._is_error()
+        self.pacer.checkpoint()
 
     def set_manual_trigger(self, samples=1):
         """
@@ -116,7 +126,7 @@ class Keithley6500(DMM):
         self._write("TRIG:LOAD 'EMPTY'")  # Load empty model
         self._write(f"TRIG:BLOC:MDIG 1, 'defbuffer1', {samples}")
         self._write("TRAC:CLE")
-        self._is_error()
+        self.pacer.checkpoint()
 
     def trigger(self):
         """
@@ -125,7 +135,7 @@ class Keithley6500(DMM):
         if self._manual_trigger == False:
             raise InstrumentError("Manual trigger mode not set.")
         self._write("INIT; *WAI")
-        self._is_error()
+        self.pacer.checkpoint()
 
     def measurement(self, delay=None):
         """
@@ -138,7 +148,7 @@ class Keithley6500(DMM):
             delay = self.measurement_delay
 
         if delay > 0:
-            time.sleep(delay)
+            timing.wait(delay)
         return self.measurements()[0]
 
     def measurements(self):
@@ -160,12 +170,12 @@ class Keithley6500(DMM):
         self._write(f"SENS:COUNt {samples}")
 
         # we don't actually want the results, this is just to tell the DMM to start sampling
-        _ = self.instrument.query_ascii_values('READ? "TempTable"')
-        time.sleep(sample_time)
+        _ = self.pacer.query_ascii_values('READ? "TempTable"')
+        timing.wait(sample_time)
 
-        avg_ = self.instrument.query_ascii_values('TRAC:STAT:AVER? "TempTable"')[0]
-        min_ = self.instrument.query_ascii_values('TRAC:STAT:MIN? "TempTable"')[0]
-        max_ = self.instrument.query_ascii_values('TRAC:STAT:MAX? "TempTable"')[0]
+        avg_ = self.pacer.query_ascii_values('TRAC:STAT:AVER? "TempTable"')[0]
+        min_ = self.pacer.query_ascii_values('TRAC:STAT:MIN? "TempTable"')[0]
+        max_ = self.pacer.query_ascii_values('TRAC:STAT:MAX? "TempTable"')[0]
 
         # cleanup
         self._write("SENS:COUNt 1")
@@ -179,11 +189,12 @@ class Keithley6500(DMM):
         """
         Checks for errors and then returns DMM to power up state
         """
-        self._is_error(silent=True)
+        with self.pacer.clearing_errors():
+            self._is_error(silent=True)
         # Wait for previous commands to finish, reset, clear event logs
         self._write("*RST")
         self._CLEAN_UP_FLAG = False
-        self._is_error()
+        self.pacer.checkpoint()
 
     def __enter__(self):
         return self
@@ -192,20 +203,30 @@ class Keithley6500(DMM):
         self.instrument.close()
         self.is_connected = False
 
-    def _write(self, data):
+    def batch(self):
+        """
+        Send the writes within the block as compound commands where the instrument allows,
+        and check for errors once at the end
+        """
+        return self.pacer.batch()
+
+    def sync(self):
+        """Check for errors now, for the deferred and sync error check policies"""
+        self.pacer.sync()
+
+    def _write(self, data, cache=False):
         """
         Writes data to the DMM
+        cache: True for settings that can be skipped if they are already set, see fixate.drivers.pacing
         raise: ParameterError if called with no data string
         """
         if data:
             if isinstance(data, str):
-                self.instrument.write(data)
-                time.sleep(0.05)  # Sleep to stop DMM crashes
+                self.pacer.write(data, cache=cache)
             elif isinstance(data, list) and all([isinstance(itm, str) for itm in data]):
                 # If we have a list of strings
                 for itm in data:
-                    self.instrument.write(itm)
-                    time.sleep(0.05)  # Sleep to stop DMM crashes
+                    self.pacer.write(itm, cache=cache)
             else:
                 raise ParameterError("Invalid data to send to instrument")
         else:
@@ -220,11 +241,11 @@ class Keithley6500(DMM):
         return: values read from the DMM
         """
         if not self._manual_trigger:
-            self.instrument.query("READ?; *WAI")  # Start sampling into debuffer1
+            self.pacer.query("READ?; *WAI")  # Start sampling into debuffer1
 
         # Get number of readings in buffer
-        readings = self.instrument.query_ascii_values("TRAC:ACTual?")
-        values = self.instrument.query_ascii_values(
+        readings = self.pacer.query_ascii_values("TRAC:ACTual?")
+        values = self.pacer.query_ascii_values(
             f"TRAC:DATA? 1, {readings[0]}"
         )  # Read values from the once done.
         if self.legacy_mode:
@@ -238,7 +259,7 @@ class Keithley6500(DMM):
         Queries the DMM for errors and splits the resp string into the message and error code
         return: Error code and Error msg
         """
-        resp = self.instrument.query("SYST:ERR:NEXT?")
+        resp = self.pacer.query("SYST:ERR:NEXT?")
         try:
             code, msg = resp.strip("\n").split(',"')
             code = int(code)
@@ -266,6 +287,7 @@ class Keithley6500(DMM):
             if silent:
                 return errors
             else:
+                self.pacer.error()
                 raise InstrumentError(
                     "Error(s) Returned from DMM\n"
                     + "\n".join(
@@ -288,9 +310,9 @@ class Keithley6500(DMM):
             mode_str += f"; :SENS:{self._modes[self._mode]}:RANGE {_range}"
         if suffix is not None:
             mode_str += suffix
-        self._write(mode_str)
-        self._write(f":COUN {self.samples}")
-        self._is_error()
+        self._write(mode_str, cache=True)
+        self._write(f":COUN {self.samples}", cache=True)
+        self.pacer.checkpoint()
 
     def voltage_ac(self, _range=None):
         self._set_measurement_mode("voltage_ac", _range)
@@ -384,7 +406,7 @@ class Keithley6500(DMM):
         :return:
             (example: FLUKE, 45, 9080025, 2.0, D2.0)
         """
-        return self.instrument.query("*IDN?").strip()
+        return self.pacer.query("*IDN?").strip()
 
     def set_nplc(self, nplc=None, reset=False):
         if reset is True or nplc is None:
@@ -400,7 +422,7 @@ class Keithley6500(DMM):
             raise ParameterError(f"NPLC setting not available for mode {self._mode}")
 
         mode_str = f"{self._modes[self._mode]}"
-        self._write(f":SENS:{mode_str}:NPLC {nplc}")
+        self._write(f":SENS:{mode_str}:NPLC {nplc}", cache=True)
 
     def get_nplc(self):
-        return float(self.instrument.query(f":SENS:{self._modes[self._mode]}:NPLC?"))
+        return float(self.pacer.query(f":SENS:{self._modes[self._mode]}:NPLC?"))
@@ -1,25 +1,26 @@
-import pyvisa
+from typing import TYPE_CHECKING
 
-import fixate.drivers
+from fixate import _lazy
 from fixate.config import find_instrument_by_id
-from fixate.drivers import InstrumentNotFoundError, InstrumentOpenError
-from fixate.drivers.dso.agilent_mso_x import MSO_X_3000
+from fixate.drivers import InstrumentNotFoundError
 from fixate.drivers.dso.helper import DSO
 
+if TYPE_CHECKING:
+    from fixate.drivers.dso.agilent_mso_x import MSO_X_3000
 
-def open() -> DSO:
+# The drivers import pyvisa, which is slow to import, so are only imported when used
+__getattr__, __dir__ = _lazy.attach(__name__, {"MSO_X_3000": ".agilent_mso_x"})
+
+
+def open(lazy: bool = False) -> DSO:
+    from fixate.drivers import pool
+    from fixate.drivers.dso.agilent_mso_x import MSO_X_3000
+
+    if lazy:
+        return pool.lazy_driver(open)
     instrument = find_instrument_by_id(MSO_X_3000.REGEX_ID)
     if instrument is not None:
-        # We've found a configured instrument so try to open it
-        rm = pyvisa.ResourceManager()
-        try:
-            resource = rm.open_resource(instrument.address)
-        except pyvisa.VisaIOError as e:
-            raise InstrumentOpenError(
-                f"Unable to open DSO: {instrument.address}"
-            ) from e
-        # Instantiate driver with connected instrument
-        driver = MSO_X_3000(resource)
-        fixate.drivers.log_instrument_open(driver)
-        return driver
+        # We've found a configured instrument so try to open it, or reuse the
+        # session from the last time it was opened
+        return pool.open_driver(MSO_X_3000, instrument.address, "DSO")
     raise InstrumentNotFoundError
@@ -1,6 +1,9 @@
 import pyvisa
 from fixate.core.exceptions import InstrumentError
 from fixate.drivers.dso.helper import DSO
+from fixate.core import timing
+from fixate.drivers import api
+from fixate.drivers.pacing import Pacer, FixedDelay
 import time
 
 # Example IDN Strings
@@ -16,6 +19,14 @@ class MSO_X_3000(DSO):
 
     def __init__(self, instrument):
         super().__init__(instrument)
+        # Writes aren't delayed, the pacer is for the error check policy
+        self.pacer = Pacer(
+            instrument,
+            FixedDelay(0),
+            type(self).__name__,
+            max_message=1024,
+            check=self._raise_if_error,
+        )
         self.display = "on"
         self.is_connected = True
         self._mode = "STOP"
@@ -549,23 +560,23 @@ class MSO_X_3000(DSO):
         :return:
         """
         self._triggers_read = 0
-        self._raise_if_error()  # Raises if any errors were made during setup
+        self.pacer.sync()  # Raises if any errors were made during setup
         # Stop
         # Clear status registers (CLS)
-        self.instrument.write(":STOP;*CLS")
+        self.pacer.write(":STOP;*CLS")
         self._store["time_base_wait"] = (
-            self.instrument.query_ascii_values(":TIM:RANG?")[0]
-            + self.instrument.query_ascii_values(":TIM:POS?")[0]
+            self.pacer.query_ascii_values(":TIM:RANG?")[0]
+            + self.pacer.query_ascii_values(":TIM:POS?")[0]
         )
         # Enables the Event service request register (SRE)
         # Currently we're not using events. wait_on_trigger is polling. The current implementation
         # doesn't work when using a LAN connection to the instrument, so we will comment out for now
         # self.instrument.enable_event(visa.constants.EventType.service_request, visa.constants.VI_QUEUE)
-        self.instrument.write(":SINGLE")
+        self.pacer.write(":SINGLE")
         while True:
-            if self.instrument.query_ascii_values(":AER?")[0]:
+            if self.pacer.query_ascii_values(":AER?")[0]:
                 break
-            time.sleep(0.1)
+            timing.wait(0.1)
 
         self._mode = "SINGLE"
         self._wave_acquired = False
@@ -576,22 +587,30 @@ class MSO_X_3000(DSO):
         # Currently we're not using events. wait_on_trigger is polling. The current implementation
         # doesn't work when using a LAN connection to the instrument, so we will comment out for now
         # self.instrument.enable_event(visa.constants.EventType.service_request, visa.constants.VI_QUEUE)
-        self.instrument.write(":RUN")
+        self.pacer.write(":RUN")
         while True:
-            if self.instrument.query_ascii_values(":AER?")[0]:
+            if self.pacer.query_ascii_values(":AER?")[0]:
                 break
-            time.sleep(0.1)
+            timing.wait(0.1)
         self._mode = "RUN"
         self._wave_acquired = False
 
     def stop(self):
         self._triggers_read = 0
-        self.instrument.write(":STOP")
+        self.pacer.write(":STOP")
         self._mode = "STOP"
         self._wave_acquired = False
 
     def _write(self, value):
-        self.instrument.write(value)
+        self.pacer.write(value)
+
+    def batch(self):
+        """Send the writes within the block as compound commands"""
+        return self.pacer.batch()
+
+    def sync(self):
+        """Check for errors now, for the deferred and sync error check policies"""
+        self.pacer.sync()
 
     def acquire(self, acquire_type="normal", averaging_samples=0):
         """
@@ -683,18 +702,18 @@ class MSO_X_3000(DSO):
             )
 
         # Exit early if the requested channel is not currently displayed:
-        ch_state = int(self.instrument.query(f":CHANnel{int_signal}:DISPlay?"))
+        ch_state = int(self.pacer.query(f":CHANnel{int_signal}:DISPlay?"))
         if not ch_state:
             raise ValueError("Requested channel is not active!")
 
         # Set the channel:
-        self.instrument.write(f":WAVeform:SOURce CHANnel{int_signal}")
+        self.pacer.write(f":WAVeform:SOURce CHANnel{int_signal}")
         # Explicitly set this to avoid confusion
-        self.instrument.write(":WAVeform:FORMat BYTE")
-        self.instrument.write(":WAVeform:UNSigned 0")
+        self.pacer.write(":WAVeform:FORMat BYTE")
+        self.pacer.write(":WAVeform:UNSigned 0")
 
         # Pick the points mode depending on the current acquisiton mode:
-        acq_type = str(self.instrument.query(":ACQuire:TYPE?")).strip("\n")
+        acq_type = str(self.pacer.query(":ACQuire:TYPE?")).strip("\n")
         if acq_type == "AVER" or acq_type == "HRES":
             points_mode = "NORMal"
             # Use for Average and High Resoultion acquisition Types.
@@ -705,9 +724,9 @@ class MSO_X_3000(DSO):
             points_mode = "RAW"  # Use for Acq. Type NORMal or PEAK
 
         # This command sets the points mode to MAX AND ensures that the maximum # of points to be transferred is set, though they must still be on screen
-        self.instrument.write(":WAVeform:POINts MAX")
+        self.pacer.write(":WAVeform:POINts MAX")
         # The above command sets the points mode to MAX. So we set it here to make sure its what we want.
-        self.instrument.write(":WAVeform:POINts:MODE " + points_mode)
+        self.pacer.write(":WAVeform:POINts:MODE " + points_mode)
 
         # Check if there is actually data to acquire:
         data_available = int(self.query(":WAVeform:POINTs?"))
@@ -720,7 +739,7 @@ class MSO_X_3000(DSO):
         preamble = self.waveform_preamble()
         # Grab the data from the scope:
         # datatype definition is "b" for byte. See struct module details.
-        data = self.instrument.query_binary_values(
+        data = self.pacer.query_binary_values(
             ":WAV:DATA?", datatype="b", is_big_endian=True
         )
 
@@ -793,8 +812,8 @@ class MSO_X_3000(DSO):
         return signal
 
     def reset(self):
-        self.instrument.write("*CLS;*RST;:STOP")
-        time.sleep(0.15)
+        self.pacer.write("*CLS;*RST;:STOP")
+        timing.wait(0.15)
         self._check_errors()
 
     def auto_scale(self):
@@ -820,22 +839,22 @@ class MSO_X_3000(DSO):
 
     def query(self, value):
         try:
-            response = self.instrument.query(value)
+            response = self.pacer.query(value)
         finally:
-            self._raise_if_error()
+            self.pacer.checkpoint()
         return response
 
     def query_bool(self, value):
         return bool(self.query_ascii_value(value))
 
     def query_binary_values(self, value):
-        response = self.instrument.query_binary_values(value)
-        self._raise_if_error()
+        response = self.pacer.query_binary_values(value)
+        self.pacer.checkpoint()
         return response
 
     def query_ascii_values(self, value):
-        response = self.instrument.query_ascii_values(value)
-        self._raise_if_error()
+        response = self.pacer.query_ascii_values(value)
+        self.pacer.checkpoint()
         return response
 
     def query_ascii_value(self, value):
@@ -849,7 +868,7 @@ class MSO_X_3000(DSO):
         self.wait_for_acquire()
         try:
             formatted_string = self._format_string(base_str, **kwargs)
-            return self.instrument.query_ascii_values(formatted_string)[0]
+            return self.pacer.query_ascii_values(formatted_string)[0]
         except:
             self.instrument.close()
             self.instrument.open()
@@ -889,11 +908,12 @@ class MSO_X_3000(DSO):
     def _trigger_poll(self, timeout):
         start = time.time()
         while True:
-            trigger = self.instrument.query_ascii_values(":TER?")[0]
+            trigger = self.pacer.query_ascii_values(":TER?")[0]
             if trigger:
                 break
             if time.time() - start > timeout:
                 raise TimeoutError("Trigger didn't occur in {}s".format(timeout))
+            timing.check()
         self._triggers_read += 1
 
     def wait_for_acquire(self):
@@ -906,9 +926,10 @@ class MSO_X_3000(DSO):
             # Wait for mode to change to stop
             start = time.time()
             timeout = self._store["time_base_wait"] * 1.2
-            while int(self.instrument.query_ascii_values(":OPER:COND?")[0]) & 1 << 3:
+            while int(self.pacer.query_ascii_values(":OPER:COND?")[0]) & 1 << 3:
                 if time.time() - start > timeout:
                     raise TimeoutError("Waveform did not acquire in the specified time")
+                timing.check()
             self._wave_acquired = True
             return
         elif self._mode == "RUN":
@@ -922,11 +943,11 @@ class MSO_X_3000(DSO):
 
     def read_raw(self):
         data = self.instrument.read_raw()
-        self._raise_if_error()
+        self.pacer.checkpoint()
         return data
 
     def _check_errors(self):
-        time.sleep(0.1)
+        timing.wait(0.1)
         resp = self.instrument.query("SYST:ERR?")
         code, msg = resp.strip("\n").split(",")
         code = int(code)
@@ -962,13 +983,7 @@ class MSO_X_3000(DSO):
 
     def _format_string(self, base_str, **kwargs):
         kwargs["self"] = self
-        prev_string = base_str
-        while True:
-            cur_string = prev_string.format(**kwargs)
-            if cur_string == prev_string:
-                break
-            prev_string = cur_string
-        return cur_string
+        return api.format_command(base_str, kwargs)
 
     def store(self, store_dict, *args, **kwargs):
         """
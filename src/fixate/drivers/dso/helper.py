@@ -1,7 +1,7 @@
 import inspect
 from abc import ABCMeta, abstractmethod
-from functools import update_wrapper
 from fixate.core.exceptions import InstrumentFeatureUnavailable
+from fixate.drivers import api
 
 import typing
 
@@ -811,29 +811,7 @@ class DSO(metaclass=ABCMeta):
         )
 
     def init_api(self):
-        for func_str, handler, base_str in self.api:
-            *parents, func = func_str.split(".")
-            parent_obj = self
-            for parent in parents:
-                parent_obj = getattr(parent_obj, parent)
-            func_obc = getattr(parent_obj, func)
-            setattr(parent_obj, func, self.prepare_string(func_obc, handler, base_str))
+        api.init_api(self, self.prepare_string)
 
     def prepare_string(self, func, handler, base_str, *args, **kwargs):
-        def temp_func(*nargs, **nkwargs):
-            """
-            Only formats using **nkwargs
-            New Temp
-            :param nargs:
-            :param nkwargs:
-            :return:
-            """
-            sig = inspect.signature(func)
-            keys = [itm[0] for itm in sig.parameters.items()]
-            for index, param in enumerate(nargs):
-                nkwargs[keys[index]] = param
-            # new_str = base_str.format(**nkwargs)
-            # handler(self, new_str)
-            return handler(base_str, **nkwargs)
-
-        return update_wrapper(temp_func, func)
+        return api.api_method(func, handler, base_str)
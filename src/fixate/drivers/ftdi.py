@@ -1,12 +1,12 @@
 import ctypes
 import struct
-import time
 import os
 import re
 
 import fixate.drivers
 from fixate.core.common import bits
 from fixate.core.exceptions import FixateError, InstrumentNotConnected
+from fixate.core import timing
 
 from fixate.drivers._ftdi import ftdI2xx
 
@@ -171,7 +171,7 @@ class FTDI2xx(object):
         self.pin_value_mask = 0b111
 
         self.std_delay = 0.01
-        self.delay = time.sleep
+        self.delay = timing.wait
         # Data characteristics
         self._word_length = WORD_LENGTH.FT_BITS_8
         self._stop_bits = STOP_BITS.FT_STOP_BITS_1
@@ -23,35 +23,39 @@ output_ch3
 output_ch4
 """
 
-import pyvisa
+from typing import TYPE_CHECKING
 
-import fixate.drivers
+from fixate import _lazy
 from fixate.config import find_instrument_by_id
-from fixate.drivers import InstrumentNotFoundError, InstrumentOpenError
+from fixate.drivers import InstrumentNotFoundError
 from fixate.drivers.funcgen.helper import FuncGen
-from fixate.drivers.funcgen.keysight_33500b import Keysight33500B
-from fixate.drivers.funcgen.rigol_dg1022 import RigolDG1022
 
+if TYPE_CHECKING:
+    from fixate.drivers.funcgen.keysight_33500b import Keysight33500B
+    from fixate.drivers.funcgen.rigol_dg1022 import RigolDG1022
 
-def open() -> FuncGen:
+# The drivers import pyvisa, which is slow to import, so are only imported when used
+__getattr__, __dir__ = _lazy.attach(
+    __name__, {"Keysight33500B": ".keysight_33500b", "RigolDG1022": ".rigol_dg1022"}
+)
+
+
+def open(lazy: bool = False) -> FuncGen:
     """Open is the public api for the dmm driver for discovering and opening a connection
     to a valid Digital Multimeter
     :return:
     A instantiated class connected to a valid funcgen
     """
+    from fixate.drivers import pool
+    from fixate.drivers.funcgen.keysight_33500b import Keysight33500B
+    from fixate.drivers.funcgen.rigol_dg1022 import RigolDG1022
+
+    if lazy:
+        return pool.lazy_driver(open)
     for driver_class in (Keysight33500B, RigolDG1022):
         instrument = find_instrument_by_id(driver_class.REGEX_ID)
         if instrument is not None:
-            # We've found a configured instrument so try to open it
-            rm = pyvisa.ResourceManager()
-            try:
-                resource = rm.open_resource(instrument.address)
-            except pyvisa.VisaIOError as e:
-                raise InstrumentOpenError(
-                    f"Unable to open FuncGen: {instrument.address}"
-                ) from e
-            # Instantiate driver with connected instrument
-            driver = driver_class(resource)
-            fixate.drivers.log_instrument_open(driver)
-            return driver
+            # We've found a configured instrument so try to open it, or reuse the
+            # session from the last time it was opened
+            return pool.open_driver(driver_class, instrument.address, "FuncGen")
     raise InstrumentNotFoundError
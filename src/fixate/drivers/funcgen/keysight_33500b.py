@@ -1,9 +1,8 @@
-import time
 from fixate.core.common import mode_builder, unit_scale
 from fixate.core.exceptions import ParameterError, InstrumentError
 from fixate.drivers.funcgen.helper import FuncGen
-from functools import update_wrapper
-import inspect
+from fixate.drivers import api
+from fixate.drivers.pacing import Pacer, FixedDelay
 
 MODES = {
     ":SINusoid": {" [{frequency}]": {",[{amplitude}]": {",[{offset}]": {}}}},
@@ -45,6 +44,16 @@ class Keysight33500B(FuncGen):
         :return:
         """
         super().__init__(instrument)
+        # 100ms plus 166us per byte, see _write
+        self.pacer = Pacer(
+            instrument,
+            FixedDelay(0.1, 1 / 6000),
+            type(self).__name__,
+            check=self._is_error,
+            max_message=1024,
+            # Can change or limit the frequency, amplitude and offset
+            resets=("SOUR1:FUNC", "SOUR1:APPL", "SOUR1:VOLT:UNIT"),
+        )
         self.instrument.query_delay = 0.2
         self.instrument.timeout = 1000
         # Rigol Restrictions
@@ -291,7 +300,7 @@ class Keysight33500B(FuncGen):
         timeout = self.instrument.timeout
         try:
             self.instrument.timeout = 20000
-            resp = self.instrument.query("*TST?")
+            resp = self.pacer.query("*TST?")
             if "0" not in resp:
                 raise InstrumentError("Failed Self Test")
         finally:
@@ -314,7 +323,18 @@ class Keysight33500B(FuncGen):
         self._write("*RST;*CLS")
         self._write("OUTP1:LOAD INF")
 
-    def _write(self, data):
+    def batch(self):
+        """
+        Send the writes within the block as compound commands where the instrument allows,
+        and check for errors once at the end
+        """
+        return self.pacer.batch()
+
+    def sync(self):
+        """Check for errors now, for the deferred and sync error check policies"""
+        self.pacer.sync()
+
+    def _write(self, data, cache=False):
         """
         The DG1022 cannot respond to visa commands as quickly as some other devices
         A 100ms delay was found to be reliable for most commands with the exception of the *IDN?
@@ -324,21 +344,22 @@ class Keysight33500B(FuncGen):
         they write. By allowing 166uS delay for each byte of data then the Funcgen doesn't choke on the next call. A
         flat 100ms is added to allow processing time.
         This is especially important for commands that write large amounts of data such as user arbitrary forms.
+        Within `batch`, the lines of a multi-line string are joined into compound commands.
         """
         if data:
             if isinstance(data, str):
-                self.instrument.write(data)
-                time.sleep(0.1 + len(data) / 6000)
-            else:
-                for itm in data:
-                    self.instrument.write(itm)
-                    time.sleep(0.1 + len(itm) / 6000)
+                if self.pacer.batching:
+                    data = [line.strip() for line in data.split("\r\n")]
+                else:
+                    data = [data]
+            for itm in data:
+                self.pacer.write(itm, cache=cache)
         else:
             raise ParameterError("Missing data in instrument write")
-        self._is_error()
+        self.pacer.checkpoint()
 
     def _check_errors(self):
-        resp = self.instrument.query("SYST:ERR?")
+        resp = self.pacer.query("SYST:ERR?")
         code, msg = resp.strip("\n").split(",")
         code = int(code)
         msg = msg.strip('"')
@@ -356,6 +377,7 @@ class Keysight33500B(FuncGen):
             if silent:
                 return errors
             else:
+                self.pacer.error()
                 raise InstrumentError(
                     "Error(s) Returned from FuncGen\n"
                     + "\n".join(
@@ -368,18 +390,11 @@ class Keysight33500B(FuncGen):
 
     def write(self, base_str, *args, **kwargs):
         formatted_string = self._format_string(base_str, **kwargs)
-        self._write(formatted_string)
+        self._write(formatted_string, cache=True)
 
     def _format_string(self, base_str, **kwargs):
         kwargs["self"] = self
-        prev_string = base_str
-        cur_string = ""
-        while True:
-            cur_string = prev_string.format(**kwargs)
-            if cur_string == prev_string:
-                break
-            prev_string = cur_string
-        return cur_string
+        return api.format_command(base_str, kwargs)
 
     def store(self, store_dict, *args, **kwargs):
         """
@@ -415,39 +430,11 @@ class Keysight33500B(FuncGen):
         self.write(base_str, *args, **kwargs)
 
     def init_api(self):
-        for func_str, handler, base_str in self.api:
-            *parents, func = func_str.split(".")
-            parent_obj = self
-            for parent in parents:
-                parent_obj = getattr(parent_obj, parent)
-            func_obc = getattr(parent_obj, func)
-            setattr(parent_obj, func, self.prepare_string(func_obc, handler, base_str))
+        api.init_api(self, self.prepare_string)
 
     def prepare_string(self, func, handler, base_str, *args, **kwargs):
-        def temp_func(*nargs, **nkwargs):
-            """
-            Only formats using **nkwargs
-            New Temp
-            :param nargs:
-            :param nkwargs:
-            :return:
-            """
-            sig = inspect.signature(func)
-            keys = [itm[0] for itm in sig.parameters.items()]
-            # Hard coding for RIGOL. BOOLS should be converted to "ON", "OFF"
-            for index, param in enumerate(nargs):
-                nkwargs[keys[index]] = param
-            for k, v in nkwargs.items():
-                if sig.parameters[k].annotation == bool:
-                    if v:
-                        nkwargs[k] = "ON"
-                    else:
-                        nkwargs[k] = "OFF"
-            # new_str = base_str.format(**nkwargs)
-            # handler(self, new_str)
-            return handler(base_str, **nkwargs)
-
-        return update_wrapper(temp_func, func)
+        # Hard coding for RIGOL. BOOLS should be converted to "ON", "OFF"
+        return api.api_method(func, handler, base_str, bool_to_on_off=True)
 
     def get_identity(self) -> str:
         """
@@ -462,4 +449,4 @@ class Keysight33500B(FuncGen):
                 DD = FPGA revision
                 EE = PCBA revision
         """
-        return self.instrument.query("*IDN?").strip()
+        return self.pacer.query("*IDN?").strip()
@@ -1,9 +1,9 @@
-import time
-import inspect
-from functools import update_wrapper
 from fixate.core.common import mode_builder, unit_scale
 from fixate.core.exceptions import ParameterError, InstrumentError
 from fixate.drivers.funcgen.helper import FuncGen
+from fixate.core import timing
+from fixate.drivers import api
+from fixate.drivers.pacing import Pacer, FixedDelay
 
 MODES = {
     ":SINusoid": {
@@ -59,6 +59,15 @@ class RigolDG1022(FuncGen):
         :return:
         """
         super().__init__(instrument)
+        # 100ms plus 166us per byte, see _write
+        self.pacer = Pacer(
+            instrument,
+            FixedDelay(0.1, 1 / 6000),
+            type(self).__name__,
+            check=self._is_error,
+            # Can change or limit the frequency, amplitude and offset
+            resets=("APPL", "FUNC", "VOLT:UNIT"),
+        )
         self.instrument.query_delay = 0.2
         self.instrument.timeout = 1000
         # Rigol Restrictions
@@ -390,11 +399,11 @@ class RigolDG1022(FuncGen):
 
     @property
     def amplitude_ch1(self):
-        return self.instrument.query_ascii_values("VOLTAGE?")[0]
+        return self.pacer.query_ascii_values("VOLTAGE?")[0]
 
     @property
     def amplitude_ch2(self):
-        return self.instrument.query_ascii_values("VOLTAGE:CH2?")[0]
+        return self.pacer.query_ascii_values("VOLTAGE:CH2?")[0]
 
     @amplitude_ch1.setter
     def amplitude_ch1(self, val):
@@ -406,7 +415,7 @@ class RigolDG1022(FuncGen):
 
     @property
     def output_ch1(self):
-        resp = self.instrument.query("OUTP?")
+        resp = self.pacer.query("OUTP?")
         if "OFF" in resp:
             return False
         elif "ON" in resp:
@@ -427,7 +436,7 @@ class RigolDG1022(FuncGen):
 
     @property
     def output_ch2(self):
-        resp = self.instrument.query("OUTP:CH2?")
+        resp = self.pacer.query("OUTP:CH2?")
         if "OFF" in resp:
             return False
         elif "ON" in resp:
@@ -448,7 +457,7 @@ class RigolDG1022(FuncGen):
 
     @FuncGen.output_sync.setter
     def output_sync(self, val):
-        time.sleep(0.5)
+        timing.wait(0.5)
         if val not in [True, False]:
             raise ParameterError(
                 "Unknown output {} value for SYNC\nPlease select True or False".format(
@@ -467,7 +476,7 @@ class RigolDG1022(FuncGen):
         Remote control is activated on any other commands set to the device
         :return:
         """
-        time.sleep(0.5)
+        timing.wait(0.5)
         self._write("SYSTem:LOCal")
 
     def reset(self):
@@ -568,7 +577,18 @@ class RigolDG1022(FuncGen):
         """
         raise NotImplementedError
 
-    def _write(self, data):
+    def batch(self):
+        """
+        Send the writes within the block as compound commands where the instrument allows,
+        and check for errors once at the end
+        """
+        return self.pacer.batch()
+
+    def sync(self):
+        """Check for errors now, for the deferred and sync error check policies"""
+        self.pacer.sync()
+
+    def _write(self, data, cache=False):
         """
         The DG1022 cannot respond to visa commands as quickly as some other devices
         A 100ms delay was found to be reliable for most commands with the exception of the *IDN?
@@ -582,15 +602,16 @@ class RigolDG1022(FuncGen):
         if data:
             if isinstance(data, str):
                 data = data.split("\r\n")
-            for itm in data:
-                self.instrument.write(itm)
-                time.sleep(0.1 + len(itm) / 6000)
+            # The DG1022 doesn't accept compound commands, so each line is still a separate write
+            with self.pacer.batch():
+                for itm in data:
+                    self.pacer.write(itm, cache=cache)
         else:
             raise ParameterError("Missing data in instrument write")
-        self._is_error()
+        self.pacer.checkpoint()
 
     def _check_errors(self):
-        resp = self.instrument.query("SYST:ERR?")
+        resp = self.pacer.query("SYST:ERR?")
         code, msg = resp.strip("\n").split(",")
         code = int(code)
         msg = msg.strip('"')
@@ -608,6 +629,7 @@ class RigolDG1022(FuncGen):
             if silent:
                 return errors
             else:
+                self.pacer.error()
                 raise InstrumentError(
                     "Error(s) Returned from FuncGen\n"
                     + "\n".join(
@@ -620,18 +642,11 @@ class RigolDG1022(FuncGen):
 
     def write(self, base_str, *args, **kwargs):
         formatted_string = self._format_string(base_str, **kwargs)
-        self._write(formatted_string)
+        self._write(formatted_string, cache=True)
 
     def _format_string(self, base_str, **kwargs):
         kwargs["self"] = self
-        prev_string = base_str
-        cur_string = ""
-        while True:
-            cur_string = prev_string.format(**kwargs)
-            if cur_string == prev_string:
-                break
-            prev_string = cur_string
-        return cur_string
+        return api.format_command(base_str, kwargs)
 
     def store(self, store_dict, *args, **kwargs):
         """
@@ -667,42 +682,11 @@ class RigolDG1022(FuncGen):
         self.write(base_str, *args, **kwargs)
 
     def init_api(self):
-        for func_str, handler, base_str in self.api:
-            *parents, func = func_str.split(".")
-            parent_obj = self
-            try:
-                for parent in parents:
-                    parent_obj = getattr(parent_obj, parent)
-                func_obc = getattr(parent_obj, func)
-            except AttributeError:
-                # print("FAILED ON:", func_str)
-                raise
-            setattr(parent_obj, func, self.prepare_string(func_obc, handler, base_str))
+        api.init_api(self, self.prepare_string)
 
     def prepare_string(self, func, handler, base_str, *args, **kwargs):
-        def temp_func(*nargs, **nkwargs):
-            """
-            Only formats using **nkwargs
-            New Temp
-            :param nargs:
-            :param nkwargs:
-            :return:
-            """
-            sig = inspect.signature(func)
-            keys = [itm[0] for itm in sig.parameters.items()]
-            # Hard coding for RIGOL. BOOLS should be converted to "ON", "OFF"
-            for index, param in enumerate(nargs):
-                nkwargs[keys[index]] = param
-            for k, v in nkwargs.items():
-                if sig.parameters[k].annotation == bool:
-                    if v:
-                        nkwargs[k] = "ON"
-                    else:
-                        nkwargs[k] = "OFF"
-            return handler(base_str, **nkwargs)
-
-        return update_wrapper(temp_func, func)
-        # ------------------------------------------------------------------------------------------
+        # Hard coding for RIGOL. BOOLS should be converted to "ON", "OFF"
+        return api.api_method(func, handler, base_str, bool_to_on_off=True)
 
     def get_identity(self):
         """
@@ -710,4 +694,4 @@ class RigolDG1022(FuncGen):
         and the edition number that consists of numbers and separated by “.” .
         :return: RIGOL TECHNOLOGIES,DG1022,DG1000000002,00.01.00.04.00
         """
-        return self.instrument.query("*IDN?").strip()
+        return self.pacer.query("*IDN?").strip()
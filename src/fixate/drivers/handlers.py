@@ -8,7 +8,7 @@ from __future__ import annotations
 from typing import Sequence, Optional
 
 from fixate import Pin, PinValueAddressHandler
-from fixate.drivers import ftdi
+from fixate.drivers import ftdi, trace
 
 
 class FTDIAddressHandler(PinValueAddressHandler):
@@ -34,7 +34,9 @@ class FTDIAddressHandler(PinValueAddressHandler):
         # end up with some left-over bits. The +7 in the expression
         # ensures we round up.
         bytes_required = (len(self.pin_list) + 7) // 8
-        ftdi_handle = ftdi.open(ftdi_description=self._ftdi_description)
+        ftdi_handle = trace.wrap(
+            ftdi.open(ftdi_description=self._ftdi_description), "FTDI"
+        )
         ftdi_handle.configure_bit_bang(
             ftdi.BIT_MODE.FT_BITMODE_ASYNC_BITBANG,
             bytes_required=bytes_required,
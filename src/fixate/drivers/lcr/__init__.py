@@ -6,28 +6,29 @@ Functions are dictated by the metaclass in helper.py
 
 """
 
-import pyvisa
+from typing import TYPE_CHECKING
 
-import fixate.drivers
+from fixate import _lazy
 from fixate.config import find_instrument_by_id
-from fixate.drivers import InstrumentNotFoundError, InstrumentOpenError
-from fixate.drivers.lcr.agilent_u1732c import AgilentU1732C
+from fixate.drivers import InstrumentNotFoundError
 from fixate.drivers.lcr.helper import LCR
 
+if TYPE_CHECKING:
+    from fixate.drivers.lcr.agilent_u1732c import AgilentU1732C
 
-def open() -> LCR:
+# The drivers import pyvisa, which is slow to import, so are only imported when used
+__getattr__, __dir__ = _lazy.attach(__name__, {"AgilentU1732C": ".agilent_u1732c"})
+
+
+def open(lazy: bool = False) -> LCR:
+    from fixate.drivers import pool
+    from fixate.drivers.lcr.agilent_u1732c import AgilentU1732C
+
+    if lazy:
+        return pool.lazy_driver(open)
     instrument = find_instrument_by_id(AgilentU1732C.REGEX_ID)
     if instrument is not None:
-        # We've found a configured instrument so try to open it
-        rm = pyvisa.ResourceManager()
-        try:
-            resource = rm.open_resource(instrument.address)
-        except pyvisa.VisaIOError as e:
-            raise InstrumentOpenError(
-                f"Unable to open LCR: {instrument.address}"
-            ) from e
-        # Instantiate driver with connected instrument
-        driver = AgilentU1732C(resource)
-        fixate.drivers.log_instrument_open(driver)
-        return driver
+        # We've found a configured instrument so try to open it, or reuse the
+        # session from the last time it was opened
+        return pool.open_driver(AgilentU1732C, instrument.address, "LCR")
     raise InstrumentNotFoundError
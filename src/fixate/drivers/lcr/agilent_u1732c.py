@@ -1,6 +1,5 @@
 from threading import Lock
 from math import log10, floor
-import time
 from contextlib import contextmanager
 
 from pyvisa import VisaIOError
@@ -9,6 +8,8 @@ from pyvisa.errors import VI_ERROR_TMO
 from fixate.core.exceptions import InstrumentError, ParameterError, InstrumentTimeOut
 from fixate.drivers.lcr.helper import LCR, TestResult
 from fixate.core.common import unit_scale, unit_convert
+from fixate.core import timing
+from fixate.drivers.pacing import Pacer, FixedDelay
 
 """
 FUNC <OPTION>
@@ -89,7 +90,8 @@ class AgilentU1732C(LCR):
         self.reset()
         self.instrument.delay = 0.1
         self.instrument.timeout = 2
-        self.write_delay = 1  # 0.8sec delay minimum for reliable use
+        # 0.8sec delay minimum for reliable use
+        self.pacer = Pacer(self.instrument, FixedDelay(1), type(self).__name__)
         self.read_delay = 0.05
         self._range = None
         self._frequency = 100
@@ -187,6 +189,14 @@ class AgilentU1732C(LCR):
     def __enter__(self):
         return self
 
+    @property
+    def write_delay(self):
+        return self.pacer.baseline.delay
+
+    @write_delay.setter
+    def write_delay(self, delay):
+        self.pacer.baseline.delay = delay
+
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.instrument.close()
 
@@ -194,12 +204,10 @@ class AgilentU1732C(LCR):
         try:
             if data:
                 if isinstance(data, str):
-                    self.instrument.write(data)
-                    time.sleep(self.write_delay)
+                    self.pacer.write(data)
                 else:
                     for itm in data:
-                        self.instrument.write(itm)
-                        time.sleep(self.write_delay)
+                        self.pacer.write(itm)
                 # self._is_error()
             else:
                 raise ParameterError("Missing data in instrument write")
@@ -222,7 +230,7 @@ class AgilentU1732C(LCR):
                 self._write("FETC? ALL")
                 # Flushes the buffer if there are any other commands left over
                 while True:
-                    time.sleep(self.read_delay)
+                    timing.wait(self.read_delay)
                     try:
                         measurements = self._read().strip("\n").split(",")
                         return TestResult(
@@ -241,7 +249,7 @@ class AgilentU1732C(LCR):
                 self._write("FETC?")
                 # Flushes the buffer if there are any other commands left over
                 while True:
-                    time.sleep(self.read_delay)
+                    timing.wait(self.read_delay)
                     try:
                         return float(self._read())
                     except ValueError:
@@ -249,9 +257,10 @@ class AgilentU1732C(LCR):
 
     def _is_error(self):
         self.instrument.write("SYST:ERR?")
-        time.sleep(self.write_delay)
+        timing.wait(self.write_delay)
         err_resp = self._read()
         if "no error" not in err_resp.lower():
+            self.pacer.error()
             raise InstrumentError(err_resp)
 
     @contextmanager
@@ -0,0 +1,546 @@
+"""
+Write pacing for VISA instruments
+
+Many instruments can't accept commands as fast as VISA can send them, so drivers wait after each
+write. Drivers route their writes through a `Pacer`, which waits according to a strategy:
+
+FixedDelay
+    A fixed delay plus time per byte, the delays tuned by trial and error for each driver.
+    This is the default, so instruments behave as they always have.
+OpcSync
+    Query ``*OPC?`` after each write, so the next command is sent as soon as the instrument has
+    finished the previous one. Queries aren't followed by ``*OPC?``, reading the response is enough.
+StatusPoll
+    Send ``*OPC`` after each write and poll the status byte until operation complete is set.
+    For instruments that support serial polls without blocking the bus.
+LearnedDelay
+    Start from the tuned delay and reduce the delay for each command while it keeps succeeding.
+    The delay backs off whenever the instrument reports an error or times out.
+
+The strategy for a driver can be chosen in the fixate config by driver class name::
+
+    visa_pacing:
+        Fluke8846A: learned
+        Keysight33500B: opc
+
+Drivers for instruments that accept compound commands (joined with ``;``) can queue writes with
+`Pacer.batch` and send them in as few messages as possible, with one error check at the end.
+
+Drivers call `Pacer.checkpoint` where they check the instrument's error queue after an
+operation. When the check runs is chosen by driver class name with the visa_error_check config:
+
+immediate
+    After every operation, the default
+deferred
+    Before the next query, e.g. reading a measurement
+sync
+    Only at explicit sync points, calls to the driver's ``sync()``
+
+Errors are raised with the commands sent since the last check, from a history of recent commands.
+Drivers read the error queue within `Pacer.clearing_errors` where they discard the errors instead,
+e.g. on reset.
+
+Drivers pass ``cache=True`` for writes that configure the instrument, e.g. the measurement mode
+or an output voltage. With the state cache enabled for a driver, such a write is skipped when the
+same command was the last one written to that setting (the command header). The cache is
+cleared by ``*RST``, ``*RCL``, presets, returning the instrument to local control, and any error.
+Drivers also list the settings that change others, e.g. a DMM's ``CONF`` resetting the NPLC.
+The cache is enabled by driver class name with the visa_state_cache config, giving the seconds
+after which the cached settings are written again, in case they were changed on the front
+panel, or None to never write them again::
+
+    visa_state_cache:
+        Fluke8846A: 300
+
+Each pacer keeps statistics for each command (the first word of the command), including the
+time spent waiting and the time the driver's tuned fixed delay would have spent, see
+`Pacer.summary`.
+"""
+
+import collections
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from pyvisa import VisaIOError
+
+import fixate.config
+from fixate.core import timing
+from fixate.core.exceptions import InstrumentError, InstrumentTimeOut
+
+
+@dataclass
+class CommandStats:
+    count: int = 0
+    errors: int = 0
+    elided: int = 0  # Writes skipped by the state cache
+    write_time: float = 0.0  # Time spent in instrument.write
+    waited: float = 0.0  # Dead time after the writes
+    baseline: float = 0.0  # Dead time the driver's fixed delay would have added
+
+    @property
+    def saved(self) -> float:
+        return self.baseline - self.waited
+
+
+class FixedDelay:
+    """Wait delay seconds after each write, plus per_byte seconds for each byte written"""
+
+    name = "fixed"
+
+    def __init__(self, delay: float, per_byte: float = 0.0):
+        self.delay = delay
+        self.per_byte = per_byte
+
+    def delay_for(self, key: str, command: str) -> float:
+        return self.delay + len(command) * self.per_byte
+
+    def settle(self, pacer: "Pacer", key: str, command: str):
+        timing.wait(self.delay_for(key, command))
+
+    def success(self, key: str):
+        pass
+
+    def error(self, key: str):
+        pass
+
+
+class OpcSync(FixedDelay):
+    """Wait for the instrument to complete each command with ``*OPC?``"""
+
+    name = "opc"
+
+    def __init__(self):
+        super().__init__(0.0)
+
+    def settle(self, pacer: "Pacer", key: str, command: str):
+        if "?" not in key:  # The response to a query is its own synchronisation
+            pacer.instrument.query("*OPC?")
+
+
+class StatusPoll(FixedDelay):
+    """
+    Send ``*OPC`` after each write and poll the status byte until the event status bit is set.
+    ``*ESE 1`` is sent on the first write so that operation complete sets the event status bit
+    """
+
+    name = "status"
+    ESB = 0x20
+
+    def __init__(self, interval: float = 0.002, timeout: float = 10.0):
+        super().__init__(0.0)
+        self.interval = interval
+        self.timeout = timeout
+        self._enabled = False
+
+    def settle(self, pacer: "Pacer", key: str, command: str):
+        if "?" in key:
+            return
+        instrument = pacer.instrument
+        if not self._enabled:
+            instrument.write("*ESE 1")
+            self._enabled = True
+        instrument.write("*OPC")
+        end = time.perf_counter() + self.timeout
+        while not instrument.read_stb() & self.ESB:
+            if time.perf_counter() > end:
+                raise InstrumentTimeOut(f"Operation complete not set after {command}")
+            timing.wait(self.interval)
+        instrument.query("*ESR?")  # Clears the event status register
+
+
+class LearnedDelay(FixedDelay):
+    """
+    A delay for each command, starting at delay and reduced by the decrease factor after every
+    streak of successful writes, down to minimum. After an error the delay is multiplied by
+    the increase factor, up to the starting delay. The per byte time is not changed.
+    """
+
+    name = "learned"
+
+    def __init__(
+        self,
+        delay: float,
+        per_byte: float = 0.0,
+        minimum: float = 0.0,
+        decrease: float = 0.8,
+        increase: float = 2.0,
+        streak: int = 5,
+    ):
+        super().__init__(delay, per_byte)
+        self.minimum = minimum
+        self.decrease = decrease
+        self.increase = increase
+        self.streak = streak
+        self.delays: Dict[str, float] = {}
+        self._successes: Dict[str, int] = {}
+
+    def delay_for(self, key: str, command: str) -> float:
+        return self.delays.get(key, self.delay) + len(command) * self.per_byte
+
+    def success(self, key: str):
+        successes = self._successes.get(key, 0) + 1
+        if successes >= self.streak:
+            successes = 0
+            current = self.delays.get(key, self.delay)
+            self.delays[key] = max(current * self.decrease, self.minimum)
+        self._successes[key] = successes
+
+    def error(self, key: str):
+        self._successes[key] = 0
+        current = self.delays.get(key, self.delay)
+        # Back off from zero too, the minimum might be too small for this command
+        self.delays[key] = min(max(current * self.increase, 0.001), self.delay)
+
+
+def strategy_from_name(name: str, default: FixedDelay) -> FixedDelay:
+    """Strategy for a name in the visa_pacing config. Learned delays start from the default"""
+    if name == "fixed":
+        return default
+    if name == "opc":
+        return OpcSync()
+    if name == "status":
+        return StatusPoll()
+    if name == "learned":
+        return LearnedDelay(default.delay, default.per_byte)
+    raise ValueError(f"Unknown visa pacing strategy {name}")
+
+
+IMMEDIATE = "immediate"
+DEFERRED = "deferred"
+SYNC = "sync"
+ERROR_CHECKS = (IMMEDIATE, DEFERRED, SYNC)
+
+
+# Commands that change any setting, clearing the state cache. Compared to the start of the header
+STATE_RESETS = ("*RST", "*RCL", "SYST:PRES", "SYSTEM:PRES", "SYST:LOC", "SYSTEM:LOC")
+
+
+def _command_key(command: str) -> str:
+    return command.split(None, 1)[0].upper() if command.strip() else ""
+
+
+def _setting(command: str) -> str:
+    """The setting a command writes, its header without a leading colon"""
+    return _command_key(command).lstrip(":")
+
+
+def compound_commands(commands: List[Tuple[str, float]], max_length: int):
+    """
+    Join (command, extra delay) pairs into as few compound commands as fit in max_length
+    characters, yielding (compound command, extra delay, commands joined). Commands after the
+    first are prefixed with ":" so that each starts from the root of the command tree, except
+    for common commands such as ``*CLS``. With max_length 0 commands are not joined.
+    """
+    message, delay, joined = "", 0.0, []
+    for command, extra_delay in commands:
+        if message:
+            sep = ";" if command.startswith(("*", ":")) else ";:"
+            if max_length and len(message) + len(sep) + len(command) <= max_length:
+                message += sep + command
+                delay += extra_delay
+                joined.append(command)
+                continue
+            yield message, delay, joined
+        message, delay, joined = command, extra_delay, [command]
+    if message:
+        yield message, delay, joined
+
+
+class Pacer:
+    """
+    Writes commands to an instrument, waits according to the strategy and decides when the
+    instrument's error queue is checked.
+
+    :param instrument: pyvisa resource
+    :param default: The driver's tuned fixed delay. Used unless the config selects a strategy
+     for name, and as the baseline for the statistics
+    :param name: Name of the driver in the visa_pacing and visa_error_check config, usually the
+     class name
+    :param max_message: Longest compound command the instrument accepts, see `batch`. 0 if the
+     instrument only accepts one command per message
+    :param check: The driver's error check, e.g. reading SYST:ERR? until it is empty and
+     raising InstrumentError for any errors. See `checkpoint`
+    :param history_size: Number of commands kept to attribute errors to
+    :param resets: Settings (the start of command headers) that change other settings when
+     written, so they clear the state cache
+    """
+
+    def __init__(
+        self,
+        instrument,
+        default: FixedDelay,
+        name: Optional[str] = None,
+        max_message: int = 0,
+        check: Optional[Callable[[], Any]] = None,
+        history_size: int = 32,
+        resets: Tuple[str, ...] = (),
+    ):
+        self.instrument = instrument
+        self.baseline = default
+        self.strategy = default
+        self.error_check = IMMEDIATE
+        self.cache_state = False
+        self.refresh_interval = None
+        if name is not None:
+            configured = fixate.config.visa_pacing.get(name)
+            if configured:
+                self.strategy = strategy_from_name(configured, default)
+            self.error_check = fixate.config.visa_error_check.get(name, IMMEDIATE)
+            if name in fixate.config.visa_state_cache:
+                self.cache_state = True
+                self.refresh_interval = fixate.config.visa_state_cache[name]
+        if self.error_check not in ERROR_CHECKS:
+            raise ValueError(f"Unknown visa error check {self.error_check}")
+        self.max_message = max_message
+        self.check = check
+        self.stats: Dict[str, CommandStats] = {}
+        # Key of the last command, until it is known to have succeeded
+        self._pending: Optional[str] = None
+        self._batch: Optional[List[Tuple[str, float]]] = None
+        self._batch_checkpoint = False
+        # Recent (key, message) sent to the instrument, the key is None for queries
+        self.history: Deque[Tuple[Optional[str], str]] = collections.deque(
+            maxlen=history_size
+        )
+        self._sent = 0
+        self._checked_at = 0  # Value of _sent after the last error check
+        self._checking = False
+        # Last command written to each setting, see write
+        self.state: Dict[str, str] = {}
+        self.resets = STATE_RESETS + tuple(reset.upper() for reset in resets)
+        self._state_since = time.monotonic()
+
+    @property
+    def batching(self) -> bool:
+        return self._batch is not None
+
+    def write(self, command: str, extra_delay: float = 0.0, cache: bool = False):
+        """
+        Write command and wait until the instrument is ready for the next one.
+        extra_delay is added for commands known to take longer, e.g. saving settings.
+        Within `batch` the command is queued instead.
+        With cache True, the command configures a setting and is skipped if the state cache
+        is enabled and the setting is known to already be set by the same command
+        """
+        setting = _setting(command)
+        if cache and self.cache_state:
+            if (
+                self.refresh_interval is not None
+                and time.monotonic() - self._state_since > self.refresh_interval
+            ):
+                self.invalidate()
+            if self.state.get(setting) == command:
+                stats = self.stats.setdefault(_command_key(command), CommandStats())
+                stats.elided += 1
+                stats.baseline += self.baseline.delay_for(setting, command)
+                stats.baseline += extra_delay
+                return
+        if self._batch is not None:
+            self._batch.append((command, extra_delay))
+        else:
+            self._send(command, extra_delay, [command])
+        if "\n" in command:
+            # Several commands in one message, any of which may change a setting
+            self.invalidate()
+            return
+        if "?" in setting:
+            return
+        if setting.startswith(self.resets):
+            self.invalidate()
+        if cache and self.cache_state:
+            self.state[setting] = command
+        else:
+            self.state.pop(setting, None)
+
+    def invalidate(self):
+        """Forget the cached settings, so that they are all written again"""
+        self.state.clear()
+        self._state_since = time.monotonic()
+
+    def query(self, command: str) -> str:
+        self._before_query(command)
+        return self.instrument.query(command)
+
+    def query_ascii_values(self, command: str, **kwargs):
+        self._before_query(command)
+        return self.instrument.query_ascii_values(command, **kwargs)
+
+    def query_binary_values(self, command: str, **kwargs):
+        self._before_query(command)
+        return self.instrument.query_binary_values(command, **kwargs)
+
+    def _before_query(self, command: str):
+        self.flush()
+        if self.error_check == DEFERRED:
+            self.sync()
+        self._record(None, command)
+
+    @contextmanager
+    def batch(self):
+        """
+        Queue the writes within the block and send them as compound commands when it exits.
+        Checkpoints within the block are combined into one at the end. Queries within the block send the queued writes first. If the block raises, the queued
+        writes are discarded. A batch within a batch joins the outer one
+        """
+        if self._batch is not None:
+            yield
+            return
+        self._batch = []
+        self._batch_checkpoint = False
+        try:
+            yield
+            self.flush()
+        except BaseException:
+            self.invalidate()  # The queued settings weren't all written
+            raise
+        finally:
+            self._batch = None
+        if self._batch_checkpoint:
+            self.checkpoint()
+
+    def flush(self):
+        """Send the writes queued by `batch`"""
+        if not self._batch:
+            return
+        queued, self._batch = self._batch, []
+        for message, extra_delay, joined in compound_commands(queued, self.max_message):
+            self._send(message, extra_delay, joined)
+
+    def checkpoint(self):
+        """
+        Called by the driver after an operation it checks for errors. Depending on the error
+        check policy the check runs now ("immediate"), before the next query ("deferred") or
+        only when `sync` is called ("sync"). Within a batch the check waits for the end
+        """
+        if self._batch is not None:
+            self._batch_checkpoint = True
+        elif self.error_check == IMMEDIATE:
+            self.sync()
+
+    def sync(self):
+        """
+        Check for errors now, if anything was sent since the last check. Errors are raised
+        with the commands sent since the last check, so that they can be traced to the command
+        that caused them
+        """
+        if self.check is None or self._checking or self._sent == self._checked_at:
+            return
+        self.flush()
+        window = self._window()
+        self._checking = True
+        try:
+            self.check()
+        except InstrumentError as e:
+            self.invalidate()
+            raise InstrumentError(f"{e}\n{self._describe(window)}") from e
+        finally:
+            self._checking = False
+            self._checked_at = self._sent
+
+    @contextmanager
+    def clearing_errors(self):
+        """
+        For the driver reading the error queue to discard the errors, e.g. on reset. Queries
+        within the block don't run the error check first, and the errors count as checked
+        """
+        self.flush()
+        checking, self._checking = self._checking, True
+        try:
+            yield
+        finally:
+            self._checking = checking
+            self._checked_at = self._sent
+
+    def _window(self):
+        """The commands in the history sent since the last error check, oldest first"""
+        count = self._sent - self._checked_at
+        return list(self.history)[-count:] if count else []
+
+    def _describe(self, window) -> str:
+        lines = ["Commands since the last error check, oldest first:"]
+        earlier = self._sent - self._checked_at - len(window)
+        if earlier > 0:
+            lines.append(f"  ... {earlier} earlier commands")
+        lines.extend(f"  {message}" for _, message in window)
+        return "\n".join(lines)
+
+    def _record(self, key: Optional[str], message: str):
+        if not self._checking:
+            self.history.append((key, message))
+            self._sent += 1
+
+    def _send(self, message: str, extra_delay: float, commands: List[str]):
+        self._confirm()
+        key = _command_key(message)
+        self._record(key, message)
+        stats = self.stats.setdefault(key, CommandStats())
+        stats.count += 1
+        start = time.perf_counter()
+        try:
+            self.instrument.write(message)
+            written = time.perf_counter()
+            self.strategy.settle(self, key, message)
+            if extra_delay:
+                timing.wait(extra_delay)
+        except (VisaIOError, InstrumentTimeOut):
+            stats.errors += 1
+            self.strategy.error(key)
+            self.invalidate()
+            raise
+        end = time.perf_counter()
+        stats.write_time += written - start
+        stats.waited += end - written
+        # What the tuned delay would have waited, sending each command on its own
+        stats.baseline += extra_delay + sum(
+            self.baseline.delay_for(_command_key(command), command)
+            for command in commands
+        )
+        self._pending = key
+
+    def error(self):
+        """
+        Called by the driver when the instrument reports an error, e.g. from SYST:ERR?. The
+        delays for the commands written since the last error check back off and the state cache
+        is cleared
+        """
+        self.invalidate()
+        self._pending = None
+        if self._checking:
+            keys = {key for key, _ in self._window() if key is not None}
+        else:
+            # The driver checked for errors itself, blame the last write
+            writes = [key for key, _ in self.history if key is not None]
+            keys = set(writes[-1:])
+        for key in keys:
+            self.stats[key].errors += 1
+            self.strategy.error(key)
+
+    def _confirm(self):
+        if self._pending is not None:
+            self.strategy.success(self._pending)
+            self._pending = None
+
+    def summary(self) -> str:
+        """Table of command statistics, most time saved first"""
+        lines = [
+            f"{'Command':<24}{'Count':>7}{'Elided':>7}{'Errors':>7}"
+            f"{'Waited':>10}{'Baseline':>10}{'Saved':>10}"
+        ]
+        total = CommandStats()
+        for key, stats in sorted(self.stats.items(), key=lambda item: -item[1].saved):
+            lines.append(
+                f"{key:<24}{stats.count:>7}{stats.elided:>7}{stats.errors:>7}"
+                f"{stats.waited:>10.3f}{stats.baseline:>10.3f}{stats.saved:>10.3f}"
+            )
+            total.count += stats.count
+            total.elided += stats.elided
+            total.errors += stats.errors
+            total.waited += stats.waited
+            total.baseline += stats.baseline
+        lines.append(
+            f"{'Total':<24}{total.count:>7}{total.elided:>7}{total.errors:>7}"
+            f"{total.waited:>10.3f}{total.baseline:>10.3f}{total.saved:>10.3f}"
+        )
+        return "\n".join(lines)
@@ -0,0 +1,156 @@
+"""
+Shared VISA sessions
+
+All VISA drivers are opened through one process-wide ``pyvisa.ResourceManager``.
+
+Set ``visa_session_pool`` to True in the fixate config to keep drivers in a pool keyed by driver
+class and address. Opening an instrument again, e.g. for the next unit or sequence, then returns
+the same driver without opening a new session or resetting the instrument. A pooled driver is
+only reused if its session answers ``*IDN?`` within PROBE_TIMEOUT, otherwise the session is
+closed and the instrument opened again.
+
+Reused drivers keep the instrument's settings from the previous use, so the pool is off by
+default. With it on, call ``reset()`` in the test script where a test needs the power on state.
+
+Opening can be deferred until the driver is first used with ``open(lazy=True)``, e.g.
+``dmm.open(lazy=True)``, which returns a `LazyDriver`.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Optional, Protocol, Tuple, Type, TypeVar, cast
+
+import pyvisa
+
+import fixate.config
+import fixate.drivers
+from fixate.drivers import DriverProtocol, InstrumentOpenError, trace
+
+PROBE_TIMEOUT = 500  # ms
+
+
+class PooledDriver(DriverProtocol, Protocol):
+    """A VISA driver, constructed with its pyvisa resource"""
+
+    instrument: Any
+
+    def __init__(self, instrument: Any) -> None: ...
+
+
+T = TypeVar("T", bound=PooledDriver)
+D = TypeVar("D")
+
+_lock = threading.RLock()
+_resource_manager: Optional[pyvisa.ResourceManager] = None
+_drivers: Dict[Tuple[type, str], PooledDriver] = {}
+_instrument_locks: Dict[Tuple[type, str], threading.Lock] = {}
+
+
+def resource_manager() -> pyvisa.ResourceManager:
+    """The process-wide resource manager, created on first use"""
+    global _resource_manager
+    with _lock:
+        if _resource_manager is None:
+            _resource_manager = pyvisa.ResourceManager()
+        return _resource_manager
+
+
+def is_alive(resource) -> bool:
+    """If the session answers ``*IDN?`` within PROBE_TIMEOUT"""
+    try:
+        timeout = resource.timeout
+        resource.timeout = PROBE_TIMEOUT
+        try:
+            resource.query("*IDN?")
+        finally:
+            resource.timeout = timeout
+    except (pyvisa.errors.Error, OSError):
+        return False
+    return True
+
+
+def _close(resource):
+    try:
+        resource.close()
+    except (pyvisa.errors.Error, OSError):
+        pass  # Already closed, or the instrument has gone
+
+
+def _instrument_lock(key) -> threading.Lock:
+    # Each instrument is opened under its own lock, so different instruments open concurrently
+    with _lock:
+        return _instrument_locks.setdefault(key, threading.Lock())
+
+
+def open_driver(driver_class: Type[T], address: str, description: str) -> T:
+    """
+    Open the driver for the instrument at address, or reuse the pooled driver if its session
+    is still alive. description names the type of instrument in errors, e.g. "DMM"
+    """
+    key = (driver_class, address)
+    with _instrument_lock(key):
+        driver = _drivers.pop(key, None)
+        if driver is not None:
+            if fixate.config.visa_session_pool and is_alive(driver.instrument):
+                _drivers[key] = driver
+                fixate.drivers.log_instrument_open(driver)
+                return cast(T, driver)
+            _close(driver.instrument)
+
+        try:
+            resource = resource_manager().open_resource(address)
+        except pyvisa.VisaIOError as e:
+            raise InstrumentOpenError(f"Unable to open {description}: {address}") from e
+        # Instantiate driver with connected instrument
+        driver = driver_class(trace.wrap(resource, driver_class.__name__))
+        if fixate.config.visa_session_pool:
+            _drivers[key] = driver
+    fixate.drivers.log_instrument_open(driver)
+    return driver
+
+
+def close_all():
+    """Close every pooled session"""
+    with _lock:
+        drivers = list(_drivers.values())
+        _drivers.clear()
+    for driver in drivers:
+        _close(driver.instrument)
+
+
+def lazy_driver(opener: Callable[[], D]) -> D:
+    """A `LazyDriver` for opener, typed as the driver it stands in for"""
+    return cast(D, LazyDriver(opener))
+
+
+class LazyDriver:
+    """
+    Stands in for a driver that is opened when it is first used. Attribute access and
+    assignment are passed to the opened driver
+    """
+
+    def __init__(self, opener: Callable[[], object]):
+        object.__setattr__(self, "_opener", opener)
+        object.__setattr__(self, "_driver", None)
+
+    @property
+    def opened(self) -> bool:
+        return self._driver is not None
+
+    def open(self):
+        """Open the driver now, if it hasn't been"""
+        if self._driver is None:
+            object.__setattr__(self, "_driver", self._opener())
+        return self._driver
+
+    def __getattr__(self, name):
+        return getattr(self.open(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self.open(), name, value)
+
+    def __enter__(self):
+        return self.open().__enter__()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._driver is not None:
+            return self._driver.__exit__(exc_type, exc_val, exc_tb)
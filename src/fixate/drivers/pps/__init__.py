@@ -1,26 +1,33 @@
-import pyvisa
+from typing import TYPE_CHECKING
 
 import fixate.drivers
+from fixate import _lazy
 from fixate.config import find_instrument_by_id
-from fixate.drivers import InstrumentNotFoundError, InstrumentOpenError
-from fixate.drivers.pps.bk_178x import BK178X
+from fixate.drivers import InstrumentNotFoundError
 from fixate.drivers.pps.helper import PPS
-from fixate.drivers.pps.siglent_spd_3303X import SPD3303X
 
+if TYPE_CHECKING:
+    from fixate.drivers.pps.bk_178x import BK178X
+    from fixate.drivers.pps.siglent_spd_3303X import SPD3303X
 
-def open() -> PPS:
+# The drivers import pyvisa and pyserial, so are only imported when used
+__getattr__, __dir__ = _lazy.attach(
+    __name__, {"BK178X": ".bk_178x", "SPD3303X": ".siglent_spd_3303X"}
+)
+
+
+def open(lazy: bool = False) -> PPS:
+    from fixate.drivers import pool
+    from fixate.drivers.pps.bk_178x import BK178X
+    from fixate.drivers.pps.siglent_spd_3303X import SPD3303X
+
+    if lazy:
+        return pool.lazy_driver(open)
     siglent = find_instrument_by_id(SPD3303X.REGEX_ID)
     if siglent is not None:
-        # We've found a configured instrument so try to open it
-        rm = pyvisa.ResourceManager()
-        try:
-            resource = rm.open_resource(siglent.address)
-        except pyvisa.VisaIOError as e:
-            raise InstrumentOpenError(f"Unable to open PPS: {siglent.address}") from e
-        # Instantiate driver with connected instrument
-        driver = SPD3303X(resource)
-        fixate.drivers.log_instrument_open(driver)
-        return driver
+        # We've found a configured instrument so try to open it, or reuse the
+        # session from the last time it was opened
+        return pool.open_driver(SPD3303X, siglent.address, "PPS")
 
     bk_precision = find_instrument_by_id(BK178X.REGEX_ID)
     if bk_precision is not None:
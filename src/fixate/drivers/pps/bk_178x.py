@@ -1,6 +1,7 @@
 import struct
 import serial
 
+from fixate.drivers import trace
 from fixate.drivers.pps.helper import PPS
 from fixate.core.exceptions import ParameterError
 
@@ -88,13 +89,16 @@ class PPSInterface(PPS):
         self.com_port = com_port
 
     def _connect(self):
-        self.instrument = serial.Serial(
-            port=self.com_port,
-            baudrate=self.baud_rate,
-            parity=self.PARITY,
-            stopbits=self.STOP_BIT,
-            bytesize=self.DATA_BYTE,
-            timeout=0.5,
+        self.instrument = trace.wrap(
+            serial.Serial(
+                port=self.com_port,
+                baudrate=self.baud_rate,
+                parity=self.PARITY,
+                stopbits=self.STOP_BIT,
+                bytesize=self.DATA_BYTE,
+                timeout=0.5,
+            ),
+            type(self).__name__,
         )
         self.connected = True
 
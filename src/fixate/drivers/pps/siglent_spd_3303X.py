@@ -1,8 +1,7 @@
-import time
 from fixate.drivers.pps import PPS
 from fixate.core.exceptions import ParameterError, InstrumentError
-from functools import update_wrapper
-import inspect
+from fixate.drivers import api
+from fixate.drivers.pacing import Pacer, FixedDelay
 import re
 
 
@@ -15,6 +14,14 @@ class SPD3303X(PPS):
     def __init__(self, instrument):
         super().__init__(instrument)
         self.instrument = instrument
+        # 20ms plus 166us per byte, see _write
+        self.pacer = Pacer(
+            instrument,
+            FixedDelay(0.02, 1 / 6000),
+            type(self).__name__,
+            check=self._is_error,
+            resets=("OUTPUT:TRACK",),  # Series and parallel modes couple the channels
+        )
         self.instrument.timeout = 1000
         # 100ms query delay recommended - some forum discussion says 300ms more robust
         self.instrument.query_delay = 0.1
@@ -36,8 +43,8 @@ class SPD3303X(PPS):
             ("recall.group4", self.write, "*RCL 4"),
             ("recall.group5", self.write, "*RCL 5"),
             # Channel 1 Commands
-            ("channel1.voltage", self.write, "OUTPut:TRACK 0;CH1:VOLT {value}"),
-            ("channel1.current", self.write, "OUTPut:TRACK 0;CH1:CURR {value}"),
+            ("channel1.voltage", self.write_cached, "OUTPut:TRACK 0;CH1:VOLT {value}"),
+            ("channel1.current", self.write_cached, "OUTPut:TRACK 0;CH1:CURR {value}"),
             ("channel1._call", self.write, "OUTPut:TRACK 0;OUTPut CH1,{value}"),
             ("channel1.wave", self.write, "OUTPut:TRACK 0;OUTPut:WAVE CH1,{value}"),
             # TODO Need to initialise all groups (1-5) to 0 V, A, s before setting the ones you need
@@ -48,8 +55,8 @@ class SPD3303X(PPS):
             ),
             ("channel1.timer._call", self.write, "OUTPut:TRACK 0;TIMEr CH1,{value}"),
             # Channel 2 Commands
-            ("channel2.voltage", self.write, "OUTPut:TRACK 0;CH2:VOLT {value}"),
-            ("channel2.current", self.write, "OUTPut:TRACK 0;CH2:CURR {value}"),
+            ("channel2.voltage", self.write_cached, "OUTPut:TRACK 0;CH2:VOLT {value}"),
+            ("channel2.current", self.write_cached, "OUTPut:TRACK 0;CH2:CURR {value}"),
             ("channel2._call", self.write, "OUTPut:TRACK 0;OUTPut CH2,{value}"),
             ("channel2.wave", self.write, "OUTPut:TRACK 0;OUTPut:WAVE CH2,{value}"),
             # TODO Need to initialise all groups (1-5) to 0 V, A, s before setting the ones you need
@@ -66,13 +73,13 @@ class SPD3303X(PPS):
                 "OUTPut:TRACK 1;OUTPut:TRACK 1;OUTPut CH1,{value}",
             ),
             ("series.voltage", self.write_half, "OUTPut:TRACK 1;CH1:VOLT {value}"),
-            ("series.current", self.write, "OUTPut:TRACK 1;CH1:CURR {value}"),
+            ("series.current", self.write_cached, "OUTPut:TRACK 1;CH1:CURR {value}"),
             (
                 "parallel._call",
                 self.write,
                 "OUTPut:TRACK 2;OUTPut:TRACK 2;OUTPut CH1,{value}",
             ),
-            ("parallel.voltage", self.write, "OUTPut:TRACK 2;CH1:VOLT {value}"),
+            ("parallel.voltage", self.write_cached, "OUTPut:TRACK 2;CH1:VOLT {value}"),
             ("parallel.current", self.write_half, "OUTPut:TRACK 2;CH1:CURR {value}"),
             # Address Setting Commands
             ("address.ip", self.write, "IPaddr {value}"),
@@ -95,8 +102,8 @@ class SPD3303X(PPS):
         return self.query_ascii_value(formatted_string)
 
     def query_ascii_values(self, value):
-        response = self.instrument.query_ascii_values(value)
-        self._is_error()
+        response = self.pacer.query_ascii_values(value)
+        self.pacer.checkpoint()
         return response
 
     def query_ascii_value(self, value):
@@ -106,6 +113,14 @@ class SPD3303X(PPS):
         formatted_string = self._format_string(base_str, **kwargs)
         self._write(formatted_string)
 
+    def write_cached(self, base_str, *args, **kwargs):
+        """
+        Write a voltage or current setpoint through the state cache. Outputs are not cached, as
+        the instrument turns them off itself, e.g. when OCP or OVP trips
+        """
+        formatted_string = self._format_string(base_str, **kwargs)
+        self._write(formatted_string, cache=True)
+
     def write_timer(self, base_str, waveform):
 
         if len(waveform) > 5:
@@ -125,18 +140,11 @@ class SPD3303X(PPS):
 
     def write_half(self, base_str, value):
         formatted_string = self._format_string(base_str, value=value / 2)
-        self._write(formatted_string)
+        self._write(formatted_string, cache=True)
 
     def _format_string(self, base_str, **kwargs):
         kwargs["self"] = self
-        prev_string = base_str
-        cur_string = ""
-        while True:
-            cur_string = prev_string.format(**kwargs)
-            if cur_string == prev_string:
-                break
-            prev_string = cur_string
-        return cur_string
+        return api.format_command(base_str, kwargs)
 
     @property
     def remote(self):
@@ -149,7 +157,7 @@ class SPD3303X(PPS):
 
     @property
     def output_ch1(self):
-        return self.instrument.query_ascii_values("")
+        return self.pacer.query_ascii_values("")
 
     @output_ch1.setter
     def output_ch1(self, val):
@@ -185,11 +193,22 @@ class SPD3303X(PPS):
         pass
 
     def _read_value(self, data):
-        values = self.instrument.query_ascii_values(data)
-        self._is_error()
+        values = self.pacer.query_ascii_values(data)
+        self.pacer.checkpoint()
         return values[0]
 
-    def _write(self, data, delay=0.0):
+    def batch(self):
+        """
+        Send the writes within the block as compound commands where the instrument allows,
+        and check for errors once at the end
+        """
+        return self.pacer.batch()
+
+    def sync(self):
+        """Check for errors now, for the deferred and sync error check policies"""
+        self.pacer.sync()
+
+    def _write(self, data, delay=0.0, cache=False):
         """
         The SPD3303X cannot respond to visa commands as quickly as some other devices
         A 20ms delay was found to be reliable for most commands.
@@ -201,9 +220,8 @@ class SPD3303X(PPS):
         # NOTE: SPD programming tips recommends 10-100ms between write commands
         """
         for cmd in data.split(";"):
-            self.instrument.write(cmd)
-            time.sleep(0.02 + delay + len(cmd) / 6000)
-        self._is_error()
+            self.pacer.write(cmd, extra_delay=delay, cache=cache)
+        self.pacer.checkpoint()
 
     @staticmethod
     def _parse_errors(error_response):
@@ -219,10 +237,11 @@ class SPD3303X(PPS):
         return code, msg
 
     def _is_error(self):
-        resp = self.instrument.query("SYST:ERR?")
+        resp = self.pacer.query("SYST:ERR?")
         if resp:
             code, msg = self._parse_errors(resp)
             if code != 0:
+                self.pacer.error()
                 raise InstrumentError(
                     f"Error Returned from PPS\nCode: {code}\nMessage: {msg}"
                 )
@@ -232,39 +251,11 @@ class SPD3303X(PPS):
             raise InstrumentError("PPS Failed to respond to system query")
 
     def init_api(self):
-        for func_str, handler, base_str in self.api:
-            *parents, func = func_str.split(".")
-            parent_obj = self
-            for parent in parents:
-                parent_obj = getattr(parent_obj, parent)
-            func_obc = getattr(parent_obj, func)
-            setattr(parent_obj, func, self.prepare_string(func_obc, handler, base_str))
+        api.init_api(self, self.prepare_string)
 
     def prepare_string(self, func, handler, base_str, *args, **kwargs):
-        def temp_func(*nargs, **nkwargs):
-            """
-            Only formats using **nkwargs
-            New Temp
-            :param nargs:
-            :param nkwargs:
-            :return:
-            """
-            sig = inspect.signature(func)
-            keys = [itm[0] for itm in sig.parameters.items()]
-            # Hard coding for RIGOL. BOOLS should be converted to "ON", "OFF"
-            for index, param in enumerate(nargs):
-                nkwargs[keys[index]] = param
-            for k, v in nkwargs.items():
-                if sig.parameters[k].annotation == bool:
-                    if v:
-                        nkwargs[k] = "ON"
-                    else:
-                        nkwargs[k] = "OFF"
-            # new_str = base_str.format(**nkwargs)
-            # handler(self, new_str)
-            return handler(base_str, **nkwargs)
-
-        return update_wrapper(temp_func, func)
+        # Hard coding for RIGOL. BOOLS should be converted to "ON", "OFF"
+        return api.api_method(func, handler, base_str, bool_to_on_off=True)
 
     def get_identity(self) -> str:
         """
@@ -272,4 +263,4 @@ class SPD3303X(PPS):
             Return Info Manufacturer, product type, series No., software version,hardware version
             Typical Return Siglent Technologies, SPD3303X, SPD00001130025,1.01.01.01.02,V3.0
         """
-        return self.instrument.query("*IDN?").strip()
+        return self.pacer.query("*IDN?").strip()
@@ -0,0 +1,245 @@
+"""
+Instrument I/O tracing
+
+Set ``instrument_trace`` in the fixate config to record the I/O of every instrument as it is
+opened: pyvisa resources, the BK178X serial port and the FTDI jig handle. Each read, write and
+query is recorded with the command, bytes sent and received, start and end times, the test
+index it ran in and any error raised. The last ``instrument_trace_buffer`` records are kept,
+along with a latency histogram for each command.
+
+At the end of each sequence, a table of the count, mean, 50th and 95th percentile and maximum
+latency per command is written to the diagnostic log. When ``instrument_trace`` is a file path,
+every record is also appended to that file as a JSON line. The records and histograms are then
+cleared for the next sequence.
+
+The trace is off by default. Instruments are then passed to the drivers without being wrapped,
+so there is no overhead.
+"""
+
+import collections
+import json
+import logging
+import threading
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from pubsub import pub
+
+import fixate.config
+from fixate.drivers.pacing import _command_key
+
+logger = logging.getLogger(__name__)
+
+# Methods that do I/O. Any other attribute is passed straight to the instrument
+TRACED_METHODS = frozenset(
+    {
+        "write",
+        "write_raw",
+        "write_ascii_values",
+        "write_binary_values",
+        "read",
+        "read_raw",
+        "read_bytes",
+        "readline",
+        "read_until",
+        "read_stb",
+        "query",
+        "query_ascii_values",
+        "query_binary_values",
+        "serial_shift_bit_bang",
+    }
+)
+
+# Histogram bucket i counts latencies below 2**i µs, up to about 35 minutes
+_BUCKETS = 32
+
+
+class TraceRecord(NamedTuple):
+    instrument: str
+    method: str
+    command: Optional[str]
+    sent: int
+    received: int
+    start: float  # time.monotonic()
+    end: float
+    test_index: Optional[str]
+    error: Optional[str]
+
+    @property
+    def latency(self) -> float:
+        return self.end - self.start
+
+
+class LatencyHistogram:
+    """Latencies of one command, in power of two buckets of µs"""
+
+    def __init__(self):
+        self.counts = [0] * _BUCKETS
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, latency: float, error: bool = False):
+        bucket = min(int(latency * 1e6).bit_length(), _BUCKETS - 1)
+        self.counts[bucket] += 1
+        self.count += 1
+        self.errors += error
+        self.total += latency
+        if latency > self.max:
+            self.max = latency
+
+    def percentile(self, p: float) -> float:
+        """Upper bound of the bucket holding the pth percentile, in seconds"""
+        target = p / 100 * self.count
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= target:
+                return min((1 << bucket) / 1e6, self.max)
+        return self.max
+
+
+class Tracer:
+    """Ring buffer of trace records and a histogram per (instrument, command)"""
+
+    def __init__(self, size: int = 10000):
+        self.records: collections.deque[TraceRecord] = collections.deque(maxlen=size)
+        self.histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self.test_index = None
+        self._lock = threading.Lock()
+
+    def record(self, record: TraceRecord):
+        key = (record.instrument, _trace_key(record))
+        with self._lock:
+            self.records.append(record)
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = LatencyHistogram()
+            histogram.add(record.latency, record.error is not None)
+
+    def summary(self) -> str:
+        with self._lock:
+            histograms = sorted(
+                self.histograms.items(), key=lambda item: item[1].total, reverse=True
+            )
+        lines = [
+            f"{'Instrument':<16}{'Command':<28}{'Count':>7}{'Errors':>7}"
+            f"{'Total s':>10}{'Mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'Max ms':>10}"
+        ]
+        for (instrument, command), h in histograms:
+            lines.append(
+                f"{instrument:<16}{command:<28}{h.count:>7}{h.errors:>7}"
+                f"{h.total:>10.3f}{h.total / h.count * 1e3:>10.2f}"
+                f"{h.percentile(50) * 1e3:>10.2f}{h.percentile(95) * 1e3:>10.2f}"
+                f"{h.max * 1e3:>10.2f}"
+            )
+        return "\n".join(lines)
+
+    def dump(self, path=None):
+        """Log the summary, append the records to path if given, and clear the trace"""
+        if self.histograms:
+            logger.info("Instrument I/O latency\n%s", self.summary())
+        with self._lock:
+            records = list(self.records)
+            self.records.clear()
+            self.histograms.clear()
+        if path and records:
+            with open(path, "a", encoding="utf-8") as f:
+                for record in records:
+                    f.write(json.dumps(record._asdict()) + "\n")
+
+    def _on_test_start(self, data, test_index):
+        self.test_index = test_index
+
+    def _on_sequence_complete(
+        self, status, passed, failed, error, skipped, sequence_status
+    ):
+        path = fixate.config.instrument_trace
+        self.dump(path if isinstance(path, str) else None)
+
+
+def _trace_key(record: TraceRecord) -> str:
+    if record.command is None:
+        return record.method
+    return _command_key(record.command)
+
+
+def _describe(data) -> Tuple[Optional[str], int]:
+    """(command text, bytes) of the data sent or received"""
+    if isinstance(data, str):
+        return data, len(data)
+    if isinstance(data, (bytes, bytearray)):
+        return None, len(data)
+    return None, 0
+
+
+class TracedInstrument:
+    """Records the I/O methods of the wrapped instrument with the tracer"""
+
+    def __init__(self, instrument, name: str, tracer: Tracer):
+        object.__setattr__(self, "_instrument", instrument)
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_tracer", tracer)
+
+    def __getattr__(self, attr):
+        value = getattr(self._instrument, attr)
+        if attr not in TRACED_METHODS:
+            return value
+
+        def traced(*args, **kwargs):
+            command, sent = _describe(args[0] if args else None)
+            error = None
+            start = time.monotonic()
+            try:
+                result = value(*args, **kwargs)
+            except BaseException as e:
+                error = repr(e)
+                raise
+            finally:
+                end = time.monotonic()
+                received = 0 if error else _describe(result)[1]
+                self._tracer.record(
+                    TraceRecord(
+                        self._name,
+                        attr,
+                        command,
+                        sent,
+                        received,
+                        start,
+                        end,
+                        self._tracer.test_index,
+                        error,
+                    )
+                )
+            return result
+
+        return traced
+
+    def __setattr__(self, attr, value):
+        setattr(self._instrument, attr, value)
+
+    def __repr__(self):
+        return f"<traced {self._instrument!r}>"
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def tracer() -> Tracer:
+    """The process-wide tracer, subscribed to the sequence on first use"""
+    global _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            _tracer = Tracer(fixate.config.instrument_trace_buffer)
+            pub.subscribe(_tracer._on_test_start, "Test_Start")
+            pub.subscribe(_tracer._on_sequence_complete, "Sequence_Complete")
+        return _tracer
+
+
+def wrap(instrument, name: str):
+    """The instrument, traced if ``instrument_trace`` is set"""
+    if not fixate.config.instrument_trace:
+        return instrument
+    return TracedInstrument(instrument, name, tracer())
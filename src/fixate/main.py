@@ -14,6 +14,8 @@ from fixate.core.exceptions import SequenceAbort
 from fixate import user_info_important, user_ok, user_serial
 from fixate.ui_cmdline import register_cmd_line, unregister_cmd_line
 import fixate.sequencer
+from fixate.reporting.history import TestHistory
+from fixate.reporting.capability import CapabilityMonitor
 
 logger = logging.getLogger(__name__)
 
@@ -117,6 +119,30 @@ def get_parser():
         action="store_true",
         help="The sequencer will not prompt for retries.",
     )
+    parser.add_argument(
+        "--abort-on-first-fail",
+        action="store_true",
+        help="Stop the sequence at the first failing test instead of completing the run.",
+    )
+    parser.add_argument(
+        "--abort-on-timeout",
+        action="store_true",
+        help="Abort the sequence if a test exceeds its timeout, instead of marking it as an error and continuing.",
+    )
+    parser.add_argument(
+        "--order-from-history",
+        type=Path,
+        help="""Directory of previous csv reports, or a json test history file.
+                        Tests marked as order_independent are reordered so that tests most
+                        likely to fail and cheapest to run go first""",
+    )
+    parser.add_argument(
+        "--check-stats",
+        type=Path,
+        help="""json file of running statistics for each check, updated as checks are made.
+                        Cpk is calculated against the check limits and a warning is logged
+                        when it drops below 1.33""",
+    )
     diagnostic_group = parser.add_mutually_exclusive_group()
     diagnostic_group.add_argument(
         "--disable-logs", action="store_true", help="Turn off diagnostic logs"
@@ -289,6 +315,22 @@ class FixateWorker:
             if self.args.non_interactive:
                 self.sequencer.non_interactive = True
 
+            if self.args.abort_on_first_fail:
+                self.sequencer.abort_on_first_fail = True
+
+            if self.args.abort_on_timeout:
+                self.sequencer.abort_on_timeout = True
+
+            if self.args.order_from_history is not None:
+                self.sequencer.test_history = TestHistory.load(
+                    self.args.order_from_history
+                )
+
+            if self.args.check_stats is not None:
+                self.sequencer.capability_monitor = CapabilityMonitor(
+                    self.args.check_stats
+                )
+
             # parse script params
             for param in self.args.script_params:
                 k, v = param.split("=")
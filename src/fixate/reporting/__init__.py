@@ -1 +1,29 @@
+import importlib
+
+import fixate.config
 from fixate.reporting.csv import CSVWriter
+from fixate.reporting.hub import ReportEvent, ReportingHub, ReportMetrics, Sink
+
+
+def load_plugins() -> list:
+    """
+    Create the reporting plugins configured with plg_ entries in fixate.config
+
+    A plugin entry needs an "import_name" and a "class_name". The class is created with no
+    arguments. A `Sink` is added to the sequencer's reporting hub. Other classes must provide
+    install() and uninstall(), and if they provide ensure_alive(), it is called before each test
+    and the sequence is aborted if it raises. e.g.::
+
+        plg_sqlite:
+            import_name: fixate.reporting.sqlite
+            class_name: SQLiteWriter
+
+    Entries without a "class_name", such as the built in plg_csv, are ignored.
+    """
+    plugins = []
+    for name, data in fixate.config.get_plugins().items():
+        if not isinstance(data, dict) or "class_name" not in data:
+            continue
+        module = importlib.import_module(data["import_name"])
+        plugins.append(getattr(module, data["class_name"])())
+    return plugins
@@ -0,0 +1,112 @@
+"""
+Sidecar storage for arrays attached to checks, e.g. ``chk_all_in_mask(..., attachment=waveform)``.
+
+Arrays are appended to a binary file next to the csv report, ``<report>.arrays``, with an
+index of one json line per array in ``<report>.arrays.idx``. The check row in the csv report
+references its array with an ``attachment=<key>`` field. Both files are only ever appended to,
+and an array is written before its index line, so an interrupted sequence leaves every indexed
+array readable.
+
+Arrays are read back as read only memory maps, so only the parts used are loaded::
+
+    arrays = AttachmentReader("20260101-120000-1.csv")
+    waveform = arrays["0"]
+"""
+
+import json
+import os
+from typing import TYPE_CHECKING, Iterator, Union
+
+if TYPE_CHECKING:
+    # The csv writer imports this module for every report, so numpy is only imported once an
+    # array is written or read
+    import numpy as np
+
+# Each array starts on an aligned offset, so memory maps of any dtype are aligned
+_ALIGNMENT = 64
+
+
+def sidecar_paths(csv_path: Union[str, os.PathLike]):
+    """(data path, index path) of the attachments for a csv report"""
+    base = os.path.splitext(os.fspath(csv_path))[0]
+    return f"{base}.arrays", f"{base}.arrays.idx"
+
+
+class AttachmentWriter:
+    """Appends arrays for one csv report. Not thread safe, used by the reporting thread"""
+
+    def __init__(self, csv_path: Union[str, os.PathLike]):
+        self.csv_path = os.fspath(csv_path)
+        data_path, index_path = sidecar_paths(csv_path)
+        self._data = open(data_path, "ab")
+        self._index = open(index_path, "a+", encoding="utf-8")
+        self._offset = self._data.seek(0, os.SEEK_END)
+        # Keys carry on from a previous run appending to the same report
+        self._index.seek(0)
+        self._count = sum(1 for _ in self._index)
+
+    def append(self, array: "np.ndarray") -> str:
+        """Write array and return its key"""
+        import numpy as np
+
+        array = np.ascontiguousarray(array)
+        padding = -self._offset % _ALIGNMENT
+        self._data.write(b"\0" * padding)
+        self._offset += padding
+        key = str(self._count)
+        entry = {
+            "key": key,
+            "offset": self._offset,
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+        }
+        self._data.write(array.data)
+        self._data.flush()
+        self._offset += array.nbytes
+        self._index.write(json.dumps(entry) + "\n")
+        self._index.flush()
+        self._count += 1
+        return key
+
+    def close(self):
+        self._data.close()
+        self._index.close()
+
+
+class AttachmentReader:
+    """Read only mapping of key -> array for the attachments of a csv report"""
+
+    def __init__(self, csv_path: Union[str, os.PathLike]):
+        self._data_path, index_path = sidecar_paths(csv_path)
+        self._entries = {}
+        with open(index_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break  # Partial last line from an interrupted write
+                self._entries[entry["key"]] = entry
+
+    def __getitem__(self, key: str) -> "np.ndarray":
+        import numpy as np
+
+        entry = self._entries[key]
+        dtype = np.dtype(entry["dtype"])
+        shape = tuple(entry["shape"])
+        if dtype.itemsize * int(np.prod(shape)) == 0:
+            return np.empty(shape, dtype)  # Can't memory map zero bytes
+        return np.memmap(
+            self._data_path, dtype, mode="r", offset=entry["offset"], shape=shape
+        )
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def keys(self):
+        return self._entries.keys()
@@ -0,0 +1,310 @@
+"""
+Streaming process capability statistics for checks, aggregated across units.
+
+`CapabilityMonitor` subscribes to "Check" and keeps running statistics for every numeric check,
+keyed by (test index, check number, description). Each update is O(1):
+
+- count, mean and variance using Welford's algorithm
+- min and max
+- number of failed checks
+- a fixed bin histogram spanning the check limits, for estimating quantiles
+
+Specification limits are taken from the check itself, e.g. `_min` and `_max` for in_range,
+nominal +- tol% for in_tolerance, or a single limit for smaller/greater. Cpk is then available
+at any time from `CheckStats.cpk()`.
+
+The statistics are loaded from and saved to a json file so that they accumulate over every unit
+tested on the station. The file is saved when the sequence completes.
+"""
+
+import json
+import logging
+import math
+import os
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+from pubsub import pub
+
+from fixate.core.checks import CheckResult
+
+logger = logging.getLogger(__name__)
+
+# Number of histogram bins between the lower and upper limit. Half as many again are placed
+# either side of the limits, plus an underflow and overflow bin.
+HISTOGRAM_BINS = 40
+
+Limits = Tuple[Optional[float], Optional[float]]
+
+
+def _range_limits(params) -> Limits:
+    return params[0], params[1]
+
+
+def _tolerance_limits(params) -> Limits:
+    nominal, tol = params
+    low, high = nominal * (1 - tol / 100), nominal * (1 + tol / 100)
+    return min(low, high), max(low, high)
+
+
+def _deviation_limits(params) -> Limits:
+    nominal, deviation = params
+    return nominal - deviation, nominal + deviation
+
+
+def _upper_limit(params) -> Limits:
+    return None, params[0]
+
+
+def _lower_limit(params) -> Limits:
+    return params[0], None
+
+
+def _no_limits(params) -> Limits:
+    return None, None
+
+
+# Check target_name -> function of CheckResult.check_params returning (lower, upper) limits.
+# Checks not listed, such as outside_range or equal, don't have a meaningful capability index
+_LIMITS = {
+    "in range": _range_limits,
+    "in range equal": _range_limits,
+    "in range equal min": _range_limits,
+    "in range equal max": _range_limits,
+    "in tolerance": _tolerance_limits,
+    "in tolerance equal": _tolerance_limits,
+    "in deviation equal": _deviation_limits,
+    "smaller": _upper_limit,
+    "smaller or equal": _upper_limit,
+    "greater": _lower_limit,
+    "greater or equal": _lower_limit,
+    "log value": _no_limits,
+}
+
+
+@dataclass
+class CheckStats:
+    """
+    Running statistics for one check
+    """
+
+    lower: Optional[float] = None
+    upper: Optional[float] = None
+    count: int = 0
+    fails: int = 0
+    mean: float = 0.0
+    m2: float = 0.0  # Sum of squared differences from the mean (Welford)
+    min: float = math.inf
+    max: float = -math.inf
+    # Histogram edges are fixed by the first limits seen. Empty if the check isn't two sided
+    hist_low: Optional[float] = None
+    hist_high: Optional[float] = None
+    histogram: List[int] = field(default_factory=list)
+
+    def __post_init__(self):
+        if (
+            not self.histogram
+            and self.lower is not None
+            and self.upper is not None
+            and self.upper > self.lower
+        ):
+            margin = (self.upper - self.lower) / 2
+            self.hist_low = self.lower - margin
+            self.hist_high = self.upper + margin
+            # Underflow and overflow bins at either end
+            self.histogram = [0] * (2 * HISTOGRAM_BINS + 2)
+
+    def update(self, value: float, passes: bool):
+        self.count += 1
+        if not passes:
+            self.fails += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        low, high = self.hist_low, self.hist_high
+        if self.histogram and low is not None and high is not None:
+            bins = len(self.histogram) - 2
+            idx = (value - low) / (high - low) * bins
+            self.histogram[min(max(int(math.floor(idx)) + 1, 0), bins + 1)] += 1
+
+    @property
+    def variance(self) -> float:
+        if self.count < 2:
+            return 0.0
+        return self.m2 / (self.count - 1)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def cpk(self) -> Optional[float]:
+        """
+        Process capability index against the check limits. For a one sided limit this is Cpu or
+        Cpl. None if there are no limits, fewer than two values or no variation
+        """
+        if self.count < 2 or self.std == 0:
+            return None
+        candidates = []
+        if self.upper is not None:
+            candidates.append((self.upper - self.mean) / (3 * self.std))
+        if self.lower is not None:
+            candidates.append((self.mean - self.lower) / (3 * self.std))
+        if not candidates:
+            return None
+        return min(candidates)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate the q quantile (0 <= q <= 1) from the histogram, interpolating within a bin.
+        Values in the underflow or overflow bins are treated as min or max
+        """
+        low, high = self.hist_low, self.hist_high
+        if not self.histogram or low is None or high is None or self.count == 0:
+            return None
+        bins = len(self.histogram) - 2
+        width = (high - low) / bins
+        target = q * self.count
+        cumulative = 0
+        for i, n in enumerate(self.histogram):
+            if n and cumulative + n >= target:
+                if i == 0:
+                    return self.min
+                if i == bins + 1:
+                    return self.max
+                bin_low = low + (i - 1) * width
+                value = bin_low + width * (target - cumulative) / n
+                return min(max(value, self.min), self.max)
+            cumulative += n
+        return self.max
+
+
+StatsKey = Tuple[str, int, str]
+
+
+class CapabilityMonitor:
+    """
+    Subscribe to checks and keep `CheckStats` for each one, persisted to a json file
+
+    :param path:
+     json file to load existing statistics from and save to. If None, statistics are only kept
+     in memory
+    :param min_cpk:
+     A warning is logged once per sequence when a check with at least `min_samples` values
+     has a Cpk below this
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path, None] = None,
+        min_cpk: Optional[float] = 1.33,
+        min_samples: int = 30,
+    ):
+        self.path = Path(path) if path is not None else None
+        self.min_cpk = min_cpk
+        self.min_samples = min_samples
+        self.stats: Dict[StatsKey, CheckStats] = {}
+        # Only warn once per check each sequence
+        self._warned: Set[StatsKey] = set()
+        self._topics = [
+            (self.check, "Check"),
+            (self.sequence_complete, "Sequence_Complete"),
+        ]
+        if self.path is not None and self.path.exists():
+            self.load()
+
+    def install(self):
+        for callback, topic in self._topics:
+            pub.subscribe(callback, topic)
+
+    def uninstall(self):
+        for callback, topic in self._topics:
+            pub.unsubscribe(callback, topic)
+        self.save()
+
+    def check(self, passes: bool, chk: CheckResult, chk_cnt: int, context: str):
+        value = chk.test_val
+        if (
+            chk.stats is not None
+            or isinstance(value, bool)
+            or not isinstance(value, (int, float))
+        ):
+            # Only scalar numeric checks are tracked
+            return
+        limits = _LIMITS.get(chk.target_name)
+        if limits is None:
+            return
+        key = (context, chk_cnt, chk.description)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = CheckStats(*limits(chk.check_params))
+        stats.update(value, passes)
+        if (
+            self.min_cpk is not None
+            and key not in self._warned
+            and stats.count >= self.min_samples
+            and (cpk := stats.cpk()) is not None
+            and cpk < self.min_cpk
+        ):
+            self._warned.add(key)
+            logger.warning(
+                "Check %s.%s '%s' Cpk %.2f is below %.2f (mean=%g, std=%g, n=%d)",
+                context,
+                chk_cnt,
+                chk.description,
+                cpk,
+                self.min_cpk,
+                stats.mean,
+                stats.std,
+                stats.count,
+            )
+
+    def sequence_complete(self, *args, **kwargs):
+        self._warned.clear()
+        self.save()
+
+    def get(
+        self, test_index: str, chk_cnt: int, description: str = ""
+    ) -> Optional[CheckStats]:
+        return self.stats.get((test_index, chk_cnt, description))
+
+    def below(self, min_cpk: float) -> Dict[StatsKey, CheckStats]:
+        """
+        Checks with at least `min_samples` values and a Cpk below min_cpk
+        """
+        return {
+            key: stats
+            for key, stats in self.stats.items()
+            if stats.count >= self.min_samples
+            and (cpk := stats.cpk()) is not None
+            and cpk < min_cpk
+        }
+
+    def load(self):
+        with open(self.path, encoding="utf-8") as f:
+            data = json.load(f)
+        for entry in data:
+            key = (
+                entry.pop("test_index"),
+                entry.pop("check"),
+                entry.pop("description"),
+            )
+            self.stats[key] = CheckStats(**entry)
+
+    def save(self):
+        if self.path is None:
+            return
+        data = [
+            {"test_index": key[0], "check": key[1], "description": key[2], **asdict(s)}
+            for key, s in self.stats.items()
+        ]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so an interrupted save can't corrupt the store
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1)
+        os.replace(tmp_path, self.path)
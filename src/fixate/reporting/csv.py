@@ -5,6 +5,15 @@ Several parameters are now configure from fixate.config which can be set via -c
 REPORT_FORMAT_VERSION: Now user configurable as the parameters can change the format of the file
 tpl_time_stamp: How is the time stamp used for start and end time. Default "{0:%Y}{0:%m}{0:%d}-{0:%H}{0:%M}{0:%S}"
 tpl_csv_path:
+flush_policy: When the open csv file is flushed. Default "line"
+    "line": after every line, the same durability as reopening the file for each line
+    "test": at the end of each test and the end of the sequence
+    "interval": at most every flush_interval seconds, and whenever the writer is idle
+flush_interval: Seconds between flushes for the "interval" policy. Default 1.0
+fsync: Also call os.fsync on each flush so the data reaches the disk. Default False
+queue_size, backpressure, lag_warning: Writer thread queue settings, see fixate.reporting.hub.
+    Events that don't fit in the queue are spilled to a temporary file and written in order, so
+    no results are lost and a slow disk doesn't hold up the test thread
 
 plugins = {
     "fixate.reporting.csv": {
@@ -43,7 +52,11 @@ Check Function
 <test_val>,<nominal>
 ... For in_tolerance
 <test_val>,<nominal>,<tol>
+... For all_in_range*, all_in_mask, one row for the whole array
+<worst_val>,<_min at worst>,<_max at worst>,count=<n>,failed=<n>,worst-index=<index>,min-margin=<margin>,mean-margin=<margin>
 ... For passes, fails no more fields
+... For checks with an attachment, the key of the array in the sidecar file (see fixate.reporting.attachments)
+attachment=<key>
 
 Check Exception
 <Time Elapsed (s)>,Test <index>,check<index>,exception,<exception_message>
@@ -86,18 +99,16 @@ Test End
 """
 
 import csv
-import datetime
-import sys
+import functools
+import io
 import os
 import time
 import re
 
-from pubsub import pub
-
-from queue import Queue
 from fixate.core.common import TestClass
-from fixate.core.common import ExcThread
 from fixate.core.checks import CheckResult
+from fixate.reporting.attachments import AttachmentWriter
+from fixate.reporting.hub import ReportEvent, Sink
 import fixate
 import fixate.config
 
@@ -112,164 +123,220 @@ class TestClassImp(TestClass):
         pass
 
 
-class CSVWriter:
-    def __init__(self):
-        self.csv_queue = Queue()
-        self.csv_writer = None
+@functools.cache
+def _base_test_attributes() -> frozenset:
+    """Attributes every TestClass instance has, which are not reported as test parameters"""
+    return frozenset(TestClassImp().__dict__)
+
+
+def _extract_parameters(attributes: dict):
+    keys = sorted(set(attributes) - _base_test_attributes())
+    return [(key, attributes[key]) for key in keys]
+
+
+class CSVWriter(Sink):
+    """
+    Reporting sink that writes the csv report. The file is kept open for the sequence and
+    flushed according to flush_policy
+    """
 
-        self.exception_in_test = False
-        self.failed = False
-        self.chk_cnt = 0
+    name = "csv-writer"
+
+    def __init__(self):
+        data = fixate.config.get_config_dict()
+        data.update(fixate.config.get_plugin_data("plg_csv"))
+        super().__init__(data)
         self.csv_path = ""
         self.test_module = None
         self.start_time = None
         self.current_test = None
-        self.data = fixate.config.get_config_dict()
-        self.data.update(fixate.config.get_plugin_data("plg_csv"))
-        self.exception = None
-
-        self._topics = [
-            (self.test_start, "Test_Start"),
-            (self.test_comparison, "Check"),
-            (self.test_exception, "Test_Exception"),
-            (self.test_complete, "Test_Complete"),
-            (self.sequence_update, "Sequence_Update"),
-            (self.sequence_complete, "Sequence_Complete"),
-            (self.user_wait_start, "UI_block_start"),
-            (self.user_wait_end, "UI_block_end"),
-            (self.driver_open, "driver_open"),
-        ]
+        self._attachments = None  # AttachmentWriter for the current csv_path
 
-    def install(self):
-        self.csv_writer = ExcThread(target=self._csv_write, name="csv-writer")
-        self.csv_writer.start()
-
-        for callback, topic in self._topics:
-            pub.subscribe(callback, topic)
-
-    def uninstall(self):
-        for callback, topic in self._topics:
-            pub.unsubscribe(callback, topic)
-
-        if self.csv_writer:
-            self.csv_queue.put(None)
-            self.csv_writer.join()
-        self.csv_writer = None
-
-    def ensure_alive(self):
-        if self.exception:
-            raise RuntimeError(
-                f"Exception in {self.csv_writer.name} thread"
-            ) from self.exception
-
-        if not self.csv_writer.is_alive():
-            # If thread has exited without throwing an exception
-            raise RuntimeError("csv-writer thread not active")
-
-    def sequence_update(self, status):
-        # Do Start Sequence Reporting
-        if status in ["Running"]:
-            sequencer = fixate.config.RESOURCES["SEQUENCER"]
-            self.data.update(sequencer.context_data)
-            # Create new csv path
-            self.data["start_date_time"] = self.data["tpl_time_stamp"].format(
-                datetime.datetime.now()
-            )
-            self.test_module = sys.modules["module.loaded_tests"]
-            if fixate.config.log_file:
-                self.csv_path = fixate.config.log_file
-            else:
-                self.csv_path = os.path.join(
-                    *fixate.config.render_template(
-                        self.data["tpl_csv_path"], **self.data, self=self
-                    )
-                )
-            self.data["fixate_version"] = fixate.__version__
-            # Add dev if installed in editable mode
-            if "site-packages" not in __file__:
-                self.data["fixate_version"] += "dev"
-            self.data["test_script_name"] = os.path.basename(
-                self.test_module.__file__
-            ).split(".")[0]
-            self.data.update(sequencer.context_data)
-            self.start_time = time.perf_counter()
-            self._write_line_to_csv(
-                fixate.config.render_template(
-                    self.data["tpl_first_line"], **self.data, self=self
+        # Writer thread state
+        self._file = None
+        self._path = None
+        self._dirty = False
+        self._last_flush = 0.0
+        # Rows are rendered to a buffer and written as bytes, to count the bytes written
+        self._row_buffer = io.StringIO(newline="")
+        self._row_writer = csv.writer(self._row_buffer, quoting=csv.QUOTE_MINIMAL)
+
+    def _write_line_to_csv(self, line):
+        """
+        :param line:
+         single line of data with each column as an element in the list
+        :return:
+        """
+        self.put(ReportEvent("line", time.perf_counter(), time.time(), (line,)))
+
+    # Writer thread
+
+    def open(self):
+        self._policy = self.data.get("flush_policy", "line")
+        self._interval = float(self.data.get("flush_interval", 1.0))
+        self._sync = self.data.get("fsync", False)
+        self._last_flush = time.monotonic()
+
+    def handle(self, event: ReportEvent):
+        render = getattr(self, f"_render_{event.kind}", None)
+        if render is None:
+            return
+        for row in render(event.timestamp, *event.values):
+            self._write_row(row)
+        if self._policy == "line" or (
+            self._policy == "test"
+            and event.kind in ("test_complete", "sequence_complete")
+        ):
+            self._flush()
+        elif (
+            self._policy == "interval"
+            and time.monotonic() - self._last_flush >= self._interval
+        ):
+            self._flush()
+
+    def idle_timeout(self):
+        if self._policy == "interval" and self._dirty:
+            return max(self._last_flush + self._interval - time.monotonic(), 0)
+        return None
+
+    def idle(self):
+        self._flush()
+
+    def close(self):
+        self._close_attachments()
+        if self._file is not None:
+            self._flush()
+            self._file.close()
+            self._file = None
+            self._path = None
+
+    def _write_row(self, row):
+        if self._path != self.csv_path:
+            if self._file is not None:
+                self._flush()
+                self._file.close()
+            self._path = self.csv_path
+            directory = os.path.dirname(self._path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self._path, "ab")
+        self._row_buffer.seek(0)
+        self._row_buffer.truncate()
+        self._row_writer.writerow(row)
+        data = self._row_buffer.getvalue().encode("utf-8")
+        self._file.write(data)
+        self._dirty = True
+        self._bytes_written += len(data)
+
+    def _flush(self):
+        if self._file is not None and self._dirty:
+            self._file.flush()
+            if self._sync:
+                os.fsync(self._file.fileno())
+        self._dirty = False
+        self._last_flush = time.monotonic()
+
+    # Row rendering. Called on the writer thread with the event timestamp and values, yielding
+    # the rows to write
+
+    def _elapsed(self, timestamp):
+        return f"{(timestamp - self.start_time):.2f}"
+
+    def _render_line(self, timestamp, line):
+        yield line
+
+    def _render_sequence_start(self, timestamp, now, context_data, test_module):
+        self.data.update(context_data)
+        # Create new csv path
+        self.data["start_date_time"] = self.data["tpl_time_stamp"].format(now)
+        self.test_module = test_module
+        if fixate.config.log_file:
+            self.csv_path = fixate.config.log_file
+        else:
+            self.csv_path = os.path.join(
+                *fixate.config.render_template(
+                    self.data["tpl_csv_path"], **self.data, self=self
                 )
             )
+        self.data["fixate_version"] = fixate.__version__
+        # Add dev if installed in editable mode
+        if "site-packages" not in __file__:
+            self.data["fixate_version"] += "dev"
+        self.data["test_script_name"] = os.path.basename(
+            self.test_module.__file__
+        ).split(".")[0]
+        self.data.update(context_data)
+        self.start_time = timestamp
+        yield fixate.config.render_template(
+            self.data["tpl_first_line"], **self.data, self=self
+        )
 
-    def sequence_complete(
-        self, status, passed, failed, error, skipped, sequence_status
+    def _render_sequence_complete(
+        self,
+        timestamp,
+        now,
+        status,
+        passed,
+        failed,
+        error,
+        skipped,
+        sequence_status,
     ):
-        self._write_line_to_csv(
-            [
-                f"{(time.perf_counter() - self.start_time):.2f}",
-                "Sequence",
-                f"ended={self.data['tpl_time_stamp'].format(datetime.datetime.now())}",
-                sequence_status,
-                f"tests-passed={passed}",
-                f"tests-failed={failed}",
-                f"tests-error={error}",
-                f"tests-skipped={skipped}",
-                f"sequence={status.upper()}",
-            ]
-        )
         # Close out the reporting
         self.test_module = None
+        self._close_attachments()
+        yield [
+            self._elapsed(timestamp),
+            "Sequence",
+            f"ended={self.data['tpl_time_stamp'].format(now)}",
+            sequence_status,
+            f"tests-passed={passed}",
+            f"tests-failed={failed}",
+            f"tests-error={error}",
+            f"tests-skipped={skipped}",
+            f"sequence={status.upper()}",
+        ]
 
-    def test_start(self, data, test_index):
-        """
-        :param data:
-         the test class that is being started
-        :param test_index:
-         the test index in the sequencer
-        """
+    def _render_test_start(
+        self, timestamp, test_index, test_desc, test_desc_long, attributes
+    ):
         # Add a test record for this result that is overridden if the test is repeated
         # [0, 0, 0] -> Passed, Failed, Exception
         # Test <test_index>, start, <test name>
-        self._write_line_to_csv(
-            [
-                f"{(time.perf_counter() - self.start_time):.2f}",
-                f"Test {test_index}",
-                "start",
-                data.test_desc,
-                data.test_desc_long,
-            ]
-        )
-
-        test_params = self.extract_test_parameters(data)
         self.current_test = test_index
-        if len(test_params):
+        yield [
+            self._elapsed(timestamp),
+            f"Test {test_index}",
+            "start",
+            test_desc,
+            test_desc_long,
+        ]
+        test_params = _extract_parameters(attributes)
+        if test_params:
             # Test <test_index>, test-parameters, <param_name>=<param_value>, ...
             param_line = [
-                f"{(time.perf_counter() - self.start_time):.2f}",
+                self._elapsed(timestamp),
                 f"Test {test_index}",
                 "test-parameters",
             ]
             for param_name, param_value in test_params:
                 param_line.append(f"{param_name}={param_value}")
-            self._write_line_to_csv(param_line)
+            yield param_line
 
-    def test_exception(self, exception, test_index):
+    def _render_test_exception(self, timestamp, test_index, exception):
         self.current_test = test_index
-        exc_line = [
-            f"{(time.perf_counter() - self.start_time):.2f}",
+        yield [
+            self._elapsed(timestamp),
             f"Test {test_index}",
             "exception",
             re.sub(r",\)", ")", repr(exception)),
         ]  # Remove trailing comma for exception for python < 3.7
-        self._write_line_to_csv(exc_line)
-
-    def test_comparison(
-        self, passes: bool, chk: CheckResult, chk_cnt: int, context: str
-    ):
-        # pub.sendMessage("Check", passes=result, chk=chk, context=self.get_context())
 
+    def _render_check(self, timestamp, context, chk_cnt, chk: CheckResult):
         # Test <test_index>, check<number>, <check type>, <status>, <test_val>, <expected>
         # If exception <test_index>, check<number>, <exception details>
         chk_line = [
-            f"{(time.perf_counter() - self.start_time):.2f}",
+            self._elapsed(timestamp),
             f"Test {context}",
             f"check{chk_cnt}",
             chk.target_name,
@@ -278,61 +345,60 @@ class CSVWriter:
             chk.test_val,
         ]
         chk_line.extend(chk.check_params)
+        if chk.attachment is not None:
+            chk_line.append(f"attachment={self._write_attachment(chk.attachment)}")
         # TODO: might be clearer to make check_params a dict and then each
         # parameter entry as "key = value" (e.g "nominal = 55")
         # Easier to debug without referring to scripts or checks.py?
         # e.g. chk_line.extend([f"{k} = {v}" for k,v in chk.check_params.items()])
-
-        self._write_line_to_csv(chk_line)
-        self.chk_cnt += 1
-
-    def test_complete(self, data, test_index, status):
+        yield chk_line
+
+    def _write_attachment(self, array):
+        if self._attachments is None or self._attachments.csv_path != self.csv_path:
+            self._close_attachments()
+            directory = os.path.dirname(self.csv_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._attachments = AttachmentWriter(self.csv_path)
+        return self._attachments.append(array)
+
+    def _close_attachments(self):
+        if self._attachments is not None:
+            self._attachments.close()
+            self._attachments = None
+
+    def _render_test_complete(self, timestamp, test_index, status, passed, failed):
         self.current_test = test_index
-        try:
-            sequencer = fixate.config.RESOURCES["SEQUENCER"]
-            passed = sequencer.chk_pass
-            failed = sequencer.chk_fail
-
-            self._write_line_to_csv(
-                [
-                    f"{(time.perf_counter() - self.start_time):.2f}",
-                    f"Test {test_index}",
-                    "end",
-                    status,
-                    f"checks-passed={passed}",
-                    f"checks-failed={failed}",
-                ]
-            )
-        finally:
-            self.chk_cnt = 0
-
-    def user_wait_start(self, *args, **kwargs):
-        self._write_line_to_csv(
-            [
-                f"{(time.perf_counter() - self.start_time):.2f}",
-                f"Test {self.current_test}",
-                "user_wait_start",
-            ]
-        )
+        yield [
+            self._elapsed(timestamp),
+            f"Test {test_index}",
+            "end",
+            status,
+            f"checks-passed={passed}",
+            f"checks-failed={failed}",
+        ]
 
-    def user_wait_end(self, *args, **kwargs):
-        self._write_line_to_csv(
-            [
-                f"{time.perf_counter() - self.start_time:.2f}",
-                f"Test {self.current_test}",
-                "user_wait_end",
-            ]
-        )
+    def _render_user_wait_start(self, timestamp):
+        yield [
+            self._elapsed(timestamp),
+            f"Test {self.current_test}",
+            "user_wait_start",
+        ]
 
-    def driver_open(self, instr_type, identity):
-        self._write_line_to_csv(
-            [
-                f"{(time.perf_counter() - self.start_time):.2f}",
-                "DRIVER",
-                instr_type,
-                identity,
-            ]
-        )
+    def _render_user_wait_end(self, timestamp):
+        yield [
+            self._elapsed(timestamp),
+            f"Test {self.current_test}",
+            "user_wait_end",
+        ]
+
+    def _render_driver_open(self, timestamp, instr_type, identity):
+        yield [
+            self._elapsed(timestamp),
+            "DRIVER",
+            instr_type,
+            identity,
+        ]
 
     @staticmethod
     def extract_test_parameters(test_cls):
@@ -343,30 +409,4 @@ class CSVWriter:
          the keys and values in the form in alphabetical order on the parameter names and zipped as
          [(param_name, param_value)]
         """
-        comp = TestClassImp()
-        keys = sorted(set(test_cls.__dict__) - set(comp.__dict__))
-        return [(key, test_cls.__dict__[key]) for key in keys]
-
-    def _csv_write(self):
-        while True:
-            line = self.csv_queue.get()
-            if line is None:
-                break  # Command send to close csv_writer
-            try:
-                os.makedirs(os.path.dirname(self.csv_path))
-            except OSError as e:
-                pass
-            with open(self.csv_path, "a+", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
-                try:
-                    writer.writerow(line)
-                except Exception as e:
-                    self.exception = e
-
-    def _write_line_to_csv(self, line):
-        """
-        :param line:
-         single line of data with each column as an element in the list
-        :return:
-        """
-        self.csv_queue.put(line)
+        return _extract_parameters(test_cls.__dict__)
@@ -0,0 +1,146 @@
+"""
+Historical test statistics used to order a sequence for fail-fast screening.
+
+Statistics are gathered per test description (the first line of the TestClass docstring) from
+previous csv reports, or loaded from a json store previously written with `TestHistory.save()`.
+
+Only tests that set `order_independent = True` are moved. Within each TestList, those tests are
+shuffled amongst the positions they already occupy, so order dependent tests never move. The
+independent tests are sorted by expected duration divided by failure probability, which puts
+the tests most likely to fail and cheapest to run first.
+"""
+
+import csv
+import json
+import logging
+import math
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, Union
+
+from fixate.core.common import TestClass, TestList
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TestStats:
+    runs: int = 0
+    fails: int = 0
+    total_duration: float = 0.0
+
+    @property
+    def fail_probability(self) -> float:
+        # Laplace smoothing so that a handful of passes doesn't claim a test can never fail
+        return (self.fails + 1) / (self.runs + 2)
+
+    @property
+    def mean_duration(self) -> float:
+        if self.runs == 0:
+            return 0.0
+        return self.total_duration / self.runs
+
+    def score(self) -> float:
+        """Expected cost per failure found. Lower scores are run first"""
+        if self.runs == 0:
+            return math.inf
+        return self.mean_duration / self.fail_probability
+
+
+class TestHistory:
+    """
+    Pass/fail and duration statistics keyed by test description
+    """
+
+    def __init__(self):
+        self.stats: Dict[str, TestStats] = {}
+
+    def add_result(self, test_desc: str, status: str, duration: float):
+        """
+        :param test_desc:
+         The test description as recorded in the test log
+        :param status:
+         PASS, FAIL or ERROR. Other status, such as SKIP, are ignored
+        :param duration:
+         Time taken to run the test in seconds
+        """
+        if status not in ("PASS", "FAIL", "ERROR"):
+            return
+        stats = self.stats.setdefault(test_desc, TestStats())
+        stats.runs += 1
+        stats.total_duration += duration
+        if status != "PASS":
+            stats.fails += 1
+
+    def add_csv_report(self, csv_path: Union[str, Path]):
+        """
+        Parse a csv test log and add the result of each test.
+        """
+        started = {}
+        with open(csv_path, "r", newline="", encoding="utf-8") as f:
+            for line in csv.reader(f):
+                if len(line) < 4 or not line[1].startswith("Test "):
+                    continue
+                try:
+                    elapsed = float(line[0])
+                except ValueError:
+                    continue
+                test_index = line[1]
+                if line[2] == "start":
+                    started[test_index] = (line[3], elapsed)
+                elif line[2] == "end" and test_index in started:
+                    test_desc, start_time = started.pop(test_index)
+                    self.add_result(test_desc, line[3], elapsed - start_time)
+
+    def get(self, test_desc: str) -> TestStats:
+        return self.stats.get(test_desc, TestStats())
+
+    def reorder(self, test_list):
+        """
+        Reorder the order independent tests in test_list, recursing into any nested test lists.
+        test_list is modified in place.
+        """
+        independent_slots = []
+        for index in range(len(test_list)):
+            item = test_list[index]
+            if isinstance(item, TestClass):
+                if item.order_independent:
+                    independent_slots.append(index)
+            elif isinstance(item, (TestList, list)):
+                self.reorder(item)
+
+        tests = [test_list[index] for index in independent_slots]
+        ordered = sorted(tests, key=lambda test: self.get(test.test_desc).score())
+        for index, test in zip(independent_slots, ordered):
+            test_list[index] = test
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "TestHistory":
+        """
+        :param path:
+         Either a directory which is searched recursively for csv reports, a single csv
+         report, or a json file previously written by `save()`
+        """
+        path = Path(path)
+        history = cls()
+        if path.is_dir():
+            for csv_path in sorted(path.rglob("*.csv")):
+                try:
+                    history.add_csv_report(csv_path)
+                except (OSError, csv.Error, UnicodeDecodeError):
+                    logger.warning("Unable to read test history from %s", csv_path)
+        elif path.suffix.lower() == ".csv":
+            history.add_csv_report(path)
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            history.stats = {k: TestStats(**v) for k, v in data.items()}
+        return history
+
+    def save(self, path: Union[str, Path]):
+        """
+        Store the statistics as json. Parsing a large directory of reports is slow, so this can be
+        used to cache the result for later calls to `load()`
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({k: asdict(v) for k, v in self.stats.items()}, f, indent=2)
@@ -0,0 +1,418 @@
+"""
+Reporting hub
+
+The hub subscribes to the sequencer's pubsub topics once. Each message is captured on the test
+thread into an immutable `ReportEvent` and handed to every sink, e.g. the csv writer and the
+SQLite database. Each sink has its own queue and writer thread, so a slow sink doesn't delay the
+sequencer or the other sinks, and an exception in one sink doesn't stop the others.
+
+Sink settings, read from the sink's ``data`` (e.g. the ``plg_csv`` config) when it starts:
+
+queue_size: Maximum number of events waiting for the writer thread, 0 for no limit. Default 10000
+backpressure: What the test thread does when the queue is full. Default "spill"
+    "block": wait for the writer thread to catch up
+    "spill": write the events to a local temporary file, read back in order by the writer thread
+lag_warning: Seconds the writer thread can fall behind before a warning is shown in the UI. Default 5.0
+required: If the sequence is aborted when the sink fails. Otherwise the sink is detached with a
+    warning and the sequence carries on. Default True
+"""
+
+import datetime
+import logging
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from queue import Queue, Empty, Full
+from typing import Dict, Iterable, List, Optional
+
+from pubsub import pub
+
+import fixate.config
+from fixate.core.checks import CheckResult
+from fixate.core.common import ExcThread
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class ReportEvent:
+    """
+    A pubsub message captured for the sinks. Values that could change after the message, such as
+    the test parameters, are copied when the event is captured. Sinks must not modify them.
+
+    Event kinds and their values:
+
+    sequence_start: now (datetime), context_data (dict), test module (None if not loaded)
+    sequence_complete: now (datetime), status, passed, failed, error, skipped, sequence_status
+    test_start: test_index, test_desc, test_desc_long, test attributes (dict)
+    test_exception: test_index, exception
+    check: test_index, check number, CheckResult
+    test_complete: test_index, status, checks passed, checks failed
+    user_wait_start, user_wait_end: no values
+    driver_open: instrument type, identity
+    """
+
+    kind: str
+    timestamp: float  # time.perf_counter() when captured
+    time: float  # time.time() when captured
+    values: tuple
+
+
+@dataclass(frozen=True)
+class ReportMetrics:
+    """Health of a sink's writer thread, from `Sink.metrics`"""
+
+    queue_depth: int  # Events waiting to be written, including spilled events
+    spilled: int  # Events waiting in the spill file
+    lag: float  # Seconds since the oldest event still being written was queued
+    max_latency: float  # Longest time from queueing an event to writing it (s)
+    events_written: int
+    bytes_written: int  # For sinks that count it, e.g. the csv writer
+
+
+class _SpillFile:
+    """Events that didn't fit in the queue, pickled in order to a temporary file"""
+
+    def __init__(self):
+        self._file = None
+        self._read_pos = 0
+        self.pending = 0
+
+    def put(self, event):
+        # Pickle before writing, so an event that can't be pickled leaves the file intact
+        data = pickle.dumps(event)
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(prefix="fixate-report-spill-")
+        self._file.seek(0, os.SEEK_END)
+        self._file.write(data)
+        self.pending += 1
+
+    def get(self):
+        self._file.seek(self._read_pos)
+        event = pickle.load(self._file)
+        self._read_pos = self._file.tell()
+        self.pending -= 1
+        if not self.pending:
+            self._file.seek(0)
+            self._file.truncate()
+            self._read_pos = 0
+        return event
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class Sink:
+    """
+    Base class for reporting sinks. Events are queued by `put` on the test thread and passed to
+    `handle` on the sink's own writer thread.
+
+    Subclasses implement `handle`, and optionally `open` and `close` which run on the writer
+    thread, and `idle_timeout` and `idle` for work to do when no events arrive.
+    """
+
+    name = "report-sink"
+
+    def __init__(self, data: Optional[dict] = None):
+        self.data = data if data is not None else {}
+        self.queue: Queue[Optional[ReportEvent]] = Queue()
+        self.thread = None
+        self.exception = None
+
+        # Backpressure and health metrics. The spill lock guards the spill file and the order
+        # of events between it and the queue
+        self._spill = _SpillFile()
+        self._spill_lock = threading.Condition()
+        self._head_timestamp = (
+            None  # Queue time of the event being written, None if idle
+        )
+        self._lag_warned = False
+        self._max_latency = 0.0
+        self._events_written = 0
+        self._bytes_written = 0
+
+    @property
+    def required(self) -> bool:
+        return bool(self.data.get("required", True))
+
+    def start(self):
+        self.queue = Queue(maxsize=int(self.data.get("queue_size", 10000)))
+        self.exception = None
+        self.thread = ExcThread(target=self._run, name=self.name)
+        self.thread.start()
+
+    def stop(self, timeout=None):
+        """Write the queued events and stop the writer thread"""
+        if self.thread:
+            if self.thread.is_alive():
+                try:
+                    self.put(None, timeout)
+                except Full:
+                    pass
+            self.thread.join(timeout)
+            if self.thread.is_alive():
+                logger.warning("%s thread did not stop", self.name)
+        self.thread = None
+        self._spill.close()
+
+    def ensure_alive(self):
+        if self.exception:
+            raise RuntimeError(f"Exception in {self.name} thread") from self.exception
+
+        if not self.thread.is_alive():
+            # If thread has exited without throwing an exception
+            raise RuntimeError(f"{self.name} thread not active")
+
+    def metrics(self) -> ReportMetrics:
+        head = self._head_timestamp
+        return ReportMetrics(
+            queue_depth=self.queue.qsize() + self._spill.pending,
+            spilled=self._spill.pending,
+            lag=0.0 if head is None else time.perf_counter() - head,
+            max_latency=self._max_latency,
+            events_written=self._events_written,
+            bytes_written=self._bytes_written,
+        )
+
+    # Writer thread hooks
+
+    def open(self):
+        pass
+
+    def handle(self, event: ReportEvent):
+        raise NotImplementedError
+
+    def idle_timeout(self) -> Optional[float]:
+        """Seconds to wait for an event before calling `idle`, None to wait forever"""
+        return None
+
+    def idle(self):
+        pass
+
+    def close(self):
+        pass
+
+    # Queueing
+
+    def put(self, event: Optional[ReportEvent], timeout=None):
+        """
+        Queue an event for the writer thread, applying the backpressure policy if it is full.
+        With the "block" policy, raises Full if the queue is still full after timeout seconds
+        """
+        if event is not None:
+            self._check_lag(event.timestamp)
+        if self.data.get("backpressure", "spill") != "spill":
+            self.queue.put(event, timeout=timeout)
+            return
+        with self._spill_lock:
+            if not self._spill.pending:
+                try:
+                    self.queue.put_nowait(event)
+                    return
+                except Full:
+                    pass
+            try:
+                self._spill.put(event)
+                return
+            except Exception:
+                # e.g. the test module at the start of a sequence can't be pickled. Block until
+                # the spilled events are written so the order is kept
+                while self._spill.pending:
+                    self._spill_lock.wait()
+            self.queue.put(event)
+
+    def _get(self, timeout=None):
+        """Next event for the writer thread, raising Empty after timeout seconds"""
+        try:
+            return self.queue.get_nowait()
+        except Empty:
+            pass
+        with self._spill_lock:
+            if self._spill.pending:
+                event = self._spill.get()
+                if not self._spill.pending:
+                    self._spill_lock.notify_all()
+                return event
+        # Everything queued has been written
+        self._head_timestamp = None
+        return self.queue.get(timeout=timeout)
+
+    def _check_lag(self, now):
+        head = self._head_timestamp
+        lag = 0.0 if head is None else now - head
+        threshold = float(self.data.get("lag_warning", 5.0))
+        if lag <= threshold:
+            self._lag_warned = False
+        elif not self._lag_warned:
+            self._lag_warned = True
+            msg = (
+                f"Reporting to {self.name} is {lag:.0f} s behind, "
+                f"{self.queue.qsize() + self._spill.pending} events waiting to be written"
+            )
+            logger.warning(msg)
+            pub.sendMessage("UI_display_important", msg=msg)
+
+    def _run(self):
+        try:
+            self.open()
+            while True:
+                try:
+                    event = self._get(self.idle_timeout())
+                except Empty:
+                    self.idle()
+                    continue
+                if event is None:
+                    break  # Sent by stop
+                self._head_timestamp = event.timestamp
+                try:
+                    self.handle(event)
+                except Exception as e:
+                    self.exception = e
+                    continue
+                self._events_written += 1
+                self._max_latency = max(
+                    self._max_latency, time.perf_counter() - event.timestamp
+                )
+        finally:
+            self.close()
+
+
+class ReportingHub:
+    """Captures the sequencer's pubsub messages once and fans them out to the sinks"""
+
+    def __init__(self, sinks: Iterable[Sink] = ()):
+        self.sinks = list(sinks)
+        self._active: List[Sink] = []
+        self._topics = [
+            (self.sequence_update, "Sequence_Update"),
+            (self.sequence_complete, "Sequence_Complete"),
+            (self.test_start, "Test_Start"),
+            (self.test_exception, "Test_Exception"),
+            (self.test_comparison, "Check"),
+            (self.test_complete, "Test_Complete"),
+            (self.user_wait_start, "UI_block_start"),
+            (self.user_wait_end, "UI_block_end"),
+            (self.driver_open, "driver_open"),
+        ]
+
+    def install(self):
+        """
+        Start the sinks and subscribe to the sequencer. A sink that fails to start is detached with
+        a warning if it isn't required. If it is required, the sinks already started are stopped
+        and the exception raised
+        """
+        self._active = []
+        for sink in self.sinks:
+            try:
+                sink.start()
+            except Exception as e:
+                sink.stop(timeout=5)
+                if sink.required:
+                    for started in self._active:
+                        started.stop()
+                    self._active = []
+                    raise
+                msg = f"Reporting to {sink.name} not started: {e}"
+                logger.warning(msg, exc_info=e)
+                pub.sendMessage("UI_display_important", msg=msg)
+            else:
+                self._active.append(sink)
+        for callback, topic in self._topics:
+            pub.subscribe(callback, topic)
+
+    def uninstall(self):
+        for callback, topic in self._topics:
+            pub.unsubscribe(callback, topic)
+        for sink in self.sinks:
+            # Don't wait forever for a sink that was detached because it failed
+            sink.stop(timeout=None if sink in self._active else 5)
+        self._active = []
+
+    def ensure_alive(self):
+        """
+        Raise if a required sink has failed. Sinks that aren't required are detached with a
+        warning instead, and the other sinks carry on
+        """
+        for sink in list(self._active):
+            try:
+                sink.ensure_alive()
+            except RuntimeError as e:
+                if sink.required:
+                    raise
+                self._active.remove(sink)
+                msg = f"Reporting to {sink.name} stopped: {e.__cause__ or e}"
+                logger.warning(msg, exc_info=e)
+                pub.sendMessage("UI_display_important", msg=msg)
+
+    def metrics(self) -> Dict[str, ReportMetrics]:
+        return {sink.name: sink.metrics() for sink in self.sinks}
+
+    def publish(self, kind: str, *values):
+        event = ReportEvent(kind, time.perf_counter(), time.time(), values)
+        for sink in self._active:
+            sink.put(event)
+
+    # pubsub handlers, run on the test thread
+
+    def sequence_update(self, status):
+        if status in ["Running"]:
+            sequencer = fixate.config.RESOURCES["SEQUENCER"]
+            self.publish(
+                "sequence_start",
+                datetime.datetime.now(),
+                dict(sequencer.context_data),
+                sys.modules.get("module.loaded_tests"),
+            )
+
+    def sequence_complete(
+        self, status, passed, failed, error, skipped, sequence_status
+    ):
+        self.publish(
+            "sequence_complete",
+            datetime.datetime.now(),
+            status,
+            passed,
+            failed,
+            error,
+            skipped,
+            sequence_status,
+        )
+
+    def test_start(self, data, test_index):
+        self.publish(
+            "test_start",
+            test_index,
+            data.test_desc,
+            data.test_desc_long,
+            dict(data.__dict__),
+        )
+
+    def test_exception(self, exception, test_index):
+        self.publish("test_exception", test_index, exception)
+
+    def test_comparison(
+        self, passes: bool, chk: CheckResult, chk_cnt: int, context: str
+    ):
+        # CheckResult is immutable, so it is shared as is
+        self.publish("check", context, chk_cnt, chk)
+
+    def test_complete(self, data, test_index, status):
+        sequencer = fixate.config.RESOURCES["SEQUENCER"]
+        self.publish(
+            "test_complete", test_index, status, sequencer.chk_pass, sequencer.chk_fail
+        )
+
+    def user_wait_start(self, *args, **kwargs):
+        self.publish("user_wait_start")
+
+    def user_wait_end(self, *args, **kwargs):
+        self.publish("user_wait_end")
+
+    def driver_open(self, instr_type, identity):
+        self.publish("driver_open", instr_type, identity)
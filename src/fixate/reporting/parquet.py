@@ -0,0 +1,196 @@
+"""
+Convert a directory of csv reports into Parquet files of check results for analytics.
+
+Each csv report is written to one Parquet file, partitioned by the date the sequence started::
+
+    <out_dir>/date=2026-01-31/<report name>.parquet
+
+The whole directory can then be loaded with typed columns, e.g. ``pandas.read_parquet(out_dir)``.
+Reports are parsed in parallel with a process pool. The conversion is incremental: converted
+reports are recorded in ``<out_dir>/_converted.json`` with their size and modification time, and
+only new or changed reports are converted on the next run. Reports without a final "Sequence"
+line (still being written, or the station crashed) are left for a later run.
+
+Requires pyarrow (``pip install fixate[parquet]``)::
+
+    python -m fixate.reporting.parquet <csv dir> <out dir>
+"""
+
+import argparse
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional, Sequence, Union
+
+from fixate.reporting.reader import read_report
+
+logger = logging.getLogger(__name__)
+
+STATE_FILE = "_converted.json"
+
+# Numeric check parameters written as their own columns
+_PARAM_COLUMNS = ("nominal", "min", "max", "tol", "deviation")
+
+
+def _schema():
+    import pyarrow as pa
+
+    return pa.schema(
+        [
+            ("report", pa.string()),
+            ("serial_number", pa.string()),
+            ("test_script", pa.string()),
+            ("started", pa.timestamp("s")),
+            ("sequence_status", pa.string()),
+            ("test_index", pa.string()),
+            ("test_description", pa.string()),
+            ("check_number", pa.int32()),
+            ("check_type", pa.string()),
+            ("description", pa.string()),
+            ("status", pa.string()),
+            ("elapsed", pa.float64()),
+            ("test_val", pa.float64()),  # Null if not a number
+            ("test_val_text", pa.string()),
+        ]
+        + [(name, pa.float64()) for name in _PARAM_COLUMNS]
+        + [("params", pa.string())]  # All check parameters, as json
+    )
+
+
+def _to_float(value: Optional[str]) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def convert_report(
+    csv_path: Union[str, Path], out_dir: Union[str, Path]
+) -> Optional[str]:
+    """
+    Convert one csv report into a Parquet file in out_dir. Returns the path of the Parquet file
+    relative to out_dir, or None if the report is incomplete
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    csv_path = Path(csv_path)
+    report = read_report(csv_path)
+    if not report.complete:
+        return None
+
+    started = report.started
+    descriptions = {test.test_index: test.description for test in report.tests}
+    rows = []
+    for chk in report.checks:
+        named = chk.named_params()
+        row = {
+            "report": csv_path.name,
+            "serial_number": report.serial_number,
+            "test_script": report.header.get("test-script-name"),
+            "started": started,
+            "sequence_status": report.status,
+            "test_index": chk.test_index,
+            "test_description": descriptions.get(chk.test_index),
+            "check_number": chk.check_number,
+            "check_type": chk.check_type,
+            "description": chk.description,
+            "status": chk.status,
+            "elapsed": chk.elapsed,
+            "test_val": _to_float(chk.test_val),
+            "test_val_text": chk.test_val,
+            "params": json.dumps(chk.params),
+        }
+        for name in _PARAM_COLUMNS:
+            row[name] = _to_float(named.get(name))
+        rows.append(row)
+
+    partition = f"date={started:%Y-%m-%d}" if started else "date=unknown"
+    relative = Path(partition) / f"{csv_path.stem}.parquet"
+    out_path = Path(out_dir) / relative
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    table = pa.Table.from_pylist(rows, schema=_schema())
+    tmp_path = out_path.with_suffix(".parquet.tmp")
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, out_path)
+    return relative.as_posix()
+
+
+def _signature(path: Path) -> list:
+    stat = path.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def export(
+    csv_dir: Union[str, Path],
+    out_dir: Union[str, Path],
+    processes: Optional[int] = None,
+) -> list:
+    """
+    Convert new or changed csv reports in csv_dir (searched recursively) to Parquet files in
+    out_dir. Returns the list of Parquet files written, relative to out_dir
+    """
+    csv_dir = Path(csv_dir)
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    state_path = out_dir / STATE_FILE
+    state = {}
+    if state_path.exists():
+        with open(state_path, encoding="utf-8") as f:
+            state = json.load(f)
+
+    pending = {}
+    for path in sorted(csv_dir.rglob("*.csv")):
+        key = path.relative_to(csv_dir).as_posix()
+        signature = _signature(path)
+        if state.get(key, {}).get("signature") != signature:
+            pending[key] = (path, signature)
+
+    written = []
+    if pending:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            futures = {
+                key: pool.submit(convert_report, path, out_dir)
+                for key, (path, _) in pending.items()
+            }
+            for key, future in futures.items():
+                try:
+                    result = future.result()
+                except Exception:
+                    logger.exception("Failed to convert %s", pending[key][0])
+                    continue
+                if result is None:
+                    continue  # Incomplete, try again next time
+                state[key] = {"signature": pending[key][1], "parquet": result}
+                written.append(result)
+
+    tmp_path = state_path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=1)
+    os.replace(tmp_path, state_path)
+    return written
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(
+        prog="python -m fixate.reporting.parquet",
+        description="Convert fixate csv reports to Parquet files of check results",
+    )
+    parser.add_argument("csv_dir", type=Path, help="Directory of csv reports")
+    parser.add_argument("out_dir", type=Path, help="Directory to write Parquet files")
+    parser.add_argument(
+        "--processes",
+        type=int,
+        help="Number of worker processes. Defaults to the number of CPUs",
+    )
+    args = parser.parse_args(argv)
+    written = export(args.csv_dir, args.out_dir, args.processes)
+    print(f"Converted {len(written)} reports")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Read csv reports written by `fixate.reporting.csv` (REPORT_FORMAT_VERSION 3) back into records
+for analysis tools.
+"""
+
+import csv
+import datetime
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+# Check type -> names of the check parameters, in the order they are written to the csv
+CHECK_PARAMS = {
+    "in range": ("min", "max"),
+    "in range equal": ("min", "max"),
+    "in range equal min": ("min", "max"),
+    "in range equal max": ("min", "max"),
+    "outside range": ("min", "max"),
+    "outside range equal": ("min", "max"),
+    "outside range equal min": ("min", "max"),
+    "outside range equal max": ("min", "max"),
+    "all in range": ("min", "max"),
+    "all in range equal": ("min", "max"),
+    "all in mask": ("min", "max"),
+    "in tolerance": ("nominal", "tol"),
+    "in tolerance equal": ("nominal", "tol"),
+    "in deviation equal": ("nominal", "deviation"),
+    "smaller": ("nominal",),
+    "smaller or equal": ("nominal",),
+    "greater": ("nominal",),
+    "greater or equal": ("nominal",),
+    "equal": ("nominal",),
+}
+
+
+@dataclass
+class CheckRecord:
+    elapsed: float
+    test_index: str
+    check_number: int
+    check_type: str
+    description: str
+    status: str
+    test_val: str
+    params: List[str]
+
+    def named_params(self) -> Dict[str, str]:
+        """Check parameters by name, e.g. {"min": "1", "max": "2"}. Extra key=value fields are
+        split on the first ="""
+        names = CHECK_PARAMS.get(self.check_type, ())
+        named = dict(zip(names, self.params))
+        for extra in self.params[len(names) :]:
+            key, sep, value = extra.partition("=")
+            if sep:
+                named[key] = value
+        return named
+
+
+@dataclass
+class TestRecord:
+    test_index: str
+    description: str
+    start: float
+    end: Optional[float] = None
+    status: Optional[str] = None  # None if the test never completed
+    exception: Optional[str] = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self.end is None:
+            return None
+        return self.end - self.start
+
+
+@dataclass
+class Report:
+    path: Path
+    header: Dict[str, str]  # key=value fields of the first line
+    footer: Dict[str, str]  # key=value fields of the last line, empty if incomplete
+    tests: List[TestRecord] = field(default_factory=list)
+    checks: List[CheckRecord] = field(default_factory=list)
+
+    @property
+    def complete(self) -> bool:
+        return bool(self.footer)
+
+    @property
+    def status(self) -> Optional[str]:
+        """PASSED, FAILED, ERROR etc. or None if the sequence didn't complete"""
+        return self.footer.get("sequence")
+
+    @property
+    def started(self) -> Optional[datetime.datetime]:
+        return parse_time_stamp(self.header.get("started"))
+
+    @property
+    def serial_number(self) -> Optional[str]:
+        return self.header.get("serial_number")
+
+
+def parse_time_stamp(value: Optional[str]) -> Optional[datetime.datetime]:
+    """Parse the default tpl_time_stamp format, YYYYMMDD-hhmmss"""
+    if not value:
+        return None
+    try:
+        return datetime.datetime.strptime(value, "%Y%m%d-%H%M%S")
+    except ValueError:
+        return None
+
+
+def _fields(line: List[str]) -> Dict[str, str]:
+    fields = {}
+    for item in line[2:]:
+        key, sep, value = item.partition("=")
+        if sep:
+            fields[key] = value
+        else:
+            # e.g. the Finished/Aborted field on the last line
+            fields.setdefault("sequence_status", item)
+    return fields
+
+
+def _is_sequence_line(line: List[str]) -> bool:
+    return len(line) > 2 and line[1] == "Sequence"
+
+
+def read_report(path: Union[str, Path]) -> Report:
+    """Parse a whole csv report"""
+    path = Path(path)
+    report = Report(path, {}, {})
+    open_tests: Dict[str, TestRecord] = {}
+    test: Optional[TestRecord]
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        for line in csv.reader(f):
+            if len(line) < 3:
+                continue
+            if _is_sequence_line(line):
+                if line[2].startswith("started="):
+                    report.header = _fields(line)
+                elif line[2].startswith("ended="):
+                    report.footer = _fields(line)
+                continue
+            if not line[1].startswith("Test "):
+                continue
+            try:
+                elapsed = float(line[0])
+            except ValueError:
+                continue
+            test_index = line[1][5:]
+            kind = line[2]
+            if kind == "start":
+                test = TestRecord(test_index, line[3] if len(line) > 3 else "", elapsed)
+                open_tests[test_index] = test
+                report.tests.append(test)
+            elif kind == "end":
+                test = open_tests.pop(test_index, None)
+                if test is not None:
+                    test.end = elapsed
+                    test.status = line[3] if len(line) > 3 else None
+            elif kind == "exception":
+                test = open_tests.get(test_index)
+                if test is not None and len(line) > 3:
+                    test.exception = line[3]
+            elif kind.startswith("check") and len(line) >= 6:
+                try:
+                    number = int(kind[5:])
+                except ValueError:
+                    continue
+                report.checks.append(
+                    CheckRecord(
+                        elapsed,
+                        test_index,
+                        number,
+                        line[3],
+                        line[4],
+                        line[5],
+                        line[6] if len(line) > 6 else "",
+                        line[7:],
+                    )
+                )
+    return report
+
+
+def read_header_footer(path: Union[str, Path], tail_bytes: int = 4096) -> Report:
+    """
+    Read only the first and last lines of a report, without parsing the tests in between.
+    The last line is found by reading the end of the file, so this is fast for large reports
+    """
+    path = Path(path)
+    report = Report(path, {}, {})
+    with open(path, "rb") as f:
+        first = f.readline().decode("utf-8", errors="replace")
+        size = os.fstat(f.fileno()).st_size
+        f.seek(max(size - tail_bytes, 0))
+        tail = f.read().decode("utf-8", errors="replace")
+    header = next(csv.reader([first]), [])
+    if _is_sequence_line(header):
+        report.header = _fields(header)
+    lines = tail.splitlines()
+    if lines:
+        last = next(csv.reader([lines[-1]]), [])
+        if _is_sequence_line(last) and last[2].startswith("ended="):
+            report.footer = _fields(last)
+    return report
@@ -0,0 +1,357 @@
+"""
+SQLite results database
+
+Writes sequences, tests, checks and driver identities to a local SQLite database so that results
+can be searched across many runs without parsing csv reports. Enable it by adding to the fixate
+config::
+
+    plg_sqlite:
+        import_name: fixate.reporting.sqlite
+        class_name: SQLiteWriter
+        db_path: C:/ProgramData/Fixate/results.sqlite3
+
+The writer is a reporting hub sink with its own thread. Add ``required: false`` to carry on testing
+without the database if it fails, and see `fixate.reporting.hub` for the queue settings.
+
+Times are stored as unix timestamps. The database uses WAL mode, so it can be queried while a
+sequence is running, and results are committed at the end of each test.
+
+Query from the command line, e.g. all failures of check 4 in test 3.2 in the last week::
+
+    python -m fixate.reporting.sqlite results.sqlite3 --test 3.2 --check 4 --status FAIL --since 7d
+"""
+
+import argparse
+import csv
+import datetime
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Optional, Sequence
+
+import platformdirs
+
+import fixate
+import fixate.config
+from fixate.core.checks import CheckResult
+from fixate.reporting.hub import ReportEvent, Sink
+
+DEFAULT_DB_PATH = Path(platformdirs.user_data_dir("Fixate", False)) / "results.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sequences (
+    id INTEGER PRIMARY KEY,
+    started REAL NOT NULL,
+    ended REAL,
+    serial_number TEXT,
+    test_script TEXT,
+    fixate_version TEXT,
+    computername TEXT,
+    status TEXT,
+    sequence_status TEXT,
+    tests_passed INTEGER,
+    tests_failed INTEGER,
+    tests_error INTEGER,
+    tests_skipped INTEGER,
+    context TEXT
+);
+CREATE TABLE IF NOT EXISTS tests (
+    id INTEGER PRIMARY KEY,
+    sequence_id INTEGER NOT NULL REFERENCES sequences(id),
+    test_index TEXT NOT NULL,
+    description TEXT,
+    started REAL NOT NULL,
+    ended REAL,
+    status TEXT,
+    checks_passed INTEGER,
+    checks_failed INTEGER,
+    exception TEXT
+);
+CREATE TABLE IF NOT EXISTS checks (
+    id INTEGER PRIMARY KEY,
+    sequence_id INTEGER NOT NULL REFERENCES sequences(id),
+    test_id INTEGER REFERENCES tests(id),
+    test_index TEXT NOT NULL,
+    check_number INTEGER NOT NULL,
+    timestamp REAL NOT NULL,
+    target_name TEXT,
+    description TEXT,
+    status TEXT,
+    test_val,
+    params TEXT
+);
+CREATE TABLE IF NOT EXISTS drivers (
+    id INTEGER PRIMARY KEY,
+    sequence_id INTEGER REFERENCES sequences(id),
+    timestamp REAL NOT NULL,
+    instr_type TEXT,
+    identity TEXT
+);
+CREATE INDEX IF NOT EXISTS sequences_serial_number ON sequences(serial_number);
+CREATE INDEX IF NOT EXISTS sequences_started ON sequences(started);
+CREATE INDEX IF NOT EXISTS tests_test_index ON tests(test_index, status);
+CREATE INDEX IF NOT EXISTS tests_started ON tests(started);
+CREATE INDEX IF NOT EXISTS checks_test_index ON checks(test_index, check_number, status);
+CREATE INDEX IF NOT EXISTS checks_status ON checks(status, timestamp);
+CREATE INDEX IF NOT EXISTS checks_timestamp ON checks(timestamp);
+"""
+
+
+def connect(db_path) -> sqlite3.Connection:
+    """Open the database, creating the tables if required"""
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _sql_value(value):
+    # SQLite columns are dynamically typed, so numbers are stored as numbers for range queries
+    if value is None or isinstance(value, (int, float, str)):
+        return value
+    return str(value)
+
+
+class SQLiteWriter(Sink):
+    """
+    Reporting sink that writes results to a SQLite database on its own writer thread
+    """
+
+    name = "sqlite-writer"
+
+    def __init__(self):
+        super().__init__(fixate.config.get_plugin_data("plg_sqlite"))
+        self.db_path = Path(self.data.get("db_path", DEFAULT_DB_PATH))
+        self._conn = None
+        self._sequence_id = None
+        self._test_id = None
+
+    # Writer thread
+
+    def open(self):
+        self._conn = connect(self.db_path)
+
+    def handle(self, event: ReportEvent):
+        write = getattr(self, f"_write_{event.kind}", None)
+        if write is not None:
+            write(event.time, *event.values)
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.commit()
+            self._conn.close()
+            self._conn = None
+
+    def _write_sequence_start(self, timestamp, now, context_data, module):
+        if self._sequence_id is not None:
+            # Resumed after a pause, still the same sequence
+            return
+        script = None
+        if module is not None and getattr(module, "__file__", None):
+            script = os.path.basename(module.__file__).split(".")[0]
+        cur = self._conn.execute(
+            "INSERT INTO sequences (started, serial_number, test_script, fixate_version, "
+            "computername, context) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                timestamp,
+                context_data.get("serial_number"),
+                script,
+                fixate.__version__,
+                fixate.config.COMPUTERNAME,
+                json.dumps(context_data, default=str),
+            ),
+        )
+        self._sequence_id = cur.lastrowid
+        self._conn.commit()
+
+    def _write_sequence_complete(
+        self, timestamp, now, status, passed, failed, error, skipped, sequence_status
+    ):
+        self._conn.execute(
+            "UPDATE sequences SET ended=?, status=?, sequence_status=?, tests_passed=?, "
+            "tests_failed=?, tests_error=?, tests_skipped=? WHERE id=?",
+            (
+                timestamp,
+                status,
+                sequence_status,
+                passed,
+                failed,
+                error,
+                skipped,
+                self._sequence_id,
+            ),
+        )
+        self._conn.commit()
+        self._sequence_id = None
+        self._test_id = None
+
+    def _write_test_start(
+        self, timestamp, test_index, description, description_long, attributes
+    ):
+        cur = self._conn.execute(
+            "INSERT INTO tests (sequence_id, test_index, description, started) "
+            "VALUES (?, ?, ?, ?)",
+            (self._sequence_id, test_index, description, timestamp),
+        )
+        self._test_id = cur.lastrowid
+
+    def _write_test_exception(self, timestamp, test_index, exception):
+        self._conn.execute(
+            "UPDATE tests SET exception=? WHERE id=?",
+            (repr(exception), self._test_id),
+        )
+
+    def _write_check(self, timestamp, context, chk_cnt, chk: CheckResult):
+        self._conn.execute(
+            "INSERT INTO checks (sequence_id, test_id, test_index, check_number, timestamp, "
+            "target_name, description, status, test_val, params) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                self._sequence_id,
+                self._test_id,
+                context,
+                chk_cnt,
+                timestamp,
+                chk.target_name,
+                chk.description,
+                chk.status,
+                _sql_value(chk.test_val),
+                json.dumps(list(chk.check_params or []), default=str),
+            ),
+        )
+
+    def _write_test_complete(self, timestamp, test_index, status, passed, failed):
+        self._conn.execute(
+            "UPDATE tests SET ended=?, status=?, checks_passed=?, checks_failed=? "
+            "WHERE id=?",
+            (timestamp, status, passed, failed, self._test_id),
+        )
+        # One transaction per test
+        self._conn.commit()
+
+    def _write_driver_open(self, timestamp, instr_type, identity):
+        self._conn.execute(
+            "INSERT INTO drivers (sequence_id, timestamp, instr_type, identity) "
+            "VALUES (?, ?, ?, ?)",
+            (self._sequence_id, timestamp, instr_type, identity),
+        )
+
+
+def parse_since(value: str) -> float:
+    """
+    Convert a relative time (e.g. 30m, 12h, 7d, 2w) or an ISO date/time into a unix timestamp
+    """
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([mhdw])", value)
+    if match:
+        amount, unit = float(match.group(1)), match.group(2)
+        seconds = {"m": 60, "h": 3600, "d": 86400, "w": 604800}[unit]
+        return time.time() - amount * seconds
+    return datetime.datetime.fromisoformat(value).timestamp()
+
+
+def query_checks(
+    conn: sqlite3.Connection,
+    test_index: Optional[str] = None,
+    check_number: Optional[int] = None,
+    status: Optional[str] = None,
+    serial_number: Optional[str] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    limit: Optional[int] = None,
+) -> list:
+    """
+    Return matching check results, most recent first, as rows of
+    (timestamp, serial_number, test_index, check_number, target_name, description, status,
+    test_val, params)
+    """
+    where = []
+    args = []
+    for column, value in [
+        ("c.test_index = ?", test_index),
+        ("c.check_number = ?", check_number),
+        ("c.status = ?", status),
+        ("s.serial_number = ?", serial_number),
+        ("c.timestamp >= ?", since),
+        ("c.timestamp < ?", until),
+    ]:
+        if value is not None:
+            where.append(column)
+            args.append(value)
+    sql = (
+        "SELECT c.timestamp, s.serial_number, c.test_index, c.check_number, c.target_name, "
+        "c.description, c.status, c.test_val, c.params "
+        "FROM checks c JOIN sequences s ON s.id = c.sequence_id"
+    )
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY c.timestamp DESC"
+    if limit is not None:
+        sql += " LIMIT ?"
+        args.append(limit)
+    return conn.execute(sql, args).fetchall()
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(
+        prog="python -m fixate.reporting.sqlite",
+        description="Query check results from a fixate SQLite results database",
+    )
+    parser.add_argument("db", nargs="?", type=Path, default=DEFAULT_DB_PATH)
+    parser.add_argument("--test", help="Test index, e.g. 3.2")
+    parser.add_argument("--check", type=int, help="Check number within the test")
+    parser.add_argument("--status", type=str.upper, help="PASS or FAIL")
+    parser.add_argument("--serial-number")
+    parser.add_argument(
+        "--since", type=parse_since, help="e.g. 7d, 12h or 2026-01-31T08:00"
+    )
+    parser.add_argument("--until", type=parse_since)
+    parser.add_argument("--limit", type=int)
+    args = parser.parse_args(argv)
+
+    if not args.db.exists():
+        parser.error(f"{args.db} does not exist")
+    conn = sqlite3.connect(args.db)
+    try:
+        rows = query_checks(
+            conn,
+            test_index=args.test,
+            check_number=args.check,
+            status=args.status,
+            serial_number=args.serial_number,
+            since=args.since,
+            until=args.until,
+            limit=args.limit,
+        )
+    finally:
+        conn.close()
+
+    writer = csv.writer(sys.stdout, lineterminator="\n")
+    writer.writerow(
+        [
+            "time",
+            "serial_number",
+            "test",
+            "check",
+            "check_type",
+            "description",
+            "status",
+            "test_val",
+            "params",
+        ]
+    )
+    for row in rows:
+        timestamp = datetime.datetime.fromtimestamp(row[0]).isoformat(
+            sep=" ", timespec="seconds"
+        )
+        writer.writerow([timestamp, *row[1:]])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,397 @@
+"""
+Live result stream
+
+A reporting sink that serves every sequence, test, check and driver event as JSON lines over a
+local TCP or Unix socket, so that dashboards and MES bridges get results as they happen instead
+of polling csv reports. Enable it by adding to the fixate config::
+
+    plg_stream:
+        import_name: fixate.reporting.stream
+        class_name: StreamSink
+        address: tcp://127.0.0.1:5151  # or unix:///run/fixate/results.sock
+        client_buffer: 10000
+        replay_buffer: 10000
+
+Any number of clients can connect. After connecting, a client sends one JSON line to subscribe:
+
+``{}``
+    Live events only
+``{"offset": 0}``
+    Replay the current sequence from the given offset, then live events
+
+Every event line has ``sequence`` (an id for the sequence) and ``offset`` (the line number
+within the sequence), so a client that reconnects can catch up from the last offset it received.
+Sends never block the sequence. If a client falls more than client_buffer lines behind, its
+oldest lines are dropped and it is sent ``{"event": "dropped", "count": <n>}``. It can then
+reconnect with an offset to replay them.
+
+Only the last replay_buffer lines of the sequence are kept for replay. A client that asks for an
+offset older than that is first sent ``{"event": "truncated", "count": <n>}``, with the number of
+lines that can't be replayed, then the lines that are still kept.
+
+Values that JSON can't represent as numbers, such as NaN or infinite test values, are sent as the
+strings ``"NaN"``, ``"Infinity"`` and ``"-Infinity"``.
+
+The stream is optional, so by default the sequence carries on if it fails (``required: false``).
+"""
+
+import collections
+import itertools
+import json
+import logging
+import math
+import os
+import selectors
+import socket
+import sys
+import threading
+import uuid
+
+import fixate.config
+from fixate.core.checks import CheckResult
+from fixate.reporting.csv import _extract_parameters
+from fixate.reporting.hub import ReportEvent, Sink
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ADDRESS = "tcp://127.0.0.1:5151"
+
+
+def parse_address(address: str):
+    """(socket family, address) from tcp://host:port or unix://path"""
+    scheme, sep, rest = address.partition("://")
+    if not sep or scheme not in ("tcp", "unix"):
+        raise ValueError(
+            f"Stream address must be tcp://host:port or unix://path, got {address}"
+        )
+    if scheme == "unix":
+        return socket.AF_UNIX, rest
+    host, _, port = rest.rpartition(":")
+    return socket.AF_INET, (host or "127.0.0.1", int(port))
+
+
+class _Client:
+    """A connected client and the lines waiting to be sent to it"""
+
+    def __init__(self, sock, limit):
+        self.sock = sock
+        self.limit = limit
+        self.subscribed = False
+        self.request = b""
+        self.pending = collections.deque()
+        self.sending = b""  # Remainder of a partly sent line
+        self.dropped = 0
+
+    def push(self, line: bytes):
+        if len(self.pending) >= self.limit:
+            # Drop oldest, so the client stays as close to live as it can
+            self.pending.popleft()
+            self.dropped += 1
+        self.pending.append(line)
+
+    def next_data(self) -> bytes:
+        if self.dropped:
+            data = _encode({"event": "dropped", "count": self.dropped})
+            self.dropped = 0
+            return data
+        return self.pending.popleft() if self.pending else b""
+
+
+def _finite(value):
+    """value with non-finite floats replaced by strings, as JSON has no NaN or Infinity"""
+    if isinstance(value, float) and not math.isfinite(value):
+        if math.isnan(value):
+            return "NaN"
+        return "Infinity" if value > 0 else "-Infinity"
+    if isinstance(value, dict):
+        return {k: _finite(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(v) for v in value]
+    return value
+
+
+def _encode(record: dict) -> bytes:
+    try:
+        text = json.dumps(record, default=str, allow_nan=False)
+    except ValueError:
+        text = json.dumps(_finite(record), default=str, allow_nan=False)
+    return (text + "\n").encode("utf-8")
+
+
+class StreamSink(Sink):
+    name = "stream-server"
+
+    def __init__(self):
+        super().__init__(fixate.config.get_plugin_data("plg_stream"))
+        self.address = self.data.get("address", DEFAULT_ADDRESS)
+        self.client_buffer = int(self.data.get("client_buffer", 10000))
+        self.replay_buffer = int(self.data.get("replay_buffer", 10000))
+        # Bound address, e.g. with the port chosen when the address has port 0
+        self.server_address = None
+        self._server = None
+        self._server_thread = None
+        self._selector = None
+        self._wake_r = self._wake_w = None
+        self._running = False
+        self._lock = threading.Lock()  # Guards the clients and the replay buffer
+        self._clients = {}
+        # The latest lines of the current sequence, and the offset of the next line
+        self._replay = collections.deque(maxlen=self.replay_buffer)
+        self._offset = 0
+        self._sequence = None
+        self._start_time = None
+
+    @property
+    def required(self) -> bool:
+        return bool(self.data.get("required", False))
+
+    def start(self):
+        family, address = parse_address(self.address)
+        if family == socket.AF_UNIX and os.path.exists(address):
+            os.unlink(address)  # Left behind by a previous run
+        self._server = socket.socket(family, socket.SOCK_STREAM)
+        if family == socket.AF_INET:
+            if sys.platform == "win32":
+                # SO_REUSEADDR on Windows lets another process bind the same port and take the
+                # stream, so make sure no other socket can use the port
+                self._server.setsockopt(
+                    socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 1
+                )
+            else:
+                self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            self._server.bind(address)
+            self._server.listen()
+        except OSError:
+            self._server.close()
+            self._server = None
+            raise
+        self._server.setblocking(False)
+        self.server_address = self._server.getsockname()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._server, selectors.EVENT_READ)
+        self._selector.register(self._wake_r, selectors.EVENT_READ)
+        self._running = True
+        self._server_thread = threading.Thread(
+            target=self._serve, name="stream-clients", daemon=True
+        )
+        self._server_thread.start()
+        super().start()
+
+    def stop(self, timeout=None):
+        super().stop(timeout)
+        if self._server_thread is not None:
+            self._running = False
+            self._wake()
+            self._server_thread.join(timeout)
+            self._server_thread = None
+        for client in list(self._clients.values()):
+            client.sock.close()
+        self._clients.clear()
+        if self._selector is not None:
+            self._selector.close()
+        if self._wake_r is not None:
+            self._wake_r.close()
+            self._wake_w.close()
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+            if isinstance(self.server_address, str):
+                try:
+                    os.unlink(self.server_address)
+                except OSError:
+                    pass
+
+    # Writer thread: events to JSON lines
+
+    def handle(self, event: ReportEvent):
+        if event.kind == "sequence_start":
+            self._sequence = uuid.uuid4().hex
+            self._start_time = event.timestamp
+            with self._lock:
+                self._replay.clear()
+                self._offset = 0
+        record = {
+            "sequence": self._sequence,
+            "offset": self._offset,
+            "event": event.kind,
+            "time": event.time,
+        }
+        if self._start_time is not None:
+            record["elapsed"] = round(event.timestamp - self._start_time, 6)
+        render = getattr(self, f"_record_{event.kind}", None)
+        if render is not None:
+            record.update(render(*event.values))
+        line = _encode(record)
+        with self._lock:
+            self._replay.append(line)
+            self._offset += 1
+            for client in self._clients.values():
+                if client.subscribed:
+                    client.push(line)
+        self._bytes_written += len(line)
+        self._wake()
+
+    def _record_sequence_start(self, now, context_data, module):
+        script = None
+        if module is not None and getattr(module, "__file__", None):
+            script = os.path.basename(module.__file__).split(".")[0]
+        return {
+            "started": now.isoformat(),
+            "test_script": script,
+            "context": context_data,
+        }
+
+    def _record_sequence_complete(
+        self, now, status, passed, failed, error, skipped, sequence_status
+    ):
+        return {
+            "ended": now.isoformat(),
+            "status": status,
+            "sequence_status": sequence_status,
+            "tests_passed": passed,
+            "tests_failed": failed,
+            "tests_error": error,
+            "tests_skipped": skipped,
+        }
+
+    def _record_test_start(self, test_index, description, description_long, attributes):
+        return {
+            "test_index": test_index,
+            "description": description,
+            "description_long": description_long,
+            "parameters": {k: str(v) for k, v in _extract_parameters(attributes)},
+        }
+
+    def _record_test_exception(self, test_index, exception):
+        return {"test_index": test_index, "exception": repr(exception)}
+
+    def _record_check(self, test_index, chk_cnt, chk: CheckResult):
+        return {
+            "test_index": test_index,
+            "check_number": chk_cnt,
+            "check_type": chk.target_name,
+            "description": chk.description,
+            "status": chk.status,
+            "test_val": chk.test_val,
+            "params": list(chk.check_params or []),
+        }
+
+    def _record_test_complete(self, test_index, status, passed, failed):
+        return {
+            "test_index": test_index,
+            "status": status,
+            "checks_passed": passed,
+            "checks_failed": failed,
+        }
+
+    def _record_driver_open(self, instr_type, identity):
+        return {"instr_type": instr_type, "identity": identity}
+
+    # Server thread: accept clients and send without blocking
+
+    def _wake(self):
+        try:
+            self._wake_w.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass  # Already woken, or stopped
+
+    def _serve(self):
+        while self._running:
+            for key, mask in self._selector.select():
+                sock = key.fileobj
+                if sock is self._server:
+                    self._accept()
+                elif sock is self._wake_r:
+                    try:
+                        while self._wake_r.recv(4096):
+                            pass
+                    except BlockingIOError:
+                        pass
+                else:
+                    client = self._clients.get(sock)
+                    if client is None:
+                        continue
+                    if mask & selectors.EVENT_READ:
+                        self._read(client)
+            self._update_interest()
+
+    def _accept(self):
+        try:
+            sock, _ = self._server.accept()
+        except BlockingIOError:
+            return
+        sock.setblocking(False)
+        with self._lock:
+            self._clients[sock] = _Client(sock, self.client_buffer)
+        self._selector.register(sock, selectors.EVENT_READ)
+
+    def _read(self, client: _Client):
+        try:
+            data = client.sock.recv(4096)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self._disconnect(client)
+            return
+        if client.subscribed:
+            return  # Only the first line is a request, anything else is ignored
+        client.request += data
+        if b"\n" not in client.request:
+            return
+        line = client.request.split(b"\n", 1)[0]
+        try:
+            offset = json.loads(line or b"{}").get("offset")
+        except (ValueError, AttributeError):
+            offset = None
+        with self._lock:
+            client.subscribed = True
+            if offset is not None:
+                first = self._offset - len(self._replay)
+                offset = max(int(offset), 0)
+                if offset < first:
+                    client.push(
+                        _encode({"event": "truncated", "count": first - offset})
+                    )
+                for replay_line in itertools.islice(
+                    self._replay, max(offset - first, 0), None
+                ):
+                    client.push(replay_line)
+
+    def _update_interest(self):
+        """Send what each client can take without blocking, and watch for writable sockets"""
+        with self._lock:
+            clients = list(self._clients.values())
+        for client in clients:
+            try:
+                while True:
+                    if not client.sending:
+                        with self._lock:
+                            client.sending = client.next_data()
+                    if not client.sending:
+                        break
+                    sent = client.sock.send(client.sending)
+                    client.sending = client.sending[sent:]
+            except BlockingIOError:
+                pass
+            except OSError:
+                self._disconnect(client)
+                continue
+            events = selectors.EVENT_READ
+            if client.sending:
+                events |= selectors.EVENT_WRITE
+            self._selector.modify(client.sock, events)
+
+    def _disconnect(self, client: _Client):
+        with self._lock:
+            self._clients.pop(client.sock, None)
+        try:
+            self._selector.unregister(client.sock)
+        except (KeyError, ValueError):
+            pass
+        client.sock.close()
@@ -0,0 +1,266 @@
+"""
+Summarise a directory of csv reports: first pass yield, a Pareto of failing tests and test
+duration percentiles::
+
+    python -m fixate.reporting.summary <dir>
+
+Reports are scanned with a process pool. The pass/fail result of a report is read from its first
+and last "Sequence" lines only. The whole report is parsed only when it is needed: for failed
+reports, to find the failing tests, and for every report when durations are included.
+
+Results for each report are cached by size and modification time in
+``<dir>/.fixate-summary-cache.json``, so rerunning on the same directory only scans new reports.
+"""
+
+import argparse
+import json
+import logging
+import os
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from fixate.reporting.reader import read_header_footer, read_report
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILE = ".fixate-summary-cache.json"
+# Bump when the cached per report summary changes
+_CACHE_VERSION = 1
+
+_FAILED_TEST_STATUS = ("FAIL", "ERROR")
+
+
+def summarise_report(path: Union[str, Path], durations: bool = True) -> dict:
+    """
+    Summarise one report as a json serialisable dict. The report is only fully parsed if it
+    failed or durations are required
+    """
+    report = read_header_footer(path)
+    summary: Dict[str, Any] = {
+        "serial_number": report.serial_number,
+        "started": report.header.get("started"),
+        "status": report.status,  # None if incomplete
+        "failed_tests": [],
+        "durations": None,
+    }
+    needs_full_parse = durations or report.status != "PASSED"
+    if needs_full_parse:
+        report = read_report(path)
+        summary["failed_tests"] = [
+            [test.test_index, test.description]
+            for test in report.tests
+            if test.status in _FAILED_TEST_STATUS or test.exception is not None
+        ]
+        if durations:
+            summary["durations"] = [
+                [test.test_index, test.description, test.duration]
+                for test in report.tests
+                if test.duration is not None
+            ]
+    return summary
+
+
+def _signature(path: Path) -> list:
+    stat = path.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def scan(
+    directory: Union[str, Path],
+    durations: bool = True,
+    processes: Optional[int] = None,
+    cache_path: Union[str, Path, None] = None,
+) -> Dict[str, dict]:
+    """
+    Summarise every csv report in directory (searched recursively). Returns a dict of report
+    path relative to directory -> summary from `summarise_report`
+    """
+    directory = Path(directory)
+    cache = {}
+    if cache_path is not None and Path(cache_path).exists():
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == _CACHE_VERSION:
+                cache = data["reports"]
+        except (OSError, ValueError, KeyError):
+            logger.warning("Ignoring unreadable summary cache %s", cache_path)
+
+    results = {}
+    pending = {}
+    for path in directory.rglob("*.csv"):
+        key = path.relative_to(directory).as_posix()
+        signature = _signature(path)
+        cached = cache.get(key)
+        if (
+            cached is not None
+            and cached["signature"] == signature
+            and (not durations or cached["summary"]["durations"] is not None)
+        ):
+            results[key] = cached["summary"]
+        else:
+            pending[key] = (path, signature)
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            futures = {
+                key: pool.submit(summarise_report, path, durations)
+                for key, (path, _) in pending.items()
+            }
+            for key, future in futures.items():
+                try:
+                    results[key] = future.result()
+                except Exception:
+                    logger.exception("Failed to read %s", pending[key][0])
+                    continue
+                cache[key] = {"signature": pending[key][1], "summary": results[key]}
+
+    if cache_path is not None and pending:
+        # Drop reports that no longer exist
+        cache = {key: value for key, value in cache.items() if key in results}
+        tmp_path = Path(str(cache_path) + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": _CACHE_VERSION, "reports": cache}, f)
+        os.replace(tmp_path, cache_path)
+    return results
+
+
+def first_pass_yield(summaries: Dict[str, dict]) -> dict:
+    """
+    First pass and final yield by unit. Reports are grouped by serial number and ordered by
+    start time. Reports without a serial number are each counted as a separate unit.
+    Incomplete reports are ignored.
+    """
+    units = defaultdict(list)
+    for key, summary in summaries.items():
+        if summary["status"] is None:
+            continue
+        unit = summary["serial_number"] or f"report:{key}"
+        units[unit].append((summary["started"] or "", summary["status"]))
+    first_pass = final = 0
+    for results in units.values():
+        results.sort()
+        first_pass += results[0][1] == "PASSED"
+        final += results[-1][1] == "PASSED"
+    count = len(units)
+    return {
+        "units": count,
+        "reports": sum(len(r) for r in units.values()),
+        "incomplete": sum(1 for s in summaries.values() if s["status"] is None),
+        "first_pass": first_pass,
+        "first_pass_yield": first_pass / count if count else None,
+        "final": final,
+        "final_yield": final / count if count else None,
+    }
+
+
+def failure_pareto(summaries: Dict[str, dict]) -> List[tuple]:
+    """(test index, description, failures, cumulative fraction of failures), most common first"""
+    counts = Counter(
+        tuple(test) for s in summaries.values() for test in s["failed_tests"]
+    )
+    total = sum(counts.values())
+    pareto = []
+    cumulative = 0
+    for (test_index, description), n in counts.most_common():
+        cumulative += n
+        pareto.append((test_index, description, n, cumulative / total))
+    return pareto
+
+
+def duration_percentiles(
+    summaries: Dict[str, dict], percentiles=(50, 90, 99)
+) -> List[tuple]:
+    """(test index, description, count, *percentiles) for each test, in test index order"""
+    durations = defaultdict(list)
+    for s in summaries.values():
+        for test_index, description, duration in s["durations"] or []:
+            durations[(test_index, description)].append(duration)
+    rows = []
+    for (test_index, description), values in durations.items():
+        rows.append(
+            (
+                test_index,
+                description,
+                len(values),
+                *np.percentile(values, percentiles).tolist(),
+            )
+        )
+    rows.sort(key=lambda row: [int(x) for x in row[0].split(".") if x.isdigit()])
+    return rows
+
+
+def _percent(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.1%}"
+
+
+def format_summary(summaries: Dict[str, dict], durations: bool = True) -> str:
+    fpy = first_pass_yield(summaries)
+    lines = [
+        f"Reports: {fpy['reports']} ({fpy['incomplete']} incomplete not counted)",
+        f"Units: {fpy['units']}",
+        f"First pass yield: {_percent(fpy['first_pass_yield'])} ({fpy['first_pass']}/{fpy['units']})",
+        f"Final yield: {_percent(fpy['final_yield'])} ({fpy['final']}/{fpy['units']})",
+        "",
+        "Failures by test",
+        f"{'Test':<10}{'Failures':>10}{'Cumulative':>12}  Description",
+    ]
+    for test_index, description, n, cumulative in failure_pareto(summaries):
+        lines.append(
+            f"{test_index:<10}{n:>10}{_percent(cumulative):>12}  {description}"
+        )
+    if durations:
+        lines += [
+            "",
+            "Test duration (s)",
+            f"{'Test':<10}{'Count':>8}{'p50':>10}{'p90':>10}{'p99':>10}  Description",
+        ]
+        for test_index, description, n, p50, p90, p99 in duration_percentiles(
+            summaries
+        ):
+            lines.append(
+                f"{test_index:<10}{n:>8}{p50:>10.2f}{p90:>10.2f}{p99:>10.2f}  {description}"
+            )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(
+        prog="python -m fixate.reporting.summary",
+        description="Summarise yield, failures and test durations from fixate csv reports",
+    )
+    parser.add_argument("directory", type=Path, help="Directory of csv reports")
+    parser.add_argument(
+        "--no-durations",
+        action="store_true",
+        help="Skip test durations. Only failed reports are then parsed in full",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        help="Number of worker processes. Defaults to the number of CPUs",
+    )
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        help=f"Cache file. Defaults to <directory>/{CACHE_FILE}",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Don't use a cache")
+    args = parser.parse_args(argv)
+
+    if not args.directory.is_dir():
+        parser.error(f"{args.directory} is not a directory")
+    cache_path = None
+    if not args.no_cache:
+        cache_path = args.cache or args.directory / CACHE_FILE
+    durations = not args.no_durations
+    summaries = scan(args.directory, durations, args.processes, cache_path)
+    print(format_summary(summaries, durations))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,48 @@
+import inspect
 import sys
 import time
 import re
 from pubsub import pub
 from fixate.core.common import TestList, TestClass
-from fixate.core.exceptions import SequenceAbort, CheckFail
+from fixate.core.exceptions import SequenceAbort, CheckFail, TestTimeout
+from fixate.core import timing
 from fixate._ui import user_retry_abort_fail
 from fixate.core.checks import CheckResult
-from fixate.reporting import CSVWriter
+from fixate.reporting import CSVWriter, ReportingHub, Sink, load_plugins
 import logging
 
 logger = logging.getLogger(__name__)
 
 STATUS_STATES = ["Idle", "Running", "Paused", "Finished", "Restart", "Aborted"]
 
+# Seconds to wait for instrument calls still running after an async method has finished or
+# been cancelled, longer than the drivers' VISA timeouts
+INSTRUMENT_IDLE_TIMEOUT = 30
+
+
+def _run(method):
+    """Call a test's method, running it to completion if it is ``async def``"""
+    result = method()
+    if inspect.iscoroutine(result):
+        try:
+            return timing.run(result)
+        finally:
+            # Cancelling the coroutine doesn't stop a call already running on an
+            # instrument's thread, so let it finish before anything else uses the instrument
+            from fixate.drivers import aio
+
+            if not aio.wait_idle(INSTRUMENT_IDLE_TIMEOUT):
+                logger.warning(
+                    "Instrument call still running after %s s, continuing without it",
+                    INSTRUMENT_IDLE_TIMEOUT,
+                )
+    return result
+
 
 class ContextStackNode:
     def __init__(self, seq):
         self.index = 0
+        self.start_time = time.monotonic()
         if isinstance(seq, TestList):
             self.testlist = seq
         elif isinstance(seq, list):
@@ -113,12 +139,31 @@ class Sequencer:
         self.context = ContextStack()
         self.context_data = {}
         self.end_status = "N/A"
-        self.reporting_service = CSVWriter()
+        # Additional reporting services from plg_ config entries, e.g. the SQLite writer. Sinks
+        # are fed by the reporting hub, each on its own thread
+        plugins = load_plugins()
+        self.reporting_service = ReportingHub(
+            [CSVWriter()] + [p for p in plugins if isinstance(p, Sink)]
+        )
+        self.plugins = [p for p in plugins if not isinstance(p, Sink)]
+        self._check_topic = None
 
         # Sequencer behaviour. Don't ask the user when things to wrong, just marks tests as failed.
         # This does not change the behaviour of tests that call out to the user. They will still block as required.
         self.non_interactive = False
 
+        # Stop the sequence at the first failing test instead of completing the run
+        self.abort_on_first_fail = False
+        # Optional fixate.reporting.history.TestHistory. If set, order independent tests are
+        # reordered on load so that tests most likely to fail and cheapest to run go first
+        self.test_history = None
+        # Abort the sequence if a test exceeds its timeout. Otherwise the test is marked as an
+        # error and the sequence continues
+        self.abort_on_timeout = False
+        # Optional fixate.reporting.capability.CapabilityMonitor. If set, it is installed for
+        # the duration of the sequence to keep running statistics for each check
+        self.capability_monitor = None
+
     def levels(self):
         """
         Get the current test context from the stack
@@ -165,6 +210,8 @@ class Sequencer:
                 self._status = val
 
     def load(self, val):
+        if self.test_history is not None:
+            self.test_history.reorder(val)
         self.tests.append(val)
         self.context.push(self.tests)
         self.end_status = "N/A"
@@ -220,7 +267,12 @@ class Sequencer:
         Runs the sequence from the beginning to end once
         :return:
         """
+        timing.clear_abort()
         self.reporting_service.install()
+        for plugin in self.plugins:
+            plugin.install()
+        if self.capability_monitor is not None:
+            self.capability_monitor.install()
         self.status = "Running"
 
         self.run_once()
@@ -236,6 +288,10 @@ class Sequencer:
                     logger.exception(e)
             self.context.pop()
 
+        if self.capability_monitor is not None:
+            self.capability_monitor.uninstall()
+        for plugin in self.plugins:
+            plugin.uninstall()
         self.reporting_service.uninstall()
 
     def run_once(self):
@@ -247,6 +303,9 @@ class Sequencer:
         while self.context:
             try:
                 self.reporting_service.ensure_alive()
+                for plugin in self.plugins:
+                    if hasattr(plugin, "ensure_alive"):
+                        plugin.ensure_alive()
             except Exception as e:
                 # We cannot log to file. Abort testing and exit
                 pub.sendMessage(
@@ -280,6 +339,10 @@ class Sequencer:
                             if not self.retry_prompt():
                                 # mark the test as failed and continue. else will loop and try again
                                 self.tests_failed += 1
+                                if self.abort_on_first_fail:
+                                    # Leave the index on the failed test so the remaining
+                                    # test lists are exited by run_sequence
+                                    break
                                 top.index += 1
                     elif isinstance(top.current(), TestList):
                         pub.sendMessage(
@@ -329,7 +392,7 @@ class Sequencer:
             return True
 
         attempts = 0
-        abort_exceptions = [SequenceAbort, KeyboardInterrupt]
+        abort_exceptions = [SequenceAbort, KeyboardInterrupt, TestTimeout]
         abort_exceptions.extend(active_test.abort_exceptions)
         while True:
             attempts += 1
@@ -340,12 +403,13 @@ class Sequencer:
                 self.chk_fail, self.chk_pass = 0, 0
                 # Run the test
                 try:
-                    for index_context, current_level in enumerate(self.context):
-                        current_level.current().set_up()
-                    active_test.test()
+                    with timing.watchdog(self.test_timeout(active_test)):
+                        for index_context, current_level in enumerate(self.context):
+                            _run(current_level.current().set_up)
+                        _run(active_test.test)
                 finally:
                     for current_level in self.context[index_context::-1]:
-                        current_level.current().tear_down()
+                        _run(current_level.current().tear_down)
                 if not self.chk_fail:
                     active_test_status = "PASS"
                     self.tests_passed += 1
@@ -360,7 +424,7 @@ class Sequencer:
                 # Retry Logic for failed checks
                 active_test_status = "FAIL"
 
-            except tuple(abort_exceptions):
+            except tuple(abort_exceptions) as e:
                 if self.ABORT:  # Program force quit
                     active_test_status = "ERROR"
                     raise SequenceAbort("Sequence Aborted")
@@ -371,6 +435,15 @@ class Sequencer:
                 )
                 attempts = 0
                 active_test_status = "ERROR"
+                if isinstance(e, TestTimeout) and self.abort_on_timeout:
+                    self.tests_errored += 1
+                    pub.sendMessage(
+                        "Test_Complete",
+                        data=active_test,
+                        test_index=self.levels(),
+                        status=active_test_status,
+                    )
+                    raise SequenceAbort("Sequence Aborted on test timeout") from e
                 if not self.retry_prompt():
                     self.tests_errored += 1
                     break
@@ -395,6 +468,23 @@ class Sequencer:
         )
         return active_test_status == "PASS"
 
+    def test_timeout(self, test):
+        """
+        Time allowed for an attempt at test. This is the test timeout, further limited by the time
+        remaining for each enclosing TestList that has a timeout.
+        :return: timeout in seconds or None if there is no limit
+        """
+        timeouts = []
+        if test.timeout is not None:
+            timeouts.append(test.timeout)
+        now = time.monotonic()
+        for node in self.context:
+            if node.testlist.timeout is not None:
+                timeouts.append(node.testlist.timeout - (now - node.start_time))
+        if not timeouts:
+            return None
+        return max(min(timeouts), 0)
+
     def retry_prompt(self):
         """Prompt the user when something goes wrong.
 
@@ -413,6 +503,8 @@ class Sequencer:
     def _handle_sequence_abort(self):
         self.status = "Aborted"
         self.ABORT = True
+        # Wake the test thread if it is waiting in a driver, switching or user prompt
+        timing.abort()
 
     def check(self, chk: CheckResult):
         """Update current pass/fail counts and send check criteria to subscribers"""
@@ -420,8 +512,14 @@ class Sequencer:
             self.chk_pass += 1
         else:
             self.chk_fail += 1
-        pub.sendMessage(
-            "Check",
+        # Publish on the topic directly instead of pub.sendMessage, which looks the topic up by
+        # name each time. Checks can be called thousands of times in a loop.
+        topic = self._check_topic
+        if topic is None:
+            topic = self._check_topic = pub.getDefaultTopicMgr().getOrCreateTopic(
+                "Check"
+            )
+        topic.publish(
             passes=chk.result,
             chk=chk,
             chk_cnt=self.chk_pass + self.chk_fail,
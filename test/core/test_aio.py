@@ -0,0 +1,104 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from fixate.drivers import aio
+
+
+class Channel:
+    def __init__(self, log):
+        self.log = log
+
+    def voltage(self, value):
+        self.log.append(("voltage", value))
+
+
+class SlowDriver:
+    def __init__(self, delay=0.1):
+        self.delay = delay
+        self.log = []
+        self.threads = set()
+        self.channel1 = Channel(self.log)
+        self._output = False
+
+    def measure(self, value):
+        self.threads.add(threading.get_ident())
+        time.sleep(self.delay)
+        self.log.append(("measure", value))
+        return value
+
+    @property
+    def output(self):
+        self.threads.add(threading.get_ident())
+        return self._output
+
+    @output.setter
+    def output(self, value):
+        self.threads.add(threading.get_ident())
+        self._output = value
+
+
+def test_instruments_overlap():
+    drivers = [SlowDriver(), SlowDriver(), SlowDriver()]
+
+    async def main():
+        wrapped = [aio.AsyncDriver(driver) for driver in drivers]
+        return await asyncio.gather(*(w.measure(i) for i, w in enumerate(wrapped)))
+
+    start = time.monotonic()
+    assert asyncio.run(main()) == [0, 1, 2]
+    assert time.monotonic() - start < 0.25
+
+
+def test_one_command_in_flight_per_instrument():
+    driver = SlowDriver(0.02)
+
+    async def main():
+        wrapped = aio.AsyncDriver(driver)
+        await asyncio.gather(
+            wrapped.measure(1), wrapped.channel1.voltage(5), wrapped.measure(2)
+        )
+
+    start = time.monotonic()
+    asyncio.run(main())
+    assert time.monotonic() - start >= 0.04
+    assert driver.log == [("measure", 1), ("voltage", 5), ("measure", 2)]
+    assert len(driver.threads) == 1
+
+
+def test_attributes_on_instrument_thread():
+    driver = SlowDriver()
+
+    async def main():
+        wrapped = aio.AsyncDriver(driver)
+        before = await wrapped.output
+        await aio.assign(wrapped, "output", True)
+        return before, await wrapped.output
+
+    assert asyncio.run(main()) == (False, True)
+    assert threading.get_ident() not in driver.threads
+    with pytest.raises(AttributeError, match="aio.assign"):
+        aio.AsyncDriver(driver).output = True
+
+
+def test_open():
+    async def main():
+        wrapped = await aio.open(SlowDriver)
+        return await wrapped.measure(3)
+
+    assert asyncio.run(main()) == 3
+
+
+def test_wait_idle():
+    driver = SlowDriver(0.1)
+
+    async def main():
+        wrapped = aio.AsyncDriver(driver)
+        wrapped.measure(1)
+        wrapped.measure(2)
+
+    asyncio.run(main())
+    assert aio.wait_idle()
+    assert driver.log == [("measure", 1), ("measure", 2)]
@@ -0,0 +1,87 @@
+import inspect
+
+import pytest
+
+from fixate.drivers import api
+
+
+class Channel:
+    def __init__(self):
+        self.calls = []
+
+    def scale(self, value: float):
+        """Set the vertical scale"""
+
+    def output(self, value: bool):
+        pass
+
+
+class Source:
+    def __call__(self, value):
+        pass
+
+
+class Driver:
+    def __init__(self):
+        self.ch1 = Channel()
+        self.ch2 = Channel()
+        self.sent = []
+        self.api = [
+            ("ch1.scale", self.write, "CHAN1:SCAL {value}"),
+            ("ch2.scale", self.write, "CHAN2:SCAL {value}"),
+            ("ch1.output", self.write, "OUTP1 {value}"),
+        ]
+
+    def write(self, base_str, **kwargs):
+        self.sent.append(api.format_command(base_str, kwargs))
+
+    def prepare_string(self, func, handler, base_str):
+        return api.api_method(func, handler, base_str, bool_to_on_off=True)
+
+
+def test_api_methods_bound_per_instance():
+    driver = Driver()
+    api.init_api(driver, driver.prepare_string)
+    driver.ch1.scale(0.5)
+    driver.ch2.scale(value=2)
+    driver.ch1.output(True)
+    driver.ch1.output(value=False)
+    assert driver.sent == ["CHAN1:SCAL 0.5", "CHAN2:SCAL 2", "OUTP1 ON", "OUTP1 OFF"]
+
+
+def test_api_method_keeps_placeholder_metadata():
+    driver = Driver()
+    api.init_api(driver, driver.prepare_string)
+    assert driver.ch1.scale.__name__ == "scale"
+    assert driver.ch1.scale.__doc__ == "Set the vertical scale"
+    assert str(inspect.signature(driver.ch1.scale)) == "(value: float)"
+
+
+def test_unknown_argument_raises():
+    driver = Driver()
+    api.init_api(driver, driver.prepare_string)
+    with pytest.raises(KeyError):
+        driver.ch1.output(enabled=True)
+    with pytest.raises(IndexError):
+        driver.ch1.scale(1, 2)
+
+
+def test_parameters_shared_by_instances():
+    first, second = Channel(), Channel()
+    assert api.parameters(first.output) is api.parameters(second.output)
+    assert api.parameters(first.output) == (("value",), {"value": True})
+    assert api.parameters(Source()) is api.parameters(Source())
+    assert api.parameters(Source())[0] == ("value",)
+
+
+@pytest.mark.parametrize(
+    "base_str, kwargs, expected",
+    [
+        ("*RST", {}, "*RST"),
+        ("VOLT {value}", {"value": 5}, "VOLT 5"),
+        # Stored values can hold further placeholders
+        ("{store[cmd]}", {"store": {"cmd": "FREQ {value}"}, "value": 10}, "FREQ 10"),
+    ],
+)
+def test_format_command(base_str, kwargs, expected):
+    assert api.format_command(base_str, kwargs) == expected
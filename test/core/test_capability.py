@@ -0,0 +1,100 @@
+import random
+import statistics
+
+import pytest
+
+from fixate.core.checks import (
+    _CheckClass,
+    _in_range,
+    _in_tolerance,
+    _smaller,
+    _equal,
+)
+from fixate.reporting.capability import CapabilityMonitor, CheckStats
+
+
+def check_result(target, **kwargs):
+    chk = _CheckClass(target=target, **kwargs)
+    return chk.get_result()
+
+
+def test_welford_matches_batch():
+    rng = random.Random(0)
+    values = [rng.gauss(5, 0.1) for _ in range(1000)]
+    stats = CheckStats(4.5, 5.5)
+    for v in values:
+        stats.update(v, True)
+
+    assert stats.count == 1000
+    assert stats.mean == pytest.approx(statistics.mean(values))
+    assert stats.std == pytest.approx(statistics.stdev(values))
+    assert stats.min == min(values)
+    assert stats.max == max(values)
+    mean, std = statistics.mean(values), statistics.stdev(values)
+    assert stats.cpk() == pytest.approx(min(5.5 - mean, mean - 4.5) / (3 * std))
+    assert stats.quantile(0.5) == pytest.approx(statistics.median(values), abs=0.03)
+
+
+def test_cpk_one_sided():
+    stats = CheckStats(None, 10)
+    for v in [1, 2, 3]:
+        stats.update(v, True)
+    assert stats.cpk() == pytest.approx((10 - 2) / 3)
+    assert stats.quantile(0.5) is None
+
+
+def test_cpk_needs_variation():
+    stats = CheckStats(0, 1)
+    stats.update(0.5, True)
+    assert stats.cpk() is None
+    stats.update(0.5, True)
+    assert stats.cpk() is None
+
+
+def test_monitor_limits_and_persistence(tmp_path):
+    path = tmp_path / "stats.json"
+    monitor = CapabilityMonitor(path)
+    for v in [9.9, 10.0, 10.1]:
+        monitor.check(
+            True,
+            check_result(
+                _in_tolerance, test_val=v, nominal=10, tol=5, description="tol"
+            ),
+            1,
+            "1",
+        )
+    monitor.check(
+        False,
+        check_result(_in_range, test_val=3, _min=0, _max=2, description="range"),
+        2,
+        "1",
+    )
+    monitor.check(
+        True, check_result(_smaller, test_val=3, nominal=4, description="small"), 1, "2"
+    )
+    # Not tracked, no meaningful limits
+    monitor.check(
+        True, check_result(_equal, test_val=3, nominal=3, description="eq"), 2, "2"
+    )
+
+    tol = monitor.get("1", 1, "tol")
+    assert (tol.lower, tol.upper) == pytest.approx((9.5, 10.5))
+    assert tol.count == 3
+    assert monitor.get("1", 2, "range").fails == 1
+    assert (monitor.get("2", 1, "small").lower, monitor.get("2", 1, "small").upper) == (
+        None,
+        4,
+    )
+    assert monitor.get("2", 2, "eq") is None
+
+    monitor.save()
+    loaded = CapabilityMonitor(path)
+    assert loaded.stats == monitor.stats
+
+
+def test_monitor_below():
+    monitor = CapabilityMonitor(min_samples=3)
+    for v in [0.1, 0.5, 0.9]:
+        monitor.check(True, check_result(_in_range, test_val=v, _min=0, _max=1), 1, "1")
+    assert list(monitor.below(1.33)) == [("1", 1, "")]
+    assert monitor.below(0.1) == {}
@@ -2,12 +2,14 @@ import subprocess
 import os.path
 import sys
 
+import numpy as np
 import pytest
 from typing import Type
 
 from fixate.core.checks import *
 from fixate.core.exceptions import CheckFail
 import fixate.config
+import fixate.core.checks
 import fixate.sequencer
 
 fixate.config.RESOURCES["SEQUENCER"] = fixate.sequencer.Sequencer()
@@ -48,6 +50,11 @@ chk_pass_data = [
     (chk_equal, [(1, 2, 3, 4), (1, 2, 3, 4)], {}),
     (chk_equal, [{"a": 1, "b": 2}, {"b": 2, "a": 1}], {}),
     (chk_equal, [2 + 1j, 2 + 1j], {}),
+    (chk_all_in_range, [[1, 2, 3], 0, 4], {}),
+    (chk_all_in_range, [np.linspace(1, 2, 1000), 0.5, 2.5], {}),
+    (chk_all_in_range_equal, [[1, 2, 3], 1, 3], {}),
+    (chk_all_in_range_equal, [[1, 2, 3], [0, 1, 2], [1, 2, 3]], {}),
+    (chk_all_in_mask, [[1, 2, 3], [0, 1, 2], [1, 3, 3]], {}),
     # TODO: find more types that are equated?
 ]
 
@@ -90,6 +97,10 @@ chk_fail_data = [
     (chk_equal, [[1, 2, 3, 4], [1, 2, 3, 4, 5]], {}),
     (chk_equal, [{"a": 1, "b": 2}, {"b": 1, "a": 2}], {}),
     (chk_equal, [2 + 1j, 1 + 1j], {}),
+    (chk_all_in_range, [[1, 2, 3], 1, 4], {}),
+    (chk_all_in_range, [[1, float("nan"), 3], 0, 4], {}),
+    (chk_all_in_range_equal, [[1, 2, 3], 1, 2.9], {}),
+    (chk_all_in_mask, [[1, 2, 3], [0, 1, 2], [1, 1.5, 3]], {}),
 ]
 
 
@@ -124,6 +135,12 @@ chk_ui_string = [
         {"description": "test float", "fmt": ".2f"},
         f"PASS: {123.456:.2f} : test float",
     ),
+    (
+        chk_all_in_range,
+        [[1.0, 1.5, 1.9], 1, 2],
+        {"description": "array"},
+        "FAIL when comparing 3 values all in range 1 - 2 : 1 failed, worst 1 at index 0 : array",
+    ),
 ]
 
 
@@ -135,6 +152,73 @@ def test_checks_formatting(
     assert check(*args, **kwargs) == check_string
 
 
+def test_array_check_stats(monkeypatch):
+    results = []
+
+    def mock_check(self, chkresult: CheckResult):
+        results.append(chkresult)
+        return chkresult.result
+
+    monkeypatch.setattr(fixate.sequencer.Sequencer, "check", mock_check)
+    vals = np.array([[1.0, 4.5], [2.5, -1.0]])
+    assert not chk_all_in_range_equal(vals, 0, 4)
+    result = results[0]
+    assert result.test_val == -1.0
+    assert result.check_params[:2] == [0, 4]
+    assert result.stats.count == 4
+    assert result.stats.fail_count == 2
+    assert result.stats.fail_indices == (1, 3)
+    assert result.stats.worst_index == 3
+    assert result.stats.min_margin == -1.0
+    assert result.stats.mean_margin == pytest.approx((1 - 0.5 + 1.5 - 1) / 4)
+
+
+def test_check_string_is_lazy(monkeypatch):
+    results = []
+
+    def mock_check(self, chkresult: CheckResult):
+        results.append(chkresult)
+        return chkresult.result
+
+    def mock_format(chk):
+        calls.append(chk)
+        return "formatted"
+
+    calls = []
+    monkeypatch.setattr(fixate.sequencer.Sequencer, "check", mock_check)
+    monkeypatch.setattr(fixate.core.checks, "_format_range", mock_format)
+    assert chk_in_range(1, 0, 2)
+    assert calls == []
+    assert results[0].check_string == "formatted"
+    assert results[0].check_string == "formatted"
+    assert len(calls) == 1
+
+
+def test_check_result_check_string_keyword():
+    result = CheckResult(True, "PASS", "description", check_string="check")
+    assert result.check_string == "check"
+
+
+def test_check_attachment_is_copied(monkeypatch):
+    results = []
+
+    def mock_check(self, chkresult: CheckResult):
+        results.append(chkresult)
+        return chkresult.result
+
+    monkeypatch.setattr(fixate.sequencer.Sequencer, "check", mock_check)
+    waveform = np.arange(5.0)
+    assert chk_log_value(1.0, attachment=waveform)
+    assert chk_all_in_range(waveform, -1, 5, attachment=waveform)
+    waveform[0] = 100
+    assert results[0].attachment.tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert results[1].attachment.tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert chk_passes()
+    assert results[2].attachment is None
+    with pytest.raises(ValueError):
+        chk_passes(attachment=[object()])
+
+
 def test_checks_logging():
     """TODO: somehow test checks are logged properly"""
     # NOTE: tiny coverage in test_script2log
@@ -159,7 +243,11 @@ test_raise_data = [
     (chk_in_tolerance_equal, [], {}, TypeError),
     (chk_in_deviation_equal, [], {}, TypeError),
     (chk_equal, [], {}, TypeError),
+    (chk_all_in_range, [], {}, TypeError),
+    (chk_all_in_mask, [], {}, TypeError),
     # Invalid args
+    (chk_all_in_range, [[], 0, 1], {}, ValueError),
+    (chk_all_in_mask, [[1, 2, 3], [0, 1], [2, 3]], {}, ValueError),
     (chk_greater, [1, "test"], {}, TypeError),
     # Format exceptions are swallowed so hard to test
 ]
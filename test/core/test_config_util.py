@@ -1,4 +1,9 @@
+import time
+
 import pytest
+from pyvisa import VisaIOError
+from pyvisa.errors import VI_ERROR_TMO
+
 from fixate.core import config_util
 from fixate import config
 
@@ -135,3 +140,40 @@ def test_do_save_same_path_backup_created(test_app, open_config_file, tmp_path):
     test_app.do_save(tmp_path / "instruments.json")
     # ensure backup file is created
     assert (tmp_path / "instruments.json.bak").exists()
+
+
+def test_test_config_dict_queries_concurrently(test_app, open_config_file, monkeypatch):
+    def slow_id_query(*args):
+        time.sleep(0.2)
+        if args[0] == "ASRL38::INSTR":
+            raise VisaIOError(VI_ERROR_TMO)
+        return {
+            "USB0::0x09C4::0x0400::DG1D144904270::INSTR": "RIGOL TECHNOLOGIES,DG1022 ,DG1D144904270,,00.03.00.09.00.02.11",
+            "USB0::0x0957::0x17A8::MY52160892::INSTR": "OTHER",
+            "COM37": "address: 0,checksum: 28,command: 49,model: 6823,serial_number: 3697210019,software_version: 29440,start: 170,",
+        }[args[0]]
+
+    monkeypatch.setattr(config_util, "visa_id_query", slow_id_query)
+    monkeypatch.setattr(config_util, "serial_id_query", slow_id_query)
+    output = []
+    monkeypatch.setattr(
+        test_app, "poutput", lambda msg="", end="\n": output.append(msg + end)
+    )
+    monkeypatch.setattr(test_app, "pfeedback", lambda msg: None)
+
+    start = time.monotonic()
+    test_app._test_config_dict(test_app.updated_config_dict)
+    assert time.monotonic() - start < 0.6  # Four queries, not one after another
+
+    lines = "".join(output).splitlines()
+    assert "DG1D144904270" in lines[0] and "OK" in lines[0]
+    assert "ASRL38::INSTR" in lines[1] and "Error opening" in lines[1]
+    assert "MY52160892" in lines[2] and "does not match" in lines[2]
+    assert "COM37" in lines[3] and "OK" in lines[3]
+
+
+def test_id_query_all_timeout(monkeypatch):
+    monkeypatch.setattr(config_util, "ID_QUERY_TIMEOUT", 0.1)
+    results = config_util.id_query_all([lambda: time.sleep(0.5), lambda: "ID"])
+    assert isinstance(results[0], TimeoutError)
+    assert results[1] == "ID"
@@ -0,0 +1,133 @@
+import time
+
+import numpy as np
+import pytest
+
+from fixate.core.common import TestClass
+from fixate.reporting import CSVWriter, ReportEvent, ReportingHub
+
+
+def wait_for_lines(path, n, timeout=5):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if path.exists() and len(path.read_text().splitlines()) >= n:
+            return path.read_text().splitlines()
+        time.sleep(0.01)
+    pytest.fail(f"{path} did not reach {n} lines")
+
+
+def event(kind, *values):
+    return ReportEvent(kind, time.perf_counter(), time.time(), values)
+
+
+@pytest.fixture
+def writer(tmp_path):
+    # Note: writer.data is the fixate.config namespace, so use monkeypatch to change settings
+    writer = CSVWriter()
+    writer.csv_path = str(tmp_path / "logs" / "report.csv")
+    writer.start_time = time.perf_counter()
+    yield writer
+    writer.stop()
+
+
+@pytest.fixture
+def hub(writer):
+    hub = ReportingHub([writer])
+    yield hub
+    hub.uninstall()
+
+
+def test_flush_per_line(writer, tmp_path, monkeypatch):
+    monkeypatch.setitem(writer.data, "flush_policy", "line")
+    writer.start()
+    writer._write_line_to_csv(["1", "a"])
+    assert wait_for_lines(tmp_path / "logs" / "report.csv", 1) == ["1,a"]
+    writer._write_line_to_csv(["2", "b,c"])
+    assert wait_for_lines(tmp_path / "logs" / "report.csv", 2) == ["1,a", '2,"b,c"']
+    writer.ensure_alive()
+
+
+def test_flush_per_test(writer, tmp_path, monkeypatch):
+    monkeypatch.setitem(writer.data, "flush_policy", "test")
+    writer.start()
+    writer._write_line_to_csv(["1", "a"])
+    writer.put(event("test_complete", "1", "PASS", 1, 0))
+    assert wait_for_lines(tmp_path / "logs" / "report.csv", 2)[0] == "1,a"
+
+
+def test_flush_interval(writer, tmp_path, monkeypatch):
+    monkeypatch.setitem(writer.data, "flush_policy", "interval")
+    monkeypatch.setitem(writer.data, "flush_interval", 0.05)
+    writer.start()
+    writer._write_line_to_csv(["1", "a"])
+    assert wait_for_lines(tmp_path / "logs" / "report.csv", 1) == ["1,a"]
+
+
+def test_stop_closes_file(writer, tmp_path, monkeypatch):
+    monkeypatch.setitem(writer.data, "flush_policy", "test")
+    monkeypatch.setitem(writer.data, "fsync", True)
+    writer.start()
+    for i in range(100):
+        writer._write_line_to_csv([str(i)])
+    writer.stop()
+    lines = (tmp_path / "logs" / "report.csv").read_text().splitlines()
+    assert lines == [str(i) for i in range(100)]
+
+
+class ParamTest(TestClass):
+    """Param test"""
+
+    def __init__(self, voltage):
+        super().__init__()
+        self.voltage = voltage
+
+
+def test_events_rendered_on_writer_thread(hub, tmp_path):
+    test = ParamTest(5)
+    hub.install()
+    hub.test_start(test, "1")
+    # Parameters are captured when the test starts, not when the row is rendered
+    test.voltage = 6
+    hub.driver_open("DMM", "FLUKE")
+    lines = wait_for_lines(tmp_path / "logs" / "report.csv", 3)
+    assert lines[0].split(",")[1:] == ["Test 1", "start", "Param test", ""]
+    assert lines[1].split(",")[1:] == ["Test 1", "test-parameters", "voltage=5"]
+    assert lines[2].split(",")[1:] == ["DRIVER", "DMM", "FLUKE"]
+    assert CSVWriter.extract_test_parameters(test) == [("voltage", 6)]
+
+
+def test_check_attachment(hub, tmp_path):
+    from fixate.core.checks import CheckResult
+    from fixate.reporting.attachments import AttachmentReader
+
+    hub.install()
+    waveform = np.linspace(0, 1, 1000).reshape(10, 100)
+    for i, attachment in enumerate([waveform, None, np.arange(3, dtype=np.int16)]):
+        chk = CheckResult(
+            True, "PASS", "wave", 1, "log value", check_params=[], attachment=attachment
+        )
+        hub.test_comparison(True, chk, i + 1, "1")
+    lines = wait_for_lines(tmp_path / "logs" / "report.csv", 3)
+    assert lines[0].endswith(",attachment=0")
+    assert "attachment" not in lines[1]
+    assert lines[2].endswith(",attachment=1")
+    hub.uninstall()
+
+    arrays = AttachmentReader(tmp_path / "logs" / "report.csv")
+    assert list(arrays) == ["0", "1"]
+    assert np.array_equal(arrays["0"], waveform)
+    assert arrays["1"].dtype == np.int16
+    assert arrays["1"].tolist() == [0, 1, 2]
+
+
+def test_metrics(writer, tmp_path):
+    writer.start()
+    for i in range(10):
+        writer._write_line_to_csv([str(i), "é"])
+    wait_for_lines(tmp_path / "logs" / "report.csv", 10)
+    writer.stop()
+    metrics = writer.metrics()
+    assert metrics.events_written == 10
+    assert metrics.bytes_written == (tmp_path / "logs" / "report.csv").stat().st_size
+    assert metrics.max_latency > 0
+    assert metrics.queue_depth == 0
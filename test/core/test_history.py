@@ -0,0 +1,79 @@
+import csv
+
+from fixate.core.common import TestClass, TestList
+from fixate.reporting.history import TestHistory
+
+
+class IndependentTest(TestClass):
+    order_independent = True
+
+    def __init__(self, desc):
+        self.test_desc = desc
+        super().__init__()
+
+
+class DependentTest(TestClass):
+    def __init__(self, desc):
+        self.test_desc = desc
+        super().__init__()
+
+
+def write_report(path, results):
+    rows = [["0", "Sequence", "started=20260101-000000"]]
+    elapsed = 0.0
+    for index, (desc, status, duration) in enumerate(results, start=1):
+        rows.append([f"{elapsed:.2f}", f"Test {index}", "start", desc, ""])
+        elapsed += duration
+        rows.append([f"{elapsed:.2f}", f"Test {index}", "end", status])
+    with open(path, "w", newline="") as f:
+        csv.writer(f).writerows(rows)
+
+
+def test_history_from_csv_reports(tmp_path):
+    write_report(tmp_path / "1.csv", [("a", "PASS", 1.0), ("b", "FAIL", 2.0)])
+    write_report(tmp_path / "2.csv", [("a", "PASS", 3.0), ("b", "SKIP", 0.0)])
+
+    history = TestHistory.load(tmp_path)
+
+    assert history.get("a").runs == 2
+    assert history.get("a").fails == 0
+    assert history.get("a").mean_duration == 2.0
+    assert history.get("b").runs == 1
+    assert history.get("b").fails == 1
+
+
+def test_history_save_load(tmp_path):
+    history = TestHistory()
+    history.add_result("a", "FAIL", 1.5)
+    history.save(tmp_path / "history.json")
+
+    loaded = TestHistory.load(tmp_path / "history.json")
+    assert loaded.stats == history.stats
+
+
+def test_reorder_only_moves_independent_tests():
+    history = TestHistory()
+    for _ in range(10):
+        history.add_result("slow_reliable", "PASS", 10.0)
+        history.add_result("fast_flaky", "FAIL", 1.0)
+        history.add_result("fixed", "FAIL", 0.1)
+
+    nested = TestList([IndependentTest("slow_reliable"), IndependentTest("fast_flaky")])
+    tests = TestList(
+        [
+            IndependentTest("unknown"),
+            DependentTest("fixed"),
+            IndependentTest("slow_reliable"),
+            nested,
+            IndependentTest("fast_flaky"),
+        ]
+    )
+    history.reorder(tests)
+
+    assert [t.test_desc for t in tests if isinstance(t, TestClass)] == [
+        "fast_flaky",
+        "fixed",
+        "slow_reliable",
+        "unknown",
+    ]
+    assert [t.test_desc for t in nested] == ["fast_flaky", "slow_reliable"]
@@ -0,0 +1,158 @@
+import threading
+import time
+
+import pytest
+from pubsub import pub
+
+from fixate.reporting import ReportingHub, Sink
+
+
+class ListSink(Sink):
+    def __init__(self, name, fails=False, **data):
+        super().__init__(data)
+        self.name = name
+        self.fails = fails
+        self.events = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def handle(self, event):
+        self.release.wait(5)
+        if self.fails and event.kind == "fail":
+            raise ValueError("sink failed")
+        self.events.append(event)
+
+
+def wait_for(condition, timeout=5):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if condition():
+            return
+        time.sleep(0.01)
+    pytest.fail("Timed out")
+
+
+@pytest.fixture
+def ui_messages():
+    messages = []
+
+    def display(msg, **kwargs):
+        messages.append(msg)
+
+    pub.subscribe(display, "UI_display_important")
+    yield messages
+    pub.unsubscribe(display, "UI_display_important")
+
+
+def test_events_captured_once():
+    sinks = [ListSink("a"), ListSink("b")]
+    hub = ReportingHub(sinks)
+    hub.install()
+    hub.driver_open("DMM", "FLUKE")
+    hub.uninstall()
+    assert sinks[0].events == sinks[1].events
+    assert sinks[0].events[0] is sinks[1].events[0]
+    assert sinks[0].events[0].values == ("DMM", "FLUKE")
+
+
+def test_slow_sink_isolated():
+    slow = ListSink("slow", queue_size=2, backpressure="spill")
+    fast = ListSink("fast")
+    slow.release.clear()
+    hub = ReportingHub([slow, fast])
+    hub.install()
+    try:
+        for i in range(50):
+            hub.publish("line", i)
+        wait_for(lambda: len(fast.events) == 50)
+        assert slow.metrics().spilled > 0
+        assert slow.metrics().queue_depth >= 47
+    finally:
+        slow.release.set()
+        hub.uninstall()
+    # Spilled events are written in order
+    assert [e.values for e in slow.events] == [(i,) for i in range(50)]
+
+
+def test_lag_warning(ui_messages):
+    sink = ListSink("slow", lag_warning=0.05)
+    sink.release.clear()
+    hub = ReportingHub([sink])
+    hub.install()
+    try:
+        hub.publish("line", 1)
+        time.sleep(0.2)
+        hub.publish("line", 2)
+        hub.publish("line", 3)
+        assert sink.metrics().lag > 0.05
+    finally:
+        sink.release.set()
+        hub.uninstall()
+    assert len(ui_messages) == 1
+    assert "Reporting to slow is" in ui_messages[0]
+
+
+def test_required_sink_failure():
+    failing = ListSink("failing", fails=True)
+    other = ListSink("other")
+    hub = ReportingHub([failing, other])
+    hub.install()
+    try:
+        hub.publish("fail")
+        hub.publish("line", 1)
+        wait_for(lambda: len(other.events) == 2)
+        wait_for(lambda: failing.exception is not None)
+        with pytest.raises(RuntimeError, match="Exception in failing thread"):
+            hub.ensure_alive()
+    finally:
+        hub.uninstall()
+    # The failing sink carries on with the next events
+    assert [e.kind for e in failing.events] == ["line"]
+
+
+def test_optional_sink_detached(ui_messages):
+    failing = ListSink("failing", fails=True, required=False)
+    other = ListSink("other")
+    hub = ReportingHub([failing, other])
+    hub.install()
+    try:
+        hub.publish("fail")
+        wait_for(lambda: failing.exception is not None)
+        hub.ensure_alive()
+        hub.publish("line", 1)
+        wait_for(lambda: len(other.events) == 2)
+    finally:
+        hub.uninstall()
+    assert [e.kind for e in failing.events] == []
+    assert ui_messages == ["Reporting to failing stopped: sink failed"]
+
+
+class StartFailsSink(ListSink):
+    def start(self):
+        raise OSError("address in use")
+
+
+def test_required_sink_start_failure():
+    started = ListSink("started")
+    failing = StartFailsSink("failing")
+    hub = ReportingHub([started, failing])
+    with pytest.raises(OSError):
+        hub.install()
+    # The sink that had already started doesn't keep its writer thread
+    assert started.thread is None
+    hub.publish("line", 1)
+    assert started.events == []
+
+
+def test_optional_sink_start_failure(ui_messages):
+    failing = StartFailsSink("failing", required=False)
+    other = ListSink("other")
+    hub = ReportingHub([failing, other])
+    hub.install()
+    try:
+        hub.ensure_alive()
+        hub.publish("line", 1)
+        wait_for(lambda: len(other.events) == 1)
+    finally:
+        hub.uninstall()
+    assert ui_messages == ["Reporting to failing not started: address in use"]
@@ -0,0 +1,76 @@
+"""
+Startup cost of fixate. Heavy dependencies must only be imported when used, so
+``python -m fixate`` and test scripts start quickly. The checks look at which modules
+were imported rather than timing them, see benchmarks/bench_import_time.py for the times.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+# Modules that aren't needed until a check, instrument or the GUI is used
+HEAVY = ("numpy", "pyvisa", "serial", "PyQt5", "asyncio", "ruamel.yaml")
+
+
+def imported_modules(code: str) -> set:
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"{code}\nimport sys\nprint('\\n'.join(sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(result.stdout.split())
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "import fixate",
+        "import fixate.main",
+        "from fixate.drivers import daq, dcload, dmm, dso, funcgen, lcr, pps",
+    ],
+)
+def test_heavy_modules_not_imported(code):
+    modules = imported_modules(code)
+    assert not modules & set(HEAVY)
+
+
+def test_import_fixate_defers_main():
+    modules = imported_modules("import fixate")
+    assert not {"fixate.main", "fixate.sequencer", "fixate._ui"} & modules
+
+
+def test_lazy_attributes():
+    # In a new interpreter, as importing fixate.main checks whether stdin is a console,
+    # which fails on the stdin pytest captures
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            """
+import fixate
+import fixate._ui
+import fixate.main
+from fixate.drivers import dmm
+from fixate.drivers.dmm.fluke_8846a import Fluke8846A
+
+assert fixate.run is fixate.main.run_main_program
+assert fixate.user_ok is fixate._ui.user_ok
+assert "VirtualMux" in dir(fixate)
+assert dmm.Fluke8846A is Fluke8846A
+try:
+    fixate.not_an_attribute
+except AttributeError:
+    pass
+else:
+    raise AssertionError("fixate.not_an_attribute")
+""",
+        ],
+        stdin=subprocess.DEVNULL,
+        check=True,
+    )
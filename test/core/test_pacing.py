@@ -0,0 +1,467 @@
+import time
+
+import pytest
+from pyvisa import VisaIOError
+from pyvisa.errors import VI_ERROR_TMO
+
+import fixate.config
+import fixate.core.timing
+from fixate.core.exceptions import InstrumentError, InstrumentTimeOut
+from fixate.drivers.pacing import (
+    Pacer,
+    FixedDelay,
+    OpcSync,
+    StatusPoll,
+    LearnedDelay,
+    strategy_from_name,
+    compound_commands,
+)
+
+
+class FakeInstrument:
+    def __init__(self, polls_until_complete=0):
+        self.log = []
+        self.errors = []
+        self.polls_until_complete = polls_until_complete
+        self.fail_next_write = False
+
+    def write(self, command):
+        if self.fail_next_write:
+            self.fail_next_write = False
+            raise VisaIOError(VI_ERROR_TMO)
+        self.log.append(("write", command))
+
+    def query(self, command):
+        self.log.append(("query", command))
+        return "1"
+
+    def check_errors(self):
+        """Like a driver's error check, raising for errors in the error queue"""
+        self.log.append(("check", None))
+        errors, self.errors = self.errors, []
+        if errors:
+            raise InstrumentError("Error(s) Returned\n" + "\n".join(errors))
+
+    def read_stb(self):
+        self.log.append(("stb", None))
+        if self.polls_until_complete:
+            self.polls_until_complete -= 1
+            return 0
+        return StatusPoll.ESB
+
+
+def test_fixed_delay_counts_waits():
+    pacer = Pacer(FakeInstrument(), FixedDelay(0.001, 0.0001))
+    pacer.write("VOLT 5")
+    pacer.write("volt 6")
+    pacer.write("OUTP ON")
+
+    volt = pacer.stats["VOLT"]
+    assert volt.count == 2
+    assert volt.baseline == pytest.approx(2 * (0.001 + 6 * 0.0001))
+    assert volt.waited >= volt.baseline * 0.9
+    assert pacer.stats["OUTP"].count == 1
+
+
+def test_opc_sync_queries_after_writes_but_not_queries():
+    instrument = FakeInstrument()
+    pacer = Pacer(instrument, OpcSync())
+    pacer.write("VOLT 5")
+    pacer.write("FETC?")
+    assert instrument.log == [
+        ("write", "VOLT 5"),
+        ("query", "*OPC?"),
+        ("write", "FETC?"),
+    ]
+
+
+def test_status_poll_waits_for_event_status_bit():
+    instrument = FakeInstrument(polls_until_complete=2)
+    pacer = Pacer(instrument, StatusPoll(interval=0))
+    pacer.write("VOLT 5")
+    assert instrument.log == [
+        ("write", "VOLT 5"),
+        ("write", "*ESE 1"),
+        ("write", "*OPC"),
+        ("stb", None),
+        ("stb", None),
+        ("stb", None),
+        ("query", "*ESR?"),
+    ]
+
+
+def test_status_poll_timeout_is_an_error():
+    instrument = FakeInstrument(polls_until_complete=10**9)
+    pacer = Pacer(instrument, StatusPoll(interval=0.001, timeout=0.01))
+    with pytest.raises(InstrumentTimeOut):
+        pacer.write("VOLT 5")
+    assert pacer.stats["VOLT"].errors == 1
+
+
+def test_learned_delay_decreases_and_backs_off():
+    strategy = LearnedDelay(0.01, minimum=0.001, decrease=0.5, increase=2, streak=2)
+    instrument = FakeInstrument()
+    pacer = Pacer(instrument, FixedDelay(0.01))
+    pacer.strategy = strategy
+
+    for _ in range(5):
+        pacer.write("VOLT 5")
+    # Four writes confirmed, the last is pending until the next write
+    assert strategy.delays["VOLT"] == pytest.approx(0.0025)
+
+    pacer.error()  # e.g. SYST:ERR? reported an error after the last write
+    assert strategy.delays["VOLT"] == pytest.approx(0.005)
+    assert pacer.stats["VOLT"].errors == 1
+
+    instrument.fail_next_write = True
+    with pytest.raises(VisaIOError):
+        pacer.write("VOLT 5")
+    assert strategy.delays["VOLT"] == pytest.approx(0.01)  # Limited to the tuned delay
+
+    # Other commands are learned separately
+    assert strategy.delay_for("OUTP", "OUTP ON") == 0.01
+
+
+def test_learned_delay_saves_time():
+    pacer = Pacer(FakeInstrument(), FixedDelay(0.005))
+    pacer.strategy = LearnedDelay(0.005, decrease=0.1, streak=1)
+    for _ in range(10):
+        pacer.write("VOLT 5")
+    stats = pacer.stats["VOLT"]
+    assert stats.saved > 0.03
+    assert "VOLT" in pacer.summary()
+
+
+def test_strategy_from_config(monkeypatch):
+    monkeypatch.setattr(fixate.config, "visa_pacing", {"Fake": "learned"})
+    default = FixedDelay(0.1, 1 / 6000)
+    pacer = Pacer(FakeInstrument(), default, "Fake")
+    assert isinstance(pacer.strategy, LearnedDelay)
+    assert pacer.strategy.delay == 0.1
+    assert pacer.baseline is default
+
+    assert Pacer(FakeInstrument(), default, "Other").strategy is default
+    with pytest.raises(ValueError):
+        strategy_from_name("fastest", default)
+
+
+def test_compound_commands_respect_max_length():
+    commands = [
+        ("*RST", 0),
+        ("SYST:REM", 0),
+        ("*CLS", 0.1),
+        ("DISP ON", 0),
+        ("VOLT 5", 0),
+    ]
+    assert list(compound_commands(commands, 26)) == [
+        ("*RST;:SYST:REM;*CLS", 0.1, ["*RST", "SYST:REM", "*CLS"]),
+        ("DISP ON;:VOLT 5", 0, ["DISP ON", "VOLT 5"]),
+    ]
+    # Too long for any message, sent on its own
+    assert [m for m, _, _ in compound_commands([("DATA 1,2,3,4", 0)], 4)] == [
+        "DATA 1,2,3,4"
+    ]
+    # Instruments without compound commands
+    assert len(list(compound_commands(commands, 0))) == 5
+
+
+def test_batch_coalesces_writes_and_checks_once():
+    instrument = FakeInstrument()
+    pacer = Pacer(instrument, FixedDelay(0.001), max_message=100)
+    pacer.check = lambda: instrument.log.append(("check", None))
+    with pacer.batch():
+        pacer.write("VOLT 5")
+        pacer.checkpoint()
+        with pacer.batch():
+            pacer.write("OUTP ON")
+            pacer.checkpoint()
+        assert instrument.log == []
+    assert instrument.log == [("write", "VOLT 5;:OUTP ON"), ("check", None)]
+    # Baseline is the fixed delay for each command sent on its own
+    assert pacer.stats["VOLT"].baseline == pytest.approx(0.002)
+
+
+def test_query_in_batch_sends_queued_writes_first():
+    instrument = FakeInstrument()
+    pacer = Pacer(instrument, FixedDelay(0), max_message=100)
+    with pacer.batch():
+        pacer.write("VOLT 5")
+        pacer.query("VOLT?")
+        pacer.write("OUTP ON")
+    assert instrument.log == [
+        ("write", "VOLT 5"),
+        ("query", "VOLT?"),
+        ("write", "OUTP ON"),
+    ]
+
+
+def test_batch_discards_writes_on_exception():
+    instrument = FakeInstrument()
+    pacer = Pacer(instrument, FixedDelay(0), max_message=100)
+    with pytest.raises(ZeroDivisionError):
+        with pacer.batch():
+            pacer.write("VOLT 5")
+            1 / 0
+    assert instrument.log == []
+    assert not pacer.batching
+
+
+def test_immediate_error_check_runs_at_each_checkpoint():
+    instrument = FakeInstrument()
+    pacer = Pacer(instrument, FixedDelay(0), check=instrument.check_errors)
+    pacer.write("VOLT 5")
+    pacer.checkpoint()
+    pacer.checkpoint()  # Nothing sent since the last check
+    pacer.write("VOLT 6")
+    pacer.checkpoint()
+    assert [entry[0] for entry in instrument.log] == [
+        "write",
+        "check",
+        "write",
+        "check",
+    ]
+
+
+def test_deferred_error_check_runs_before_next_query(monkeypatch):
+    monkeypatch.setattr(fixate.config, "visa_error_check", {"Fake": "deferred"})
+    instrument = FakeInstrument()
+    pacer = Pacer(instrument, FixedDelay(0), "Fake", check=instrument.check_errors)
+    pacer.write("VOLT 5")
+    pacer.checkpoint()
+    pacer.write("CURR 9")
+    pacer.checkpoint()
+    instrument.errors.append("-222,Data out of range")
+    assert ("check", None) not in instrument.log
+
+    with pytest.raises(InstrumentError) as excinfo:
+        pacer.query("MEAS?")
+    # The error is reported with the commands that could have caused it
+    message = str(excinfo.value)
+    assert "-222" in message
+    assert "  VOLT 5\n  CURR 9" in message
+    assert instrument.log[-1] == ("check", None)
+
+    # The window starts again after a check
+    pacer.query("MEAS?")
+    with pytest.raises(InstrumentError) as excinfo:
+        instrument.errors.append("-113,Undefined header")
+        pacer.write("BAD")
+        pacer.sync()
+    assert "VOLT 5" not in str(excinfo.value)
+    assert "  MEAS?\n  BAD" in str(excinfo.value)
+
+
+def test_sync_error_check_only_at_sync(monkeypatch):
+    monkeypatch.setattr(fixate.config, "visa_error_check", {"Fake": "sync"})
+    instrument = FakeInstrument()
+    pacer = Pacer(
+        instrument, FixedDelay(0), "Fake", check=instrument.check_errors, history_size=2
+    )
+    for volts in range(5):
+        pacer.write(f"VOLT {volts}")
+        pacer.checkpoint()
+        pacer.query("MEAS?")
+    assert ("check", None) not in instrument.log
+    instrument.errors.append("-222,Data out of range")
+    with pytest.raises(InstrumentError) as excinfo:
+        pacer.sync()
+    assert "... 8 earlier commands\n  VOLT 4\n  MEAS?" in str(excinfo.value)
+
+
+def test_error_check_backs_off_learned_delays():
+    instrument = FakeInstrument()
+    pacer = Pacer(instrument, FixedDelay(0.04))
+    strategy = pacer.strategy = LearnedDelay(0.04, decrease=0.5, streak=1)
+
+    def check():
+        if instrument.errors:
+            pacer.error()  # As a driver's error check does
+        instrument.check_errors()
+
+    pacer.check = check
+    for _ in range(3):
+        pacer.write("VOLT 5")
+    pacer.write("OUTP ON")  # Confirms the third VOLT
+    assert strategy.delays["VOLT"] == pytest.approx(0.005)
+    pacer.sync()
+    with pytest.raises(InstrumentError):
+        with pacer.batch():
+            pacer.write("VOLT 6")  # Confirms OUTP
+            pacer.write("CURR 1")  # Confirms VOLT, 0.0025
+            pacer.checkpoint()
+            instrument.errors.append("-222,Data out of range")
+    # Both commands since the last check back off, the earlier command doesn't
+    assert strategy.delays["VOLT"] == pytest.approx(0.005)
+    assert strategy.delays["CURR"] == pytest.approx(0.04)
+    assert strategy.delays["OUTP"] == pytest.approx(0.02)
+
+
+def test_unknown_error_check(monkeypatch):
+    monkeypatch.setattr(fixate.config, "visa_error_check", {"Fake": "never"})
+    with pytest.raises(ValueError):
+        Pacer(FakeInstrument(), FixedDelay(0), "Fake")
+
+
+def test_state_cache_disabled_by_default():
+    instrument = FakeInstrument()
+    pacer = Pacer(instrument, FixedDelay(0), "Fake")
+    pacer.write("VOLT 5", cache=True)
+    pacer.write("VOLT 5", cache=True)
+    assert len(instrument.log) == 2
+
+
+def test_state_cache_skips_unchanged_settings(monkeypatch):
+    monkeypatch.setattr(fixate.config, "visa_state_cache", {"Fake": None})
+    instrument = FakeInstrument()
+    pacer = Pacer(instrument, FixedDelay(0.001), "Fake", resets=("CONF",))
+
+    def written():
+        sent = [command for kind, command in instrument.log if kind == "write"]
+        instrument.log.clear()
+        return sent
+
+    pacer.write("CONF:VOLT:DC 10", cache=True)
+    pacer.write("VOLT:DC:NPLC 1", cache=True)
+    pacer.write("CONF:VOLT:DC 10", cache=True)
+    pacer.write(":VOLT:DC:NPLC 1", cache=False)  # Not a setting, but writes it
+    pacer.write("VOLT:DC:NPLC 1", cache=True)
+    assert written() == [
+        "CONF:VOLT:DC 10",
+        "VOLT:DC:NPLC 1",
+        ":VOLT:DC:NPLC 1",
+        "VOLT:DC:NPLC 1",
+    ]
+    assert pacer.stats["CONF:VOLT:DC"].elided == 1
+    assert pacer.stats["CONF:VOLT:DC"].baseline == pytest.approx(0.002)
+
+    # Configuring another measurement resets the NPLC on the instrument
+    pacer.write("CONF:RES", cache=True)
+    pacer.write("CONF:VOLT:DC 10", cache=True)
+    pacer.write("VOLT:DC:NPLC 1", cache=True)
+    assert written() == ["CONF:RES", "CONF:VOLT:DC 10", "VOLT:DC:NPLC 1"]
+
+    for command in ("*RST", "SYSTem:LOCal"):
+        pacer.write(command)
+        pacer.write("CONF:VOLT:DC 10", cache=True)
+        assert written() == [command, "CONF:VOLT:DC 10"]
+
+    # Queries don't change settings
+    pacer.query("VOLT:DC:NPLC?")
+    pacer.write("CONF:VOLT:DC 10", cache=True)
+    assert written() == []
+
+    pacer.error()
+    pacer.write("CONF:VOLT:DC 10", cache=True)
+    assert written() == ["CONF:VOLT:DC 10"]
+
+
+def test_state_cache_cleared_by_multi_line_write(monkeypatch):
+    monkeypatch.setattr(fixate.config, "visa_state_cache", {"Fake": None})
+    instrument = FakeInstrument()
+    pacer = Pacer(instrument, FixedDelay(0), "Fake")
+    pacer.write("VOLT 5", cache=True)
+    pacer.write("VOLT:UNIT VPP\r\nVOLT 6", cache=True)
+    pacer.write("VOLT 5", cache=True)
+    writes = [command for kind, command in instrument.log if kind == "write"]
+    assert writes == ["VOLT 5", "VOLT:UNIT VPP\r\nVOLT 6", "VOLT 5"]
+
+
+def test_state_cache_cleared_by_failures(monkeypatch):
+    monkeypatch.setattr(fixate.config, "visa_state_cache", {"Fake": None})
+    instrument = FakeInstrument()
+    pacer = Pacer(instrument, FixedDelay(0), "Fake", check=instrument.check_errors)
+    pacer.write("VOLT 5", cache=True)
+    instrument.fail_next_write = True
+    with pytest.raises(VisaIOError):
+        pacer.write("CURR 1", cache=True)
+    assert pacer.state == {}
+
+    pacer.write("VOLT 5", cache=True)
+    instrument.errors.append("-222,Data out of range")
+    with pytest.raises(InstrumentError):
+        pacer.checkpoint()
+    assert pacer.state == {}
+
+    with pytest.raises(ZeroDivisionError):
+        with pacer.batch():
+            pacer.write("VOLT 5", cache=True)
+            1 / 0
+    assert pacer.state == {}
+
+
+def test_state_cache_refresh(monkeypatch):
+    monkeypatch.setattr(fixate.config, "visa_state_cache", {"Fake": 0.05})
+    instrument = FakeInstrument()
+    pacer = Pacer(instrument, FixedDelay(0), "Fake")
+    pacer.write("VOLT 5", cache=True)
+    pacer.write("VOLT 5", cache=True)
+    assert len(instrument.log) == 1
+    time.sleep(0.06)
+    pacer.write("VOLT 5", cache=True)
+    assert len(instrument.log) == 2
+
+
+class SiglentInstrument(FakeInstrument):
+    def query(self, command):
+        self.log.append(("query", command))
+        return "0 No Error"
+
+
+def test_spd3303x_caches_setpoints_but_not_outputs(monkeypatch):
+    from fixate.drivers.pps.siglent_spd_3303X import SPD3303X
+
+    monkeypatch.setattr(fixate.config, "visa_state_cache", {"SPD3303X": None})
+    monkeypatch.setattr(fixate.core.timing, "wait", lambda seconds: None)
+    instrument = SiglentInstrument()
+    pps = SPD3303X(instrument)
+    pps.channel1.voltage(5)
+    pps.channel1.voltage(5)
+    # Turned off by the instrument, e.g. by OCP, so turning it on again must be sent
+    pps.channel1(True)
+    pps.channel1(True)
+    writes = [command for kind, command in instrument.log if kind == "write"]
+    assert writes.count("CH1:VOLT 5") == 1
+    assert writes.count("OUTPut CH1,ON") == 2
+
+
+class FlukeInstrument(FakeInstrument):
+    def query(self, command):
+        self.log.append(("query", command))
+        if command == "SYST:ERR?":
+            return self.errors.pop(0) if self.errors else '+0,"No error"'
+        return "1"
+
+
+def test_fluke_writes_separately_outside_batch(monkeypatch):
+    from fixate.drivers.dmm.fluke_8846a import Fluke8846A
+
+    monkeypatch.setattr(fixate.core.timing, "wait", lambda seconds: None)
+    instrument = FlukeInstrument()
+    dmm = Fluke8846A(instrument)
+    writes = [command for kind, command in instrument.log if kind == "write"]
+    assert writes == ["*rst", "SYST:REM", "*cls", "disp on"]
+
+    instrument.log.clear()
+    with dmm.batch():
+        dmm._write(["SAMP:COUN 1", "CALC:STAT OFF"])
+    assert instrument.log[0] == ("write", "SAMP:COUN 1;:CALC:STAT OFF")
+
+
+def test_fluke_reset_clears_errors_with_deferred_check(monkeypatch):
+    from fixate.drivers.dmm.fluke_8846a import Fluke8846A
+
+    monkeypatch.setattr(fixate.config, "visa_error_check", {"Fluke8846A": "deferred"})
+    monkeypatch.setattr(fixate.core.timing, "wait", lambda seconds: None)
+    instrument = FlukeInstrument()
+    dmm = Fluke8846A(instrument)
+    dmm._write("VOLT:DC:RANG 1000")
+    instrument.errors[:] = ['-222,"Data out of range"', '-113,"Undefined header"']
+    dmm.reset()
+    assert instrument.errors == []
+    dmm.sync()
+
+    # Errors after the reset are still reported
+    dmm._write("BAD")
+    instrument.errors.append('-113,"Undefined header"')
+    with pytest.raises(InstrumentError, match="-113"):
+        dmm.sync()
@@ -0,0 +1,45 @@
+import os
+import shutil
+
+import pytest
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+from fixate.reporting.parquet import export
+
+expect_logs = os.path.join(os.path.dirname(__file__), "expect-logs")
+
+
+def test_export_incremental(tmp_path):
+    csv_dir = tmp_path / "csv"
+    csv_dir.mkdir()
+    for name in ["basicpass.csv", "basicfail.csv"]:
+        shutil.copy(os.path.join(expect_logs, name), csv_dir)
+    out_dir = tmp_path / "parquet"
+
+    written = export(csv_dir, out_dir, processes=2)
+    assert sorted(written) == [
+        "date=2018-10-09/basicpass.parquet",
+        "date=2018-10-10/basicfail.parquet",
+    ]
+    table = pq.read_table(out_dir / "date=2018-10-10" / "basicfail.parquet")
+    assert table.column("status").to_pylist() == ["FAIL"]
+    assert table.column("test_index").to_pylist() == ["1"]
+    assert table.column("test_val_text").to_pylist() == ["False"]
+    assert table.column("test_val").to_pylist() == [None]
+
+    # Nothing new to convert
+    assert export(csv_dir, out_dir, processes=2) == []
+
+    (csv_dir / "range.csv").write_text(
+        "0,Sequence,started=20260101-120000,serial_number=123\n"
+        "0.00,Test 1,start,Test,\n"
+        "0.01,Test 1,check1,in tolerance,volts,PASS,1.01,1,5\n"
+        "0.03,Test 1,end,PASS,checks-passed=1,checks-failed=0\n"
+        "0.04,Sequence,ended=20260101-120001,Finished,tests-passed=1,sequence=PASSED\n"
+    )
+    assert export(csv_dir, out_dir, processes=2) == ["date=2026-01-01/range.parquet"]
+    row = pq.read_table(out_dir / "date=2026-01-01" / "range.parquet").to_pylist()[0]
+    assert row["serial_number"] == "123"
+    assert row["test_val"] == 1.01
+    assert (row["nominal"], row["tol"], row["min"]) == (1.0, 5.0, None)
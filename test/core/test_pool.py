@@ -0,0 +1,193 @@
+import time
+
+import pytest
+from pyvisa import VisaIOError
+from pyvisa.errors import VI_ERROR_RSRC_NFOUND, VI_ERROR_TMO
+
+import fixate.config
+from fixate.drivers import (
+    InstrumentNotFoundError,
+    InstrumentOpenError,
+    open_all,
+    pool,
+)
+
+
+class FakeResource:
+    def __init__(self, address):
+        self.address = address
+        self.timeout = 2000
+        self.alive = True
+        self.closed = False
+        self.queries = []
+
+    def query(self, command):
+        self.queries.append((command, self.timeout))
+        if not self.alive:
+            raise VisaIOError(VI_ERROR_TMO)
+        return "FAKE,1234"
+
+    def close(self):
+        self.closed = True
+
+
+class FakeResourceManager:
+    def __init__(self):
+        self.opened = []
+
+    def open_resource(self, address):
+        if address == "missing":
+            raise VisaIOError(VI_ERROR_RSRC_NFOUND)
+        resource = FakeResource(address)
+        self.opened.append(resource)
+        return resource
+
+
+class FakeDriver:
+    def __init__(self, instrument):
+        self.instrument = instrument
+        self.setting = None
+
+    def get_identity(self):
+        return "FAKE,1234"
+
+
+@pytest.fixture
+def rm(monkeypatch):
+    rm = FakeResourceManager()
+    monkeypatch.setattr(pool, "_resource_manager", rm)
+    monkeypatch.setattr(pool, "_drivers", {})
+    monkeypatch.setattr(fixate.config, "visa_session_pool", True)
+    return rm
+
+
+def test_reopen_reuses_live_session(rm):
+    first = pool.open_driver(FakeDriver, "addr", "DMM")
+    first.setting = "VOLT:DC"
+    second = pool.open_driver(FakeDriver, "addr", "DMM")
+    assert second is first
+    assert second.setting == "VOLT:DC"
+    assert len(rm.opened) == 1
+    # Probed on the short timeout, then the driver's timeout is restored
+    assert rm.opened[0].queries == [("*IDN?", pool.PROBE_TIMEOUT)]
+    assert rm.opened[0].timeout == 2000
+
+
+def test_broken_session_is_reopened(rm):
+    first = pool.open_driver(FakeDriver, "addr", "DMM")
+    first.instrument.alive = False
+    second = pool.open_driver(FakeDriver, "addr", "DMM")
+    assert second is not first
+    assert first.instrument.closed
+    assert len(rm.opened) == 2
+
+
+def test_pool_keyed_by_class_and_address(rm):
+    class OtherDriver(FakeDriver):
+        pass
+
+    a = pool.open_driver(FakeDriver, "addr", "DMM")
+    b = pool.open_driver(FakeDriver, "other", "DMM")
+    c = pool.open_driver(OtherDriver, "addr", "DMM")
+    assert len({id(a), id(b), id(c)}) == 3
+
+
+def test_pool_disabled_by_default(monkeypatch):
+    # Each unit gets a newly constructed, so reset, driver unless the pool is enabled
+    rm = FakeResourceManager()
+    monkeypatch.setattr(pool, "_resource_manager", rm)
+    monkeypatch.setattr(pool, "_drivers", {})
+    first = pool.open_driver(FakeDriver, "addr", "DMM")
+    second = pool.open_driver(FakeDriver, "addr", "DMM")
+    assert second is not first
+    assert len(rm.opened) == 2
+
+
+def test_open_error(rm):
+    with pytest.raises(InstrumentOpenError, match="Unable to open PPS: missing"):
+        pool.open_driver(FakeDriver, "missing", "PPS")
+
+
+def test_close_all(rm):
+    driver = pool.open_driver(FakeDriver, "addr", "DMM")
+    pool.close_all()
+    assert driver.instrument.closed
+    assert pool.open_driver(FakeDriver, "addr", "DMM") is not driver
+
+
+def test_lazy_driver_opens_on_first_use(rm):
+    lazy = pool.LazyDriver(lambda: pool.open_driver(FakeDriver, "addr", "DMM"))
+    assert not lazy.opened
+    assert rm.opened == []
+    lazy.setting = "RES"
+    assert lazy.opened
+    assert lazy.setting == "RES"
+    assert len(rm.opened) == 1
+    assert lazy.open() is pool.open_driver(FakeDriver, "addr", "DMM")
+
+
+def test_open_all_opens_concurrently():
+    def opener(name):
+        def open():
+            time.sleep(0.2)
+            return name
+
+        return open
+
+    start = time.monotonic()
+    dm = open_all({name: opener(name) for name in ("dmm", "funcgen", "pps", "dso")})
+    assert time.monotonic() - start < 0.6
+    assert dm.dmm == "dmm"
+    assert dm.dso == "dso"
+
+
+def test_open_all_reports_every_failure():
+    def fail():
+        raise InstrumentNotFoundError
+
+    with pytest.raises(InstrumentOpenError) as exc_info:
+        open_all(
+            {"dmm": fail, "funcgen": lambda: time.sleep(1), "pps": lambda: "pps"},
+            timeout={"funcgen": 0.1},
+        )
+    message = str(exc_info.value)
+    assert "dmm: InstrumentNotFoundError()" in message
+    assert "funcgen: timed out after 0.1 s" in message
+    assert "pps" not in message
+    assert isinstance(exc_info.value.__cause__, InstrumentNotFoundError)
+
+
+class ClosableDriver:
+    def __init__(self, delay=0.0):
+        time.sleep(delay)
+        self.closed = False
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.closed = True
+
+
+def test_open_all_closes_drivers_on_failure():
+    opened = []
+
+    def opener(delay=0.0):
+        def open():
+            driver = ClosableDriver(delay)
+            opened.append(driver)
+            return driver
+
+        return open
+
+    def fail():
+        raise InstrumentNotFoundError
+
+    with pytest.raises(InstrumentOpenError):
+        open_all(
+            {"dmm": opener(), "funcgen": opener(0.3), "pps": fail},
+            timeout={"funcgen": 0.1},
+        )
+    assert len(opened) == 1 and opened[0].closed
+    # The instrument that timed out is closed once it has opened
+    end = time.monotonic() + 5
+    while not (len(opened) == 2 and opened[1].closed) and time.monotonic() < end:
+        time.sleep(0.01)
+    assert len(opened) == 2 and opened[1].closed
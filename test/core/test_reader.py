@@ -0,0 +1,53 @@
+import os.path
+
+from fixate.reporting.reader import read_report, read_header_footer
+
+expect_logs = os.path.join(os.path.dirname(__file__), "expect-logs")
+
+
+def test_read_report():
+    report = read_report(os.path.join(expect_logs, "basichierachy-test_test-None.csv"))
+    assert report.complete
+    assert report.status == "FAILED"
+    assert report.header["test-script-name"] == "basichierachy"
+    assert report.started.year == 2018
+    assert [(t.test_index, t.status) for t in report.tests] == [("1.1", "FAIL")]
+    assert len(report.checks) == 7
+    chk = report.checks[3]
+    assert (chk.test_index, chk.check_number, chk.status) == ("1.1", 3, "FAIL")
+
+
+def test_read_header_footer(tmp_path):
+    path = os.path.join(expect_logs, "basicpass.csv")
+    full = read_report(path)
+    fast = read_header_footer(path)
+    assert fast.header == full.header
+    assert fast.footer == full.footer
+    assert fast.tests == []
+
+    incomplete = tmp_path / "incomplete.csv"
+    with open(path) as f:
+        incomplete.write_text("".join(f.readlines()[:-1]))
+    assert not read_header_footer(incomplete).complete
+
+
+def test_named_params(tmp_path):
+    path = tmp_path / "report.csv"
+    path.write_text(
+        "0,Sequence,started=20260101-120000,serial_number=123\n"
+        "0.00,Test 1,start,Test,\n"
+        "0.01,Test 1,check1,in range,volts,PASS,1.5,1,2\n"
+        "0.02,Test 1,check2,all in range,wave,FAIL,3,0,2,count=10,failed=1\n"
+        "0.03,Test 1,end,FAIL,checks-passed=1,checks-failed=1\n"
+        "0.04,Sequence,ended=20260101-120001,Finished,tests-passed=0,sequence=FAILED\n"
+    )
+    report = read_report(path)
+    assert report.serial_number == "123"
+    assert report.checks[0].named_params() == {"min": "1", "max": "2"}
+    assert report.checks[1].named_params() == {
+        "min": "0",
+        "max": "2",
+        "count": "10",
+        "failed": "1",
+    }
+    assert report.tests[0].duration == 0.03
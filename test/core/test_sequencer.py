@@ -1,7 +1,12 @@
+import asyncio
+import threading
+import time
+
 import pytest
 import fixate
 from fixate.core.common import TestList, TestClass
 from fixate.core.checks import chk_fails, chk_passes
+from fixate.core import timing
 from pubsub import pub
 from unittest.mock import MagicMock, call, patch
 
@@ -630,3 +635,204 @@ def test_reporting_service_error(sequencer, pubsub_logs):
     ]
     assert expected_calls == pubsub_logs.calls
     assert "ERROR" == sequencer.end_status
+
+
+def test_abort_on_first_fail(sequencer, mock_obj):
+    sequencer.abort_on_first_fail = True
+    sequencer.non_interactive = True
+    test_seq = MockTestList(
+        [TestFails(), MockTest(2, mock_obj), MockTest(3, mock_obj)], 1, mock_obj
+    )
+
+    sequencer.load(test_seq)
+    sequencer.run_sequence()
+
+    mock_obj.test_test.assert_not_called()
+    mock_obj.list_exit.assert_called_once_with(1)
+    assert sequencer.tests_failed == 1
+    assert sequencer.tests_passed == 0
+    assert "FAILED" == sequencer.end_status
+
+
+class TestHangs(TestClass):
+    timeout = 0.05
+
+    def __init__(self, mock_obj):
+        super().__init__()
+        self.mock = mock_obj
+
+    def test(self):
+        timing.wait(10)
+
+    def tear_down(self):
+        self.mock.hang_tear_down()
+
+
+def test_test_timeout(sequencer, mock_obj):
+    sequencer.non_interactive = True
+    test_seq = MockTestList([TestHangs(mock_obj), MockTest(2, mock_obj)], 1, mock_obj)
+
+    sequencer.load(test_seq)
+    sequencer.run_sequence()
+
+    mock_obj.hang_tear_down.assert_called_once()
+    mock_obj.test_test.assert_called_once_with(2)
+    assert sequencer.tests_errored == 1
+    assert "ERROR" == sequencer.end_status
+
+
+def test_test_timeout_abort(sequencer, mock_obj, pubsub_logs):
+    sequencer.non_interactive = True
+    sequencer.abort_on_timeout = True
+    test_seq = MockTestList([TestHangs(mock_obj), MockTest(2, mock_obj)], 1, mock_obj)
+
+    sequencer.load(test_seq)
+    sequencer.run_sequence()
+
+    mock_obj.test_test.assert_not_called()
+    assert "Sequence_Abort" in pubsub_logs.calls
+    assert "ERROR" == sequencer.end_status
+
+
+def test_test_list_timeout(sequencer, mock_obj):
+    class ListWithTimeout(TestList):
+        timeout = 0.05
+
+    class SlowTest(TestClass):
+        def test(self):
+            timing.wait(0.03)
+
+    sequencer.non_interactive = True
+    sequencer.load(ListWithTimeout([SlowTest(), SlowTest(), SlowTest()]))
+    sequencer.run_sequence()
+
+    assert sequencer.tests_passed == 1
+    assert sequencer.tests_errored == 2
+
+
+def test_abort_interrupts_wait(sequencer, mock_obj):
+    class WaitsForAbort(TestClass):
+        def test(self):
+            threading.Timer(0.05, sequencer._handle_sequence_abort).start()
+            start = time.monotonic()
+            try:
+                timing.wait(10)
+            finally:
+                mock_obj.waited(time.monotonic() - start)
+
+    sequencer.load(TestList([WaitsForAbort(), MockTest(2, mock_obj)]))
+    sequencer.run_sequence()
+
+    (elapsed,) = mock_obj.waited.call_args.args
+    assert elapsed < 1
+    mock_obj.test_test.assert_not_called()
+    assert "ERROR" == sequencer.end_status
+
+
+def test_wait_outside_test_is_not_interrupted():
+    timing.abort()
+    try:
+        start = time.monotonic()
+        timing.wait(0.05)
+        assert time.monotonic() - start >= 0.05
+    finally:
+        timing.clear_abort()
+
+
+def test_async_test(sequencer, mock_obj):
+    class AsyncTest(TestClass):
+        async def set_up(self):
+            mock_obj.set_up()
+
+        async def test(self):
+            await asyncio.sleep(0.01)
+            chk_passes()
+
+        async def tear_down(self):
+            mock_obj.tear_down()
+
+    sequencer.load(TestList([AsyncTest()]))
+    sequencer.run_sequence()
+
+    mock_obj.set_up.assert_called_once()
+    mock_obj.tear_down.assert_called_once()
+    assert sequencer.tests_passed == 1
+    assert "PASSED" == sequencer.end_status
+
+
+def test_async_test_timeout(sequencer, mock_obj):
+    class AsyncHangs(TestClass):
+        timeout = 0.05
+
+        async def test(self):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                mock_obj.cancelled()
+                raise
+
+    sequencer.non_interactive = True
+    start = time.monotonic()
+    sequencer.load(TestList([AsyncHangs(), MockTest(2, mock_obj)]))
+    sequencer.run_sequence()
+
+    assert time.monotonic() - start < 1
+    mock_obj.cancelled.assert_called_once()
+    mock_obj.test_test.assert_called_once_with(2)
+    assert sequencer.tests_errored == 1
+
+
+def test_async_test_timeout_waits_for_instrument(sequencer, mock_obj):
+    from fixate.drivers import aio
+
+    log = []
+
+    class Driver:
+        def measure(self):
+            time.sleep(0.2)
+            log.append("measure")
+
+    class AsyncTimeout(TestClass):
+        timeout = 0.05
+
+        async def test(self):
+            self.adriver = aio.AsyncDriver(Driver())
+            await self.adriver.measure()
+
+        def tear_down(self):
+            log.append("tear_down")
+
+    sequencer.non_interactive = True
+    sequencer.load(TestList([AsyncTimeout()]))
+    sequencer.run_sequence()
+
+    assert log == ["measure", "tear_down"]
+    assert sequencer.tests_errored == 1
+
+
+def test_async_test_hung_instrument_is_logged(sequencer, mock_obj, monkeypatch, caplog):
+    from fixate.drivers import aio
+
+    monkeypatch.setattr(fixate.sequencer, "INSTRUMENT_IDLE_TIMEOUT", 0.05)
+    release = threading.Event()
+
+    class Driver:
+        def measure(self):
+            release.wait(5)
+
+    class AsyncHangs(TestClass):
+        timeout = 0.05
+
+        async def test(self):
+            await aio.AsyncDriver(Driver()).measure()
+
+    sequencer.non_interactive = True
+    start = time.monotonic()
+    try:
+        sequencer.load(TestList([AsyncHangs()]))
+        sequencer.run_sequence()
+    finally:
+        release.set()
+
+    assert time.monotonic() - start < 1
+    assert "Instrument call still running" in caplog.text
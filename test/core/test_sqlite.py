@@ -0,0 +1,91 @@
+import sqlite3
+
+import pytest
+
+import fixate.config
+import fixate.sequencer
+from fixate.core.checks import chk_in_range
+from fixate.core.common import TestClass, TestList
+from fixate.reporting import CSVWriter, ReportingHub, load_plugins
+from fixate.reporting.sqlite import SQLiteWriter, main, parse_since, query_checks
+
+
+class RangeTest(TestClass):
+    """Range test"""
+
+    def __init__(self, value):
+        super().__init__()
+        self.value = value
+
+    def test(self):
+        chk_in_range(1, 0, 2, "first")
+        chk_in_range(self.value, 0, 2, "second")
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = tmp_path / "results.sqlite3"
+    monkeypatch.setattr(
+        fixate.config,
+        "plg_sqlite",
+        {
+            "import_name": "fixate.reporting.sqlite",
+            "class_name": "SQLiteWriter",
+            "db_path": str(path),
+        },
+        raising=False,
+    )
+    return path
+
+
+def run_sequence(serial_number, values):
+    seq = fixate.sequencer.Sequencer()
+    seq.reporting_service = ReportingHub([SQLiteWriter()])
+    seq.non_interactive = True
+    seq.context_data["serial_number"] = serial_number
+    fixate.config.RESOURCES["SEQUENCER"] = seq
+    seq.load(TestList([RangeTest(v) for v in values]))
+    seq.run_sequence()
+    return seq
+
+
+def test_plugin_loaded_from_config(db_path):
+    plugins = load_plugins()
+    assert [type(p) for p in plugins] == [SQLiteWriter]
+    assert plugins[0].db_path == db_path
+    # Sinks are fed by the sequencer's reporting hub
+    seq = fixate.sequencer.Sequencer()
+    assert [type(s) for s in seq.reporting_service.sinks] == [CSVWriter, SQLiteWriter]
+    assert seq.plugins == []
+
+
+def test_results_written(db_path):
+    run_sequence("SN1", [1.5, 3])
+    run_sequence("SN2", [1.5, 1.5])
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    assert conn.execute(
+        "SELECT serial_number, status, tests_passed, tests_failed FROM sequences"
+    ).fetchall() == [("SN1", "FAILED", 1, 1), ("SN2", "PASSED", 2, 0)]
+    assert conn.execute(
+        "SELECT test_index, description, status FROM tests ORDER BY id LIMIT 2"
+    ).fetchall() == [("1", "Range test", "PASS"), ("2", "Range test", "FAIL")]
+
+    failures = query_checks(conn, test_index="2", check_number=2, status="FAIL")
+    assert len(failures) == 1
+    assert failures[0][1] == "SN1"
+    assert failures[0][7] == 3
+    assert failures[0][8] == "[0, 2]"
+    assert len(query_checks(conn, serial_number="SN2")) == 4
+    assert query_checks(conn, since=parse_since("1d"), status="FAIL") == failures
+    conn.close()
+
+
+def test_query_cli(db_path, capsys):
+    run_sequence("SN1", [3])
+    main([str(db_path), "--test", "1", "--check", "2", "--status", "fail"])
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].startswith("time,serial_number,test,check")
+    assert len(lines) == 2
+    assert lines[1].split(",")[1:7] == ["SN1", "1", "2", "in range", "second", "FAIL"]
@@ -0,0 +1,148 @@
+import json
+import socket
+import time
+
+import pytest
+
+import fixate.config
+from fixate.core.checks import CheckResult
+from fixate.reporting import ReportingHub
+from fixate.reporting.stream import StreamSink, _Client, _encode, parse_address
+
+
+@pytest.fixture
+def stream(monkeypatch):
+    monkeypatch.setattr(
+        fixate.config, "plg_stream", {"address": "tcp://127.0.0.1:0"}, False
+    )
+    sink = StreamSink()
+    hub = ReportingHub([sink])
+    hub.install()
+    yield hub, sink
+    hub.uninstall()
+
+
+def connect(sink, request=b"{}\n"):
+    family = socket.AF_UNIX if isinstance(sink.server_address, str) else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.settimeout(5)
+    sock.connect(sink.server_address)
+    sock.sendall(request)
+    return sock, sock.makefile("rb")
+
+
+def read_records(f, n):
+    return [json.loads(f.readline()) for _ in range(n)]
+
+
+def test_live_and_replay(stream):
+    hub, sink = stream
+    # Replay from 0, so the event is received even if it is published before the server
+    # thread has read the request
+    live, live_f = connect(sink, b'{"offset": 0}\n')
+    hub.driver_open("DMM", "FLUKE")
+    record = read_records(live_f, 1)[0]
+    assert record["event"] == "driver_open"
+    assert record["identity"] == "FLUKE"
+    assert record["offset"] == 0
+
+    chk = CheckResult(True, "PASS", "volts", 1.5, "in range", check_params=[1, 2])
+    hub.test_comparison(True, chk, 1, "1.2")
+    record = read_records(live_f, 1)[0]
+    assert record["event"] == "check"
+    assert (record["test_index"], record["check_number"]) == ("1.2", 1)
+    assert (record["test_val"], record["params"]) == (1.5, [1, 2])
+
+    replay, replay_f = connect(sink, b'{"offset": 1}\n')
+    hub.driver_open("PSU", "SIGLENT")
+    records = read_records(replay_f, 2)
+    assert [r["offset"] for r in records] == [1, 2]
+    assert records[1]["identity"] == "SIGLENT"
+    assert read_records(live_f, 1)[0]["offset"] == 2
+    for f in (live_f, live, replay_f, replay):
+        f.close()
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="No unix sockets")
+def test_unix_socket(tmp_path, monkeypatch):
+    path = str(tmp_path / "results.sock")
+    monkeypatch.setattr(
+        fixate.config, "plg_stream", {"address": f"unix://{path}"}, False
+    )
+    sink = StreamSink()
+    hub = ReportingHub([sink])
+    hub.install()
+    try:
+        sock, f = connect(sink, b'{"offset": 0}\n')
+        hub.driver_open("DMM", "FLUKE")
+        assert read_records(f, 1)[0]["identity"] == "FLUKE"
+        f.close()
+        sock.close()
+    finally:
+        hub.uninstall()
+
+
+def test_replay_buffer_truncated(monkeypatch):
+    monkeypatch.setattr(
+        fixate.config,
+        "plg_stream",
+        {"address": "tcp://127.0.0.1:0", "replay_buffer": 2},
+        False,
+    )
+    sink = StreamSink()
+    hub = ReportingHub([sink])
+    hub.install()
+    try:
+        for identity in ("A", "B", "C"):
+            hub.driver_open("DMM", identity)
+        # Wait until the writer thread has handled all three lines
+        end = time.monotonic() + 5
+        while sink._offset < 3 and time.monotonic() < end:
+            time.sleep(0.01)
+        late, late_f = connect(sink, b'{"offset": 0}\n')
+        truncated, *records = read_records(late_f, 3)
+        assert truncated == {"event": "truncated", "count": 1}
+        assert [(r["offset"], r["identity"]) for r in records] == [(1, "B"), (2, "C")]
+        for f in (late_f, late):
+            f.close()
+    finally:
+        hub.uninstall()
+
+
+def test_non_finite_values_are_strings():
+    line = _encode({"test_val": float("nan"), "params": [float("inf"), -float("inf")]})
+    assert json.loads(line) == {"test_val": "NaN", "params": ["Infinity", "-Infinity"]}
+
+
+def test_slow_client_drops_oldest():
+    client = _Client(None, limit=3)
+    for i in range(5):
+        client.push(str(i).encode())
+    assert json.loads(client.next_data()) == {"event": "dropped", "count": 2}
+    assert [client.next_data() for _ in range(4)] == [b"2", b"3", b"4", b""]
+
+
+def test_parse_address():
+    assert parse_address("tcp://0.0.0.0:5151") == (socket.AF_INET, ("0.0.0.0", 5151))
+    with pytest.raises(ValueError):
+        parse_address("127.0.0.1:5151")
+
+
+def test_port_in_use(monkeypatch):
+    taken = socket.socket()
+    taken.bind(("127.0.0.1", 0))
+    taken.listen()
+    try:
+        host, port = taken.getsockname()
+        monkeypatch.setattr(
+            fixate.config, "plg_stream", {"address": f"tcp://{host}:{port}"}, False
+        )
+        sink = StreamSink()
+        hub = ReportingHub([sink])
+        # Not required, so the sink is detached and the sequence can still run
+        hub.install()
+        assert hub._active == []
+        assert sink._server is None
+        hub.uninstall()
+    finally:
+        taken.close()
@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from fixate.reporting import summary
+
+
+def write_report(path, serial, started, results):
+    """results is a list of (test index, status, duration)"""
+    lines = [f"0,Sequence,started={started},serial_number={serial}"]
+    elapsed = 0.0
+    for index, status, duration in results:
+        lines.append(f"{elapsed:.2f},Test {index},start,Test {index},")
+        elapsed += duration
+        lines.append(f"{elapsed:.2f},Test {index},end,{status}")
+    sequence = "PASSED" if all(r[1] == "PASS" for r in results) else "FAILED"
+    lines.append(f"{elapsed:.2f},Sequence,ended={started},Finished,sequence={sequence}")
+    path.write_text("\n".join(lines) + "\n")
+
+
+@pytest.fixture
+def reports(tmp_path):
+    logs = tmp_path / "logs"
+    logs.mkdir()
+    write_report(logs / "a1.csv", "A", "20260101-100000", [("1", "FAIL", 1.0)])
+    write_report(logs / "a2.csv", "A", "20260101-110000", [("1", "PASS", 2.0)])
+    write_report(logs / "b1.csv", "B", "20260101-100000", [("1", "PASS", 3.0)])
+    write_report(
+        logs / "c1.csv",
+        "C",
+        "20260101-100000",
+        [("1", "FAIL", 1.0), ("2", "FAIL", 1.0)],
+    )
+    (logs / "incomplete.csv").write_text(
+        "0,Sequence,started=20260101-100000,serial_number=D\n0.00,Test 1,start,Test 1,\n"
+    )
+    return logs
+
+
+def test_summarise_report_fast_path(reports):
+    result = summary.summarise_report(reports / "b1.csv", durations=False)
+    assert result["status"] == "PASSED"
+    assert result["durations"] is None
+    result = summary.summarise_report(reports / "a1.csv", durations=False)
+    assert result["failed_tests"] == [["1", "Test 1"]]
+
+
+def test_yield_pareto_durations(reports):
+    summaries = summary.scan(reports, processes=1)
+    fpy = summary.first_pass_yield(summaries)
+    assert (fpy["units"], fpy["reports"], fpy["incomplete"]) == (3, 4, 1)
+    assert fpy["first_pass"] == 1
+    assert fpy["final"] == 2
+    assert summary.failure_pareto(summaries) == [
+        ("1", "Test 1", 2, 2 / 3),
+        ("2", "Test 2", 1, 1.0),
+    ]
+    rows = summary.duration_percentiles(summaries, percentiles=(50,))
+    assert rows == [("1", "Test 1", 4, 1.5), ("2", "Test 2", 1, 1.0)]
+
+
+def test_cache(reports, tmp_path):
+    cache_path = tmp_path / "cache.json"
+    first = summary.scan(reports, durations=False, processes=1, cache_path=cache_path)
+    cached = json.loads(cache_path.read_text())["reports"]
+    assert set(cached) == set(first)
+
+    # Cached results are reused, poison the cache to show it
+    cached["b1.csv"]["summary"]["status"] = "CACHED"
+    cache_path.write_text(json.dumps({"version": 1, "reports": cached}))
+    assert summary.scan(reports, False, 1, cache_path)["b1.csv"]["status"] == "CACHED"
+    # Durations weren't cached, so the reports are read again
+    assert summary.scan(reports, True, 1, cache_path)["b1.csv"]["status"] == "PASSED"
+
+
+def test_main(reports, capsys):
+    summary.main([str(reports), "--processes", "1"])
+    out = capsys.readouterr().out
+    assert "First pass yield: 33.3% (1/3)" in out
+    assert "Final yield: 66.7% (2/3)" in out
+    assert (reports / summary.CACHE_FILE).exists()
@@ -0,0 +1,110 @@
+import json
+import logging
+
+import pytest
+from pubsub import pub
+from pyvisa import VisaIOError
+from pyvisa.errors import VI_ERROR_TMO
+
+import fixate.config
+from fixate.drivers import trace
+
+
+class FakeInstrument:
+    def __init__(self):
+        self.timeout = 2000
+
+    def write(self, command):
+        pass
+
+    def query(self, command):
+        if command == "FAIL?":
+            raise VisaIOError(VI_ERROR_TMO)
+        return "+1.00000E+00\n"
+
+    def read_raw(self):
+        return b"\x00" * 10
+
+
+def test_wrap_disabled_returns_instrument(monkeypatch):
+    monkeypatch.setattr(fixate.config, "instrument_trace", False)
+    instrument = FakeInstrument()
+    assert trace.wrap(instrument, "Fake") is instrument
+
+
+def test_records_io():
+    tracer = trace.Tracer()
+    instrument = trace.TracedInstrument(FakeInstrument(), "Fake", tracer)
+    tracer._on_test_start(data=None, test_index="1.2")
+
+    instrument.write("CONF:VOLT:DC 10")
+    assert instrument.query("MEAS?") == "+1.00000E+00\n"
+    instrument.read_raw()
+    with pytest.raises(VisaIOError):
+        instrument.query("FAIL?")
+
+    write, query, read, failed = tracer.records
+    assert write.command == "CONF:VOLT:DC 10"
+    assert write.sent == 15 and write.received == 0
+    assert write.test_index == "1.2"
+    assert query.received == 13
+    assert read.command is None and read.received == 10
+    assert "VisaIOError" in failed.error
+    assert all(r.end >= r.start for r in tracer.records)
+    assert tracer.histograms[("Fake", "CONF:VOLT:DC")].count == 1
+    assert tracer.histograms[("Fake", "read_raw")].count == 1
+    assert tracer.histograms[("Fake", "FAIL?")].errors == 1
+
+
+def test_attributes_pass_through():
+    fake = FakeInstrument()
+    instrument = trace.TracedInstrument(fake, "Fake", trace.Tracer())
+    instrument.timeout = 500
+    assert fake.timeout == 500
+    assert instrument.timeout == 500
+
+
+def test_ring_buffer_keeps_latest():
+    tracer = trace.Tracer(size=3)
+    instrument = trace.TracedInstrument(FakeInstrument(), "Fake", tracer)
+    for i in range(5):
+        instrument.write(f"VOLT {i}")
+    assert [r.command for r in tracer.records] == ["VOLT 2", "VOLT 3", "VOLT 4"]
+    # Histograms cover every command, not only those still in the buffer
+    assert tracer.histograms[("Fake", "VOLT")].count == 5
+
+
+def test_histogram_percentiles():
+    histogram = trace.LatencyHistogram()
+    for _ in range(90):
+        histogram.add(0.001)
+    for _ in range(10):
+        histogram.add(0.1)
+    assert 0.001 <= histogram.percentile(50) < 0.002
+    assert 0.1 <= histogram.percentile(95) < 0.2
+    assert histogram.max == 0.1
+
+
+def test_dump_at_sequence_end(monkeypatch, tmp_path, caplog):
+    path = tmp_path / "trace.jsonl"
+    monkeypatch.setattr(fixate.config, "instrument_trace", str(path))
+    monkeypatch.setattr(trace, "_tracer", None)
+    instrument = trace.wrap(FakeInstrument(), "Fake")
+    instrument.write("*RST")
+    instrument.query("*IDN?")
+
+    with caplog.at_level(logging.INFO, logger="fixate.drivers.trace"):
+        pub.sendMessage(
+            "Sequence_Complete",
+            status="PASSED",
+            passed=1,
+            failed=0,
+            error=0,
+            skipped=0,
+            sequence_status="Finished",
+        )
+
+    assert "*IDN?" in caplog.text
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["command"] for line in lines] == ["*RST", "*IDN?"]
+    assert not trace.tracer().records
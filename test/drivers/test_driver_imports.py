@@ -8,11 +8,16 @@ be imported"""
 
 
 def test_driver_files():
-    import fixate.drivers.dmm
-    import fixate.drivers.dso
-    import fixate.drivers.funcgen
-    import fixate.drivers.lcr
-    import fixate.drivers.pps
+    # The packages only import their drivers when used, so import the drivers directly
+    import fixate.drivers.dcload.rigol_dl3021
+    import fixate.drivers.dmm.fluke_8846a
+    import fixate.drivers.dmm.keithley_6500
+    import fixate.drivers.dso.agilent_mso_x
+    import fixate.drivers.funcgen.keysight_33500b
+    import fixate.drivers.funcgen.rigol_dg1022
+    import fixate.drivers.lcr.agilent_u1732c
+    import fixate.drivers.pps.bk_178x
+    import fixate.drivers.pps.siglent_spd_3303X
 
 
 # Loading Pydaqmx will fail with NotImplementedError if the .h file is not found
@@ -21,7 +26,7 @@ def test_driver_files():
     raises=(OSError, NotImplementedError), reason="Requires DAQ DLL and .h"
 )
 def test_daq_driver_import():
-    import fixate.drivers.daq
+    import fixate.drivers.daq.daqmx
 
 
 # NOTE: our ftdi library raises an import error if loading .dll failes